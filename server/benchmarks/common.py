@@ -0,0 +1,283 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against a local sample corpus directory (not shipped with the
+repo). An optional labels.json in that directory maps file names to the field
+values the extractors should find, e.g.:
+
+    {"statement_01.pdf": {"pan_number": "ABCPE1234F", "ifsc_code": "HDFC0001234"}}
+"""
+import json
+import os
+import statistics
+import sys
+import time
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+PDF_EXTENSIONS = ('.pdf',)
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif')
+
+
+def corpus_files(corpus_dir, extensions=PDF_EXTENSIONS + IMAGE_EXTENSIONS):
+    """Sorted paths of corpus files with one of the given extensions"""
+    return sorted(
+        os.path.join(corpus_dir, name)
+        for name in os.listdir(corpus_dir)
+        if name.lower().endswith(extensions)
+    )
+
+
+def load_labels(corpus_dir):
+    """Expected field values per file name from labels.json, or {} if the corpus has none"""
+    path = os.path.join(corpus_dir, 'labels.json')
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def normalize_value(value):
+    """Flatten an extractor result to a comparable string"""
+    if isinstance(value, dict):
+        for key in ('amount', 'account_type', 'dob'):
+            if key in value:
+                return normalize_value(value[key])
+        return json.dumps(value, sort_keys=True)
+    if isinstance(value, list):
+        return ','.join(sorted(normalize_value(v) for v in value))
+    return str(value or '').replace(' ', '').upper()
+
+
+def field_accuracy(text, expected_fields):
+    """Fraction of labelled fields the extractors recover from text (None when nothing is labelled)"""
+    import main
+
+    checked = [f for f in expected_fields if f in main.EXTRACT_ALL_FIELDS]
+    if not checked:
+        return None
+    correct = 0
+    for field in checked:
+        extractor = main.EXTRACT_ALL_FIELDS[field][2]
+        if normalize_value(extractor(text)) == normalize_value(expected_fields[field]):
+            correct += 1
+    return correct / len(checked)
+
+
+def timed(fn, *args, **kwargs):
+    """Call fn and return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def summarize(samples):
+    """Mean / median / max of a list of numbers, skipping None"""
+    values = [s for s in samples if s is not None]
+    if not values:
+        return None, None, None
+    return statistics.mean(values), statistics.median(values), max(values)
+
+
+def print_table(headers, rows):
+    """Print rows as a fixed-width text table"""
+    rows = [[_format_cell(cell) for cell in row] for row in rows]
+    widths = [max(len(str(h)), *(len(r[i]) for r in rows)) if rows else len(str(h)) for i, h in enumerate(headers)]
+    print('  '.join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print('  '.join('-' * w for w in widths))
+    for row in rows:
+        print('  '.join(cell.ljust(w) for cell, w in zip(row, widths)))
+
+
+def _format_cell(cell):
+    if cell is None:
+        return '-'
+    if isinstance(cell, float):
+        return f"{cell:.3f}"
+    return str(cell)
+
+
+def require_tesseract():
+    """Exit with a message when the Tesseract binary is not available"""
+    import main
+
+    if not main.TESSERACT_AVAILABLE:
+        sys.exit("Tesseract is not available; set TESSERACT_CMD or install tesseract-ocr")
+
+
+def synthetic_statement_text(transaction_lines=2000, seed=7):
+    """Uppercased bank-statement-like text: header fields, a long transaction table and a footer"""
+    import random
+
+    rng = random.Random(seed)
+    header = [
+        "STATEMENT OF ACCOUNT",
+        "CUSTOMER ID : 290556726          CKYC NO: 12345678901234",
+        "PAN : ABCPE1234F                 IFSC CODE: HDFC0001234",
+        "MOBILE NO : 98XXXXXX12           EMAIL : FOO.BAR@GMAIL.COM",
+        "ACCOUNT TYPE : SAVINGS ACCOUNT   ACCOUNT NO : 50100123456789",
+        "STATEMENT PERIOD : 01/04/2025 TO 30/06/2025",
+        "DATE OF BIRTH: 15/08/1990",
+        "OPENING BALANCE : 42,650.00(CR)",
+        "DATE NARRATION CHQ/REF NO VALUE DT WITHDRAWAL AMT DEPOSIT AMT CLOSING BALANCE",
+    ]
+    lines = list(header)
+    balance = 42650.00
+    for i in range(transaction_lines):
+        amount = round(rng.uniform(10, 5000), 2)
+        balance += amount if rng.random() < 0.5 else -amount
+        day, month = 1 + i % 28, 4 + (i // 28) % 3
+        lines.append(
+            f"{day:02d}/{month:02d}/25 UPI-{rng.randint(10**9, 10**10 - 1)}-MERCHANT {rng.randint(1000, 9999)} "
+            f"{rng.randint(10**11, 10**12 - 1)} {day:02d}/{month:02d}/25 {amount:,.2f} {balance:,.2f}"
+        )
+    lines.append("CLOSING BALANCE : 2,983.38(CR)")
+    return "\n".join(lines) + "\n"
+
+
+def write_scanned_pdf(text, path, lines_per_page=60, dpi=200, skew=0.0, noise=0.0, seed=0):
+    """Render text as an image-only (scanned-like) A4 PDF with no text layer, lines_per_page lines per page.
+
+    skew (degrees) and noise (pixel standard deviation) make the pages look
+    like a real scan, see degrade().
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    width, height = round(8.27 * dpi), round(11.69 * dpi)
+    margin = dpi // 2
+    line_height = (height - 2 * margin) // lines_per_page
+    font = ImageFont.load_default(size=max(8, int(line_height * 0.6)))
+    lines = text.splitlines()
+    pages = []
+    for start in range(0, max(1, len(lines)), lines_per_page):
+        page = Image.new('L', (width, height), 255)
+        draw = ImageDraw.Draw(page)
+        for row, line in enumerate(lines[start:start + lines_per_page]):
+            draw.text((margin, margin + row * line_height), line, fill=0, font=font)
+        if skew or noise:
+            page = degrade(page.convert('RGB'), skew=skew, noise=noise, seed=seed + start)
+        pages.append(page)
+    pages[0].save(path, 'PDF', resolution=dpi, save_all=True, append_images=pages[1:])
+    return path
+
+
+def write_text_pdf(text, path, lines_per_page=60, fan_out=None):
+    """Write text as a digital A4 PDF with a text layer (Helvetica), lines_per_page lines per page.
+
+    The page tree is a flat /Kids array, or with fan_out a balanced tree of
+    that many kids per node, as long documents from some generators have.
+    """
+    lines = text.splitlines() or ['']
+    page_lines = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)]
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>", 3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    leaves = []
+    for rows in page_lines:
+        escaped = [row.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') for row in rows]
+        stream = "BT /F1 9 Tf 11 TL 40 800 Td " + " ".join(f"({row}) '" for row in escaped) + " ET"
+        content, page = len(objects) + 2, len(objects) + 3
+        objects[content] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream.encode('latin-1'))
+        objects[page] = b"<< /Type /Page /MediaBox [0 0 595 842] /Contents %d 0 R /Resources << /Font << /F1 3 0 R >> >>" % content
+        leaves.append((page, 1))
+
+    # Group nodes bottom up until one level fits under the root (object 2)
+    nodes = leaves
+    while fan_out and len(nodes) > fan_out:
+        groups = [nodes[i:i + fan_out] for i in range(0, len(nodes), fan_out)]
+        nodes = []
+        for group in groups:
+            number = len(objects) + 2
+            objects[number] = (group, sum(count for _, count in group))
+            nodes.append((number, objects[number][1]))
+    objects[2] = (nodes, sum(count for _, count in nodes))
+
+    # Page tree nodes are written with their kids and /Parent; pages get /Parent appended
+    parents = {}
+    for number, value in objects.items():
+        if isinstance(value, tuple):
+            for kid, _ in value[0]:
+                parents[kid] = number
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        value = objects[number]
+        if isinstance(value, tuple):
+            kids = " ".join(f"{kid} 0 R" for kid, _ in value[0])
+            parent = f" /Parent {parents[number]} 0 R" if number in parents else ""
+            value = f"<< /Type /Pages /Kids [{kids}] /Count {value[1]}{parent} >>".encode()
+        elif number in parents:
+            value += b" /Parent %d 0 R >>" % parents[number]
+        offsets[number] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, value)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offsets[number] for number in range(1, len(objects) + 1))
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(out)
+    return path
+
+
+def degrade(image, skew=0.0, noise=0.0, tint=None, seed=0):
+    """A scan-like copy of an RGB image: rotated by skew degrees, on a tint-to-white gradient, with pixel noise"""
+    import numpy as np
+    from PIL import Image
+
+    if tint:
+        # Background fades from tint at the top to white at the bottom; dark text stays dark
+        pixels = np.asarray(image, dtype=np.float32)
+        fade = np.linspace(0.0, 1.0, image.height, dtype=np.float32)[:, None, None]
+        background = np.array(tint, dtype=np.float32) * (1 - fade) + 255 * fade
+        pixels = np.minimum(pixels, background)
+        image = Image.fromarray(pixels.astype(np.uint8))
+    if skew:
+        image = image.rotate(skew, resample=Image.Resampling.BILINEAR, expand=True, fillcolor=(255, 255, 255))
+    if noise:
+        rng = np.random.default_rng(seed)
+        pixels = np.asarray(image, dtype=np.float32) + rng.normal(0, noise, (image.height, image.width, 1))
+        image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    return image
+
+
+def write_card_image(text, path, dpi=150, skew=0.0, noise=0.0, tint=(200, 225, 250), seed=0, dpi_tag=True):
+    """Save text as a photographed ID card style image (85.6 x 54 mm at dpi, tinted and noisy).
+
+    The file carries dpi in its metadata unless dpi_tag is False, like most phone photos.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    width, height = round(85.6 / 25.4 * dpi), round(54 / 25.4 * dpi)
+    lines = text.splitlines()
+    line_height = (height - dpi // 5) // max(1, len(lines))
+    font = ImageFont.load_default(size=max(6, int(line_height * 0.55)))
+    card = Image.new('RGB', (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(card)
+    for row, line in enumerate(lines):
+        draw.text((dpi // 10, dpi // 10 + row * line_height), line, fill=(20, 20, 60), font=font)
+    card = degrade(card, skew=skew, noise=noise, tint=tint, seed=seed)
+    if dpi_tag:
+        card.save(path, dpi=(dpi, dpi))
+    else:
+        card.save(path)
+    return path
+
+
+def synthetic_card_texts():
+    """(kind, text) for an Aadhaar-like and a PAN-like card"""
+    return [
+        ('aadhaar', "GOVERNMENT OF INDIA\nRAHUL KUMAR SHARMA\nDOB: 15/08/1990\nMALE\n2345 6789 0123\n"),
+        ('pan', "INCOME TAX DEPARTMENT\nRAHUL KUMAR SHARMA\nSURESH KUMAR SHARMA\n15/08/1990\n"
+                "PERMANENT ACCOUNT NUMBER\nABCPE1234F\n"),
+    ]
+
+
+def expected_fields(text, fields):
+    """What the extractors find in a clean source text: the labels for a generated sample"""
+    import main
+
+    expected = {}
+    for field in fields:
+        value = main.EXTRACT_ALL_FIELDS[field][2](text)
+        if value:
+            expected[field] = value
+    return expected
@@ -0,0 +1,107 @@
+"""Wall time of two documents read at once, with one process-wide PDF lock vs a lock per document.
+
+Usage:
+    python benchmarks/concurrent_documents.py [--pages 20] [--scanned-pages 2] [--repeat 3]
+
+Three generated statements: digital A and B (--pages pages each) and a scanned
+one (--scanned-pages pages). Two pairs, every page of both documents read
+through PdfPageSource.page_texts with the pdfplumber text layer:
+
+  * digital + digital   two pdfminer parses
+  * digital + scanned   a pdfminer parse next to pdfium renders and OCR
+
+and for each pair:
+
+  * serial        one document after the other
+  * global lock   both at once, every parse, text read and render sharing one
+                  lock (what main.py did before)
+  * per document  both at once, pdfminer locked per document and only pdfium
+                  calls sharing _pdfium_lock
+
+'both s' is the wall time until both are read, 'digital A s' how long the
+first document took. Medians of --repeat runs, each from an empty OCR cache.
+pdfminer is pure Python, so two parses still share the GIL and gain little.
+What the per-document lock buys is that one document's parse no longer waits
+for another document's renders, which needs more than one core to show. The
+machine's CPU count is printed.
+"""
+import argparse
+import os
+import tempfile
+import threading
+
+from common import print_table, summarize, synthetic_statement_text, timed, write_scanned_pdf, write_text_pdf
+
+import main
+from ocr_cache import OcrCache
+
+MODES = ('serial', 'global lock', 'per document')
+
+
+def read_all(path, shared_lock=None):
+    """Every page's text of one document; shared_lock stands in for the document's own lock"""
+    with main.PdfPageSource(path, main.TEXT_LAYERS['pdfplumber']) as source:
+        if shared_lock is not None:
+            source._lock = shared_lock
+        return timed(source.page_texts, range(source.page_count))[1]
+
+
+def run_pair(paths, mode):
+    """(seconds until both are read, seconds for the first document)"""
+    main.OCR_CACHE = OcrCache()
+    if mode == 'serial':
+        seconds = [read_all(path) for path in paths]
+        return sum(seconds), seconds[0]
+
+    shared_lock = None
+    pdfium_lock = main._pdfium_lock
+    if mode == 'global lock':
+        shared_lock = threading.Lock()
+        main._pdfium_lock = shared_lock
+    seconds = [None] * len(paths)
+
+    def read(i):
+        seconds[i] = read_all(paths[i], shared_lock)
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(len(paths))]
+    try:
+        _, both = timed(lambda: ([t.start() for t in threads], [t.join() for t in threads]))
+    finally:
+        main._pdfium_lock = pdfium_lock
+    return both, seconds[0]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=20, help='pages of each digital statement')
+    parser.add_argument('--scanned-pages', type=int, default=2, help='pages of the scanned statement')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs")
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        digital = [
+            write_text_pdf(
+                synthetic_statement_text(transaction_lines=args.pages * 60 - 10, seed=seed),
+                os.path.join(tmp, f'digital_{name}.pdf'),
+            )
+            for seed, name in ((1, 'a'), (2, 'b'))
+        ]
+        scanned = write_scanned_pdf(
+            synthetic_statement_text(transaction_lines=args.scanned_pages * 60 - 12, seed=3),
+            os.path.join(tmp, 'scanned.pdf'),
+        )
+
+        for pair, paths in (('digital + digital', digital), ('digital + scanned', [digital[0], scanned])):
+            for mode in MODES:
+                runs = [run_pair(paths, mode) for _ in range(args.repeat)]
+                rows.append([
+                    pair, mode, summarize([both for both, _ in runs])[1], summarize([first for _, first in runs])[1],
+                ])
+
+    print_table(['documents', 'mode', 'both s', 'digital A s'], rows)
+
+
+if __name__ == '__main__':
+    main_cli()
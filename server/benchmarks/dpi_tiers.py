@@ -0,0 +1,95 @@
+"""Compare OCR accuracy and time per render DPI tier, and against adaptive mode.
+
+Usage:
+    python benchmarks/dpi_tiers.py CORPUS_DIR [--tiers 300,400,500,800] [--pages 1]
+
+For every PDF in the corpus the first --pages pages are rendered and OCR'd
+at each tier. Reported per tier: render time, OCR time, raster size, mean
+Tesseract word confidence and, when labels.json is present, field accuracy.
+The adaptive row shows what OCR_DPI_MODE=adaptive would pick for an 800 DPI caller.
+"""
+import argparse
+import io
+
+import pdfplumber
+
+from common import corpus_files, field_accuracy, load_labels, print_table, require_tesseract, summarize, timed
+
+import main
+
+CUSTOM_CONFIG = r'--oem 3 --psm 6'
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir')
+    parser.add_argument('--tiers', default='300,400,500,800', help='comma-separated DPI tiers')
+    parser.add_argument('--pages', type=int, default=1, help='pages per document to OCR')
+    args = parser.parse_args()
+
+    require_tesseract()
+    tiers = [int(t) for t in args.tiers.split(',') if t.strip()]
+    labels = load_labels(args.corpus_dir)
+    files = corpus_files(args.corpus_dir, ('.pdf',))
+
+    stats = {tier: {'render': [], 'ocr': [], 'megapixels': [], 'confidence': [], 'accuracy': []} for tier in tiers}
+    adaptive = {'render': [], 'ocr': [], 'megapixels': [], 'confidence': [], 'accuracy': [], 'tier': []}
+
+    for path in files:
+        name = path.rsplit('/', 1)[-1]
+        with open(path, 'rb') as f:
+            data = f.read()
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            pages = pdf.pages[:args.pages]
+            for tier in tiers:
+                text = ""
+                for page in pages:
+                    image, render_time = timed(main.render_pdf_page, page, tier)
+                    (page_text, confidence, _), ocr_time = timed(main.ocr_image_with_stats, image, CUSTOM_CONFIG)
+                    text += page_text.upper() + "\n"
+                    stats[tier]['render'].append(render_time)
+                    stats[tier]['ocr'].append(ocr_time)
+                    stats[tier]['megapixels'].append(image.width * image.height / 1e6)
+                    stats[tier]['confidence'].append(confidence)
+                if name in labels:
+                    stats[tier]['accuracy'].append(field_accuracy(text, labels[name]))
+
+            text = ""
+            for page in pages:
+                (page_text, tier_used, confidence), elapsed = timed(main.ocr_pdf_page_adaptive, page, 800, CUSTOM_CONFIG)
+                text += page_text.upper() + "\n"
+                adaptive['ocr'].append(elapsed)
+                adaptive['confidence'].append(confidence)
+                adaptive['tier'].append(tier_used)
+            if name in labels:
+                adaptive['accuracy'].append(field_accuracy(text, labels[name]))
+
+    rows = []
+    for tier in tiers:
+        s = stats[tier]
+        rows.append([
+            f"{tier} DPI",
+            summarize(s['render'])[0],
+            summarize(s['ocr'])[0],
+            summarize(s['megapixels'])[0],
+            summarize(s['confidence'])[0],
+            summarize(s['accuracy'])[0],
+        ])
+    rows.append([
+        f"adaptive (tiers {main.adaptive_dpi_tiers(800)})",
+        None,
+        summarize(adaptive['ocr'])[0],
+        None,
+        summarize(adaptive['confidence'])[0],
+        summarize(adaptive['accuracy'])[0],
+    ])
+
+    print(f"{len(files)} documents, {args.pages} page(s) each")
+    print_table(['mode', 'render s/page', 'ocr s/page', 'megapixels', 'mean conf', 'field accuracy'], rows)
+    if adaptive['tier']:
+        chosen = {tier: adaptive['tier'].count(tier) for tier in sorted(set(adaptive['tier']))}
+        print(f"adaptive tier chosen per page: {chosen}")
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,68 @@
+"""Per-call time of every text field extractor on a large statement text.
+
+Usage:
+    python benchmarks/extractors.py [--text-dir DIR] [--lines 2000] [--repeat 20]
+
+Without --text-dir a synthetic statement with --lines transaction rows is used;
+with it, every *.txt file in DIR (e.g. saved /extract-text output) is timed.
+Extractor debug output is discarded so only extraction work is measured.
+
+--cold empties the re module's pattern cache before every call, which is what
+a busy server sees once the 512-entry cache churns; patterns compiled at
+import time are unaffected by it.
+"""
+import argparse
+import contextlib
+import io
+import os
+import re
+
+from common import print_table, summarize, synthetic_statement_text, timed
+
+import main
+
+
+def load_texts(args):
+    if not args.text_dir:
+        return [synthetic_statement_text(args.lines)]
+    texts = []
+    for name in sorted(os.listdir(args.text_dir)):
+        if name.endswith('.txt'):
+            with open(os.path.join(args.text_dir, name), 'r', encoding='utf-8') as f:
+                texts.append(f.read().upper())
+    return texts
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--text-dir')
+    parser.add_argument('--lines', type=int, default=2000, help='transaction rows in the synthetic text')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--cold', action='store_true', help='purge the re cache before each call')
+    args = parser.parse_args()
+
+    texts = load_texts(args)
+    print(f"{len(texts)} text(s), {sum(len(t) for t in texts) / len(texts) / 1024:.0f} KiB average"
+          f"{', cold re cache' if args.cold else ''}")
+
+    rows = []
+    total = 0.0
+    for field, (_, _, extractor) in main.EXTRACT_ALL_FIELDS.items():
+        samples = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for text in texts:
+                extractor(text)  # warm up
+                for _ in range(args.repeat):
+                    if args.cold:
+                        re.purge()
+                    samples.append(timed(extractor, text)[1] * 1000)
+        mean, median, worst = summarize(samples)
+        total += mean
+        rows.append([field, mean, median, worst])
+    rows.append(['all fields (sum of means)', total, None, None])
+
+    print_table(['extractor', 'mean ms/call', 'median ms', 'max ms'], rows)
+
+
+if __name__ == '__main__':
+    main_cli()
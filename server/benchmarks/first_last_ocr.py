@@ -0,0 +1,93 @@
+"""Wall time of scanned first/last page OCR with the two pages run one after the other vs concurrently.
+
+Usage:
+    python benchmarks/first_last_ocr.py [CORPUS_DIR] [--pages 6] [--timeout 5]
+
+Documents are CORPUS_DIR's PDFs plus a generated scanned statement of --pages
+pages. Each runs in its own process per mode (the page OCR pool is sized at
+import), from an empty OCR cache:
+
+  * serial       OCR_WORKERS=1: the last page waits for the first
+  * concurrent   OCR_WORKERS=2: both pages rendered and OCR'd at once
+  * timeout      concurrent, with OCR_PAGE_TIMEOUT=--timeout
+
+Timed calls: extract_text_first_and_last_page, and extract_pdf_fields for the
+opening and closing balance together (the /extract-all case: page 1 and the
+last page in one planner step). A call that fails with OcrTimeout (a 503 from
+the API) is shown as 'timed out' instead of its seconds. The concurrent speed-up needs at least two cores; the machine's count is printed.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import corpus_files, print_table, synthetic_statement_text, timed, write_scanned_pdf
+
+BALANCE_FIELDS = ['opening_balance', 'closing_balance']
+MODES = (('serial', '1', '0'), ('concurrent', '2', '0'), ('timeout', '2', None))
+
+
+def run_child(path):
+    """Time both calls on one document in this process and print the measurements as JSON"""
+    import main
+    from admission import OcrTimeout
+    from ocr_cache import OcrCache
+
+    def timed_or_timeout(func, *args):
+        main.OCR_CACHE = OcrCache()
+        try:
+            return timed(func, *args)
+        except OcrTimeout:
+            return None, 'timed out'
+
+    _, first_last_seconds = timed_or_timeout(main.extract_text_first_and_last_page, path)
+    result, balances_seconds = timed_or_timeout(main.extract_pdf_fields, path, BALANCE_FIELDS)
+    print(json.dumps({
+        'first_last_seconds': first_last_seconds, 'balances_seconds': balances_seconds,
+        'pages_read': result[1] if result else [],
+    }))
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir', nargs='?')
+    parser.add_argument('--pages', type=int, default=6, help='pages of the generated scanned statement')
+    parser.add_argument('--timeout', default='5', help="OCR_PAGE_TIMEOUT of the 'timeout' mode, seconds")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args.child)
+        return
+
+    print(f"{os.cpu_count()} CPUs")
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = list(corpus_files(args.corpus_dir, ('.pdf',))) if args.corpus_dir else []
+        if args.pages:
+            text = synthetic_statement_text(transaction_lines=args.pages * 60 - 12, seed=5)
+            documents.append(write_scanned_pdf(text, os.path.join(tmp, 'synthetic_scan.pdf')))
+
+        for path in documents:
+            for mode, workers, timeout in MODES:
+                env = dict(
+                    os.environ, LOG_LEVEL='error', OCR_CACHE_DIR='', OCR_WORKERS=workers,
+                    OCR_MAX_INFLIGHT_PAGES=workers, OCR_PAGE_TIMEOUT=timeout or args.timeout,
+                )
+                output = subprocess.run(
+                    [sys.executable, __file__, '--child', path], check=True, capture_output=True, text=True, env=env,
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                rows.append([
+                    os.path.basename(path), mode, result['first_last_seconds'], result['balances_seconds'],
+                    ','.join(map(str, result['pages_read'])) or '-',
+                ])
+
+    print_table(
+        ['document', 'mode', 'first+last text: s', 'balances: s', 'balances: pages read'], rows,
+    )
+
+
+if __name__ == '__main__':
+    main_cli()
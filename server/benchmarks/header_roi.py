@@ -0,0 +1,117 @@
+"""OCR pixels and time of header-region first page OCR (OCR_FIRST_PAGE_REGION) against the full page.
+
+Usage:
+    python benchmarks/header_roi.py [CORPUS_DIR] [--synthetic 2] [--fraction 0.35]
+
+Uses every PDF in CORPUS_DIR whose first page has no text layer, plus
+--synthetic generated scanned statements (header fields above a transaction
+table). For each header field endpoint, and for all first-page fields
+together as /extract-all requests them, the first page is read once in
+'full' mode and once in 'header' mode with an empty OCR cache, and reported:
+
+  * MP          megapixels handed to Tesseract
+  * s           wall time of extract_text_from_pdf_first_page
+  * fallbacks   header passes that missed the field and re-OCR'd the full page
+  * agree       the field value is the same in both modes
+
+Needs Tesseract (OCR_BACKEND=tesserocr is much faster for this).
+"""
+import argparse
+import os
+import tempfile
+
+import pdfplumber
+
+from common import corpus_files, print_table, require_tesseract, synthetic_statement_text, timed, write_scanned_pdf
+
+import main
+from ocr_cache import OcrCache
+
+FIELDS = [name for name, (scope, _, _) in main.EXTRACT_ALL_FIELDS.items() if scope == 'first']
+
+
+def scanned_pdfs(corpus_dir, synthetic, tmp):
+    paths = []
+    if corpus_dir:
+        for path in corpus_files(corpus_dir, ('.pdf',)):
+            with pdfplumber.open(path) as pdf:
+                if pdf.pages and not main.has_usable_text_layer(pdf.pages[0].extract_text() or ''):
+                    paths.append(path)
+    for i in range(synthetic):
+        text = synthetic_statement_text(transaction_lines=60 + 40 * i, seed=i)
+        paths.append(write_scanned_pdf(text, os.path.join(tmp, f"synthetic_{i + 1}.pdf")))
+    return paths
+
+
+def count_ocr_pixels():
+    """Wrap the OCR engine so every image it receives is counted; returns the running [pixels] total"""
+    total = [0]
+    engine = main.OCR_ENGINE
+    image_to_string = engine.image_to_string
+
+    def counting(image, config=''):
+        total[0] += image.width * image.height
+        return image_to_string(image, config)
+
+    engine.image_to_string = counting
+    return total
+
+
+def read_first_page(path, region, extractors, pixels):
+    main.OCR_FIRST_PAGE_REGION = region
+    main.OCR_CACHE = OcrCache()
+    before = main.METRICS.snapshot()
+    before_pixels = pixels[0]
+    text, elapsed = timed(main.extract_text_from_pdf_first_page, path, extractors)
+    fell_back = _counter(main.METRICS.snapshot(), 'fallback') - _counter(before, 'fallback')
+    values = [extractor(text) for extractor in extractors]
+    return values, (pixels[0] - before_pixels) / 1e6, elapsed, fell_back
+
+
+def _counter(snapshot, result):
+    for name, labels, value in snapshot.get('counters', []):
+        if name == 'ocr_header_region_total' and dict(labels).get('result') == result:
+            return value
+    return 0
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir', nargs='?')
+    parser.add_argument('--synthetic', type=int, default=2, help='generated scanned statements to add')
+    parser.add_argument('--fraction', type=float, default=main.OCR_HEADER_FRACTION, help='OCR_HEADER_FRACTION')
+    args = parser.parse_args()
+    require_tesseract()
+    main.OCR_HEADER_FRACTION = args.fraction
+
+    pixels = count_ocr_pixels()
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = scanned_pdfs(args.corpus_dir, args.synthetic, tmp)
+        if not paths:
+            raise SystemExit("No scanned PDFs to compare")
+        cases = [(field, [main.EXTRACT_ALL_FIELDS[field][2]]) for field in FIELDS]
+        cases.append(('all first-page fields', main.first_page_extractors(FIELDS)))
+        for name, extractors in cases:
+            totals = {'full': [0.0, 0.0], 'header': [0.0, 0.0]}
+            fallbacks = agree = 0
+            for path in paths:
+                full_values, mp, elapsed, _ = read_first_page(path, 'full', extractors, pixels)
+                totals['full'][0] += mp
+                totals['full'][1] += elapsed
+                header_values, mp, elapsed, fell_back = read_first_page(path, 'header', extractors, pixels)
+                totals['header'][0] += mp
+                totals['header'][1] += elapsed
+                fallbacks += fell_back
+                agree += full_values == header_values
+            rows.append([
+                name, totals['full'][0], totals['header'][0], totals['full'][0] / max(totals['header'][0], 1e-9),
+                totals['full'][1], totals['header'][1], f"{fallbacks}/{len(paths)}", f"{agree}/{len(paths)}",
+            ])
+
+    print(f"{len(paths)} scanned PDFs, header fraction {main.OCR_HEADER_FRACTION}")
+    print_table(['fields', 'full MP', 'header MP', 'MP cut x', 'full s', 'header s', 'fallbacks', 'agree'], rows)
+
+
+if __name__ == '__main__':
+    main_cli()
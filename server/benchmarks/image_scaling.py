@@ -0,0 +1,117 @@
+"""Per-image latency, peak memory and field accuracy of Aadhaar/PAN upscaling by DPI tag vs by measured text height.
+
+Usage:
+    python benchmarks/image_scaling.py [CORPUS_DIR] [--max-pixels 12e6] [--text-height 32]
+
+Images are CORPUS_DIR's images (fields from labels.json, see common.py) plus
+generated Aadhaar/PAN-like cards: scans tagged 150 DPI, and phone-like photos
+with no DPI tag at 300 and 400 DPI, which the DPI rule blows up 6.25x per side.
+
+Each image runs through extract_text_from_image_aadhar_pan in its own process,
+once per OCR_IMAGE_SCALING mode, so peak RSS is that image's alone (read from
+/proc, so Linux only):
+
+  * dpi   the DPI tag (72 when missing) scaled to 450, no pixel budget
+  * text  text lines scaled to --text-height px, within --max-pixels
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import (
+    corpus_files, expected_fields, field_accuracy, load_labels, print_table, synthetic_card_texts, timed,
+    write_card_image, IMAGE_EXTENSIONS,
+)
+
+CARD_FIELDS = ['pan_number', 'dob', 'aadhar_number']
+# OCR_IMAGE_MAX_PIXELS for the 'dpi' mode: large enough never to apply
+NO_BUDGET = '1e12'
+
+
+def memory_mb(field):
+    """VmRSS (current) or VmHWM (peak) of this process from /proc, in MB"""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError(f"{field} not in /proc/self/status")
+
+
+def reset_peak_rss():
+    """Start VmHWM over from the current RSS, so the peak excludes start-up (Linux)"""
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+
+
+def build_samples(corpus_dir, tmp):
+    """(name, path, expected fields) for the labelled corpus images and generated cards"""
+    samples = []
+    if corpus_dir:
+        labels = load_labels(corpus_dir)
+        for path in corpus_files(corpus_dir, IMAGE_EXTENSIONS):
+            samples.append((os.path.basename(path), path, labels.get(os.path.basename(path), {})))
+    for i, (kind, text) in enumerate(synthetic_card_texts()):
+        expected = expected_fields(text, CARD_FIELDS)
+        for dpi, dpi_tag in ((150, True), (300, False), (400, False)):
+            name = f"{kind}_{dpi}dpi{'' if dpi_tag else '_untagged'}.png"
+            path = write_card_image(
+                text, os.path.join(tmp, name), dpi=dpi, skew=1.5, noise=10, seed=i, dpi_tag=dpi_tag,
+            )
+            samples.append((name, path, expected))
+    return samples
+
+
+def run_child(args):
+    """OCR one image in this process and print its measurements as JSON"""
+    from PIL import Image
+
+    import main
+
+    with Image.open(args.child) as image:
+        size = image.size
+    reset_peak_rss()
+    baseline = memory_mb('VmRSS')
+    text, elapsed = timed(main.extract_text_from_image_aadhar_pan, args.child)
+    print(json.dumps({
+        'size': size, 'seconds': elapsed, 'peak_rss_mb': memory_mb('VmHWM') - baseline,
+        'accuracy': field_accuracy(text, json.loads(args.expected)),
+    }))
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir', nargs='?')
+    parser.add_argument('--max-pixels', default='12e6', help="pixel budget of the 'text' mode")
+    parser.add_argument('--text-height', default='32', help="target text line height of the 'text' mode")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--expected', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args)
+        return
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, path, expected in build_samples(args.corpus_dir, tmp):
+            for mode, max_pixels in (('dpi', NO_BUDGET), ('text', args.max_pixels)):
+                env = dict(
+                    os.environ, LOG_LEVEL='error', OCR_CACHE_DIR='', OCR_IMAGE_SCALING=mode,
+                    OCR_IMAGE_MAX_PIXELS=max_pixels, OCR_IMAGE_TEXT_HEIGHT=args.text_height,
+                )
+                output = subprocess.run(
+                    [sys.executable, __file__, '--child', path, '--expected', json.dumps(expected)],
+                    check=True, capture_output=True, text=True, env=env,
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                rows.append([
+                    name, 'x'.join(map(str, result['size'])), mode, result['seconds'],
+                    result['peak_rss_mb'], result['accuracy'],
+                ])
+    print_table(['image', 'size', 'scaling', 'seconds', 'peak RSS +MB', 'field accuracy'], rows)
+
+
+if __name__ == '__main__':
+    main_cli()
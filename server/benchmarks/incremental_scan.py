@@ -0,0 +1,95 @@
+"""Pages OCR'd and time of PDF DOB / Aadhaar extraction with and without incremental early-exit scanning.
+
+Usage:
+    python benchmarks/incremental_scan.py [CORPUS_DIR] [--pages 10]
+
+Documents are CORPUS_DIR's PDFs plus two generated scanned KYC bundles of
+--pages pages: one with the Aadhaar card on page 1 (the common case) and one
+with it on the last page (the worst case). The other pages are transaction
+listings, whose 12-digit reference numbers only match the low-confidence
+Aadhaar pattern.
+
+extract_dob and extract_aadhar_number run on each document with
+OCR_INCREMENTAL_SCAN off and on, each from an empty OCR cache. Reported: pages
+OCR'd, seconds, and whether both modes return the same value.
+"""
+import argparse
+import os
+import tempfile
+
+from common import (
+    corpus_files, print_table, require_tesseract, synthetic_card_texts, synthetic_statement_text, timed,
+    write_scanned_pdf,
+)
+
+import main
+from ocr_cache import OcrCache
+
+LINES_PER_PAGE = 40
+
+
+def kyc_bundle(path, pages, card_page):
+    """Scanned PDF of `pages` pages with the Aadhaar card text on page card_page (1-based), transactions elsewhere"""
+    card = dict(synthetic_card_texts())['aadhaar'].splitlines()
+    transactions = synthetic_statement_text(transaction_lines=pages * LINES_PER_PAGE, seed=3).splitlines()[9:]
+    lines = []
+    for number in range(1, pages + 1):
+        page = card if number == card_page else transactions[:LINES_PER_PAGE]
+        if number != card_page:
+            transactions = transactions[LINES_PER_PAGE:]
+        lines.extend(page + [''] * (LINES_PER_PAGE - len(page)))
+    return write_scanned_pdf('\n'.join(lines), path, lines_per_page=LINES_PER_PAGE)
+
+
+def count_ocr_calls():
+    """Wrap the OCR engine to count the images OCR'd"""
+    calls = []
+    engine = main.OCR_ENGINE
+    image_to_string = engine.image_to_string
+
+    def counting(image, config=''):
+        calls.append(1)
+        return image_to_string(image, config)
+
+    engine.image_to_string = counting
+    return calls
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir', nargs='?')
+    parser.add_argument('--pages', type=int, default=10, help='pages of the generated KYC bundles')
+    args = parser.parse_args()
+    require_tesseract()
+
+    calls = count_ocr_calls()
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = list(corpus_files(args.corpus_dir, ('.pdf',))) if args.corpus_dir else []
+        documents.append(kyc_bundle(os.path.join(tmp, 'kyc_card_first.pdf'), args.pages, 1))
+        documents.append(kyc_bundle(os.path.join(tmp, 'kyc_card_last.pdf'), args.pages, args.pages))
+
+        for path in documents:
+            for extract in (main.extract_dob, main.extract_aadhar_number):
+                results = {}
+                for incremental in (False, True):
+                    main.OCR_INCREMENTAL_SCAN = incremental
+                    main.OCR_CACHE = OcrCache()
+                    calls.clear()
+                    value, seconds = timed(extract, path, 'pdf')
+                    results[incremental] = (value, len(calls), seconds)
+                (full_value, full_pages, full_seconds), (value, pages, seconds) = results[False], results[True]
+                rows.append([
+                    os.path.basename(path), extract.__name__, full_pages, full_seconds, pages, seconds,
+                    value == full_value,
+                ])
+
+    print_table(
+        ['document', 'extractor', 'full: pages OCR\'d', 'full: s', 'incremental: pages OCR\'d', 'incremental: s',
+         'same value'],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,78 @@
+"""Time to the first page and to the first+last page text of long digital PDFs, all pages parsed vs lazily.
+
+Usage:
+    python benchmarks/lazy_pages.py [--pages 10,100,1000,5000] [--fan-out 10] [--repeat 3]
+
+Generated text-layer statements of each --pages length are written with a
+flat page tree and with a balanced one (--fan-out kids per node). For each:
+
+  * eager   pdfplumber's pdf.pages, which parses every page before the first
+            (what the page source used before)
+  * lazy    PdfPageSource, which parses only the pages it serves (pdf_pages.py)
+
+'first page' is open + page count + page 1 text; 'first+last' is the whole
+extract_text_first_and_last_page call for lazy, and open + page 1 and last
+page text for eager. Medians of --repeat runs.
+"""
+import argparse
+import os
+import tempfile
+
+import pdfplumber
+
+from common import print_table, summarize, synthetic_statement_text, timed, write_text_pdf
+
+import main
+
+LINES_PER_PAGE = 60
+
+
+def eager_first_page(path):
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages), pdf.pages[0].extract_text()
+
+
+def eager_first_last(path):
+    with pdfplumber.open(path) as pdf:
+        return pdf.pages[0].extract_text(), pdf.pages[-1].extract_text()
+
+
+def lazy_first_page(path):
+    with main.PdfPageSource(path) as source:
+        return source.page_count, source.layer_text(0)
+
+
+def median_seconds(fn, path, repeat):
+    return summarize([timed(fn, path)[1] for _ in range(repeat)])[1]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', default='10,100,1000,5000', help='comma-separated document lengths')
+    parser.add_argument('--fan-out', type=int, default=10, help='kids per node of the balanced page tree')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in (int(count) for count in args.pages.split(',')):
+            text = synthetic_statement_text(transaction_lines=pages * LINES_PER_PAGE - 10)
+            for tree, fan_out in (('flat', None), (f'fan-out {args.fan_out}', args.fan_out)):
+                path = write_text_pdf(text, os.path.join(tmp, f'{pages}_{tree}.pdf'), LINES_PER_PAGE, fan_out)
+                rows.append([
+                    pages, tree, round(os.path.getsize(path) / 1e6, 1),
+                    median_seconds(eager_first_page, path, args.repeat),
+                    median_seconds(lazy_first_page, path, args.repeat),
+                    median_seconds(eager_first_last, path, args.repeat),
+                    median_seconds(main.extract_text_first_and_last_page, path, args.repeat),
+                ])
+
+    print_table(
+        ['pages', 'page tree', 'MB', 'eager: first page s', 'lazy: first page s', 'eager: first+last s',
+         'lazy: first+last s'],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main_cli()
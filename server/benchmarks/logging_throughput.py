@@ -0,0 +1,86 @@
+"""Field extraction throughput under each logging configuration.
+
+Usage:
+    python benchmarks/logging_throughput.py [--lines 50,500,2000] [--seconds 3]
+
+Runs every EXTRACT_ALL_FIELDS extractor over a synthetic statement as one
+"request" (request_log.begin_request + run_field_extractors), for --seconds
+per configuration, and reports extraction passes per second:
+
+  * info        the default: no debug lines, no document text
+  * debug       LOG_LEVEL=debug, without text sampling
+  * debug+text  LOG_LEVEL=debug with every request's texts logged in full
+                (LOG_TEXT_SAMPLE_RATE=1, LOG_TEXT_SAMPLE_CHARS=0), close to the
+                old print() debugging that dumped text on every call
+
+Log output is written to a temporary file, so formatting and I/O are real.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from common import print_table, synthetic_statement_text
+
+import main
+import request_log
+
+CONFIGS = [
+    ('info', logging.INFO, 0.0, 500),
+    ('debug', logging.DEBUG, 0.0, 500),
+    ('debug+text', logging.DEBUG, 1.0, 0),
+]
+
+
+def passes_per_second(text, seconds):
+    fields = list(main.EXTRACT_ALL_FIELDS)
+    passes = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        request_log.begin_request()
+        main.run_field_extractors({'first': text, 'first_last': text, 'all': text}, '.pdf', fields)
+        passes += 1
+    return passes / (time.perf_counter() - started)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', default='50,500,2000', help='comma-separated transaction row counts')
+    parser.add_argument('--seconds', type=float, default=3.0, help='run time per configuration')
+    args = parser.parse_args()
+
+    root = logging.getLogger()
+    handler = root.handlers[0]
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, 'bench.log')
+        with open(log_path, 'w', encoding='utf-8') as log_file:
+            handler.setStream(log_file)
+            for lines in (int(n) for n in args.lines.split(',')):
+                text = synthetic_statement_text(lines)
+                rates = []
+                for name, level, sample_rate, sample_chars in CONFIGS:
+                    root.setLevel(level)
+                    request_log.TEXT_SAMPLE_RATE = sample_rate
+                    request_log.TEXT_SAMPLE_CHARS = sample_chars
+                    before = os.path.getsize(log_path)
+                    rate = passes_per_second(text, args.seconds)
+                    log_file.flush()
+                    log_bytes = (os.path.getsize(log_path) - before) / max(1, rate * args.seconds)
+                    rates.append((rate, log_bytes))
+                info_rate = rates[0][0]
+                rows.append(
+                    [f"{len(text) // 1024} KiB ({lines} rows)"]
+                    + [value for rate, log_bytes in rates for value in (rate, log_bytes / 1024)]
+                    + [info_rate / rates[-1][0]]
+                )
+
+    headers = ['text']
+    for name, *_ in CONFIGS:
+        headers += [f"{name} /s", f"{name} log KiB"]
+    print_table(headers + ['info vs debug+text'], rows)
+
+
+if __name__ == '__main__':
+    main_cli()
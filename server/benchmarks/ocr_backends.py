@@ -0,0 +1,115 @@
+"""Per-page OCR latency of each OCR backend (OCR_BACKEND), with model loading separated out.
+
+Usage:
+    python benchmarks/ocr_backends.py CORPUS_DIR [--dpi 300] [--pages 2] [--repeat 3]
+
+The first --pages pages of every PDF in the corpus are rendered once at --dpi
+(rendering is not timed) and images are used as they are. Each available
+backend then OCRs every page --repeat times with the /extract-text config.
+
+Reported per backend:
+  * startup    OCR of a tiny blank image on a fresh backend: process start and
+               model load for pytesseract, engine initialization for tesserocr,
+               worker process start and warm-up for pool (one worker)
+  * first page latency of the first real page
+  * s/page     mean / median / max over all later calls, i.e. with model
+               loading removed for tesserocr (pytesseract pays it every call)
+  * similarity difflib ratio of the text against the first backend's
+
+pytesseract needs the tesseract binary; tesserocr and pool need `pip install tesserocr`
+and traineddata in TESSDATA_PREFIX or server/tessdata. Missing backends are skipped.
+"""
+import argparse
+import difflib
+import io
+
+import pdfplumber
+from PIL import Image
+
+from common import corpus_files, print_table, summarize, timed
+
+import main
+from ocr_backend import PytesseractBackend, TesserocrBackend
+from ocr_pool import OcrWorkerPool
+
+CUSTOM_CONFIG = r'--oem 3 --psm 6'
+
+
+def available_backends():
+    backends = []
+    if main.PYTESSERACT_AVAILABLE and main.TESSERACT_PATH:
+        backends.append(lambda: PytesseractBackend(main.pytesseract))
+    else:
+        print("pytesseract skipped: tesseract binary not found")
+    try:
+        TesserocrBackend(main.TESSDATA_DIR)
+        backends.append(lambda: TesserocrBackend(main.TESSDATA_DIR))
+        backends.append(lambda: OcrWorkerPool(1, main.TESSDATA_DIR))
+    except (ImportError, RuntimeError) as e:
+        print(f"tesserocr and pool skipped: {e}")
+    return backends
+
+
+def load_pages(corpus_dir, dpi, pages_per_pdf):
+    pages = []
+    for path in corpus_files(corpus_dir):
+        if path.lower().endswith('.pdf'):
+            with open(path, 'rb') as f:
+                data = f.read()
+            with pdfplumber.open(io.BytesIO(data)) as pdf:
+                for page in pdf.pages[:pages_per_pdf]:
+                    pages.append(main.render_pdf_page(page, dpi))
+        else:
+            image = Image.open(path)
+            image.load()
+            pages.append(image)
+    return pages
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir')
+    parser.add_argument('--dpi', type=int, default=300, help='render resolution for PDF pages')
+    parser.add_argument('--pages', type=int, default=2, help='pages per PDF')
+    parser.add_argument('--repeat', type=int, default=3, help='OCR passes over every page')
+    args = parser.parse_args()
+
+    backends = available_backends()
+    if not backends:
+        raise SystemExit("No OCR backend available")
+    pages = load_pages(args.corpus_dir, args.dpi, args.pages)
+    megapixels = sum(page.width * page.height for page in pages) / len(pages) / 1e6
+    print(f"{len(pages)} pages, {megapixels:.1f} MP average, {args.repeat} passes")
+
+    rows = []
+    reference = None
+    blank = Image.new('L', (200, 50), 255)
+    for make_backend in backends:
+        backend = make_backend()
+        _, startup = timed(backend.image_to_string, blank, CUSTOM_CONFIG)
+        texts, first_page = timed(backend.image_to_string, pages[0], CUSTOM_CONFIG)
+        texts = [texts]
+        samples = []
+        for attempt in range(args.repeat):
+            for index, page in enumerate(pages):
+                if attempt == 0 and index == 0:
+                    continue
+                text, elapsed = timed(backend.image_to_string, page, CUSTOM_CONFIG)
+                samples.append(elapsed)
+                if attempt == 0:
+                    texts.append(text)
+
+        joined = '\n'.join(texts)
+        if reference is None:
+            reference = joined
+        similarity = difflib.SequenceMatcher(None, reference, joined).ratio()
+        mean, median, worst = summarize(samples)
+        rows.append([backend.name, startup, first_page, mean, median, worst, similarity])
+        if isinstance(backend, OcrWorkerPool):
+            backend.stop()
+
+    print_table(['backend', 'startup s', 'first page s', 'mean s/page', 'median s/page', 'max s/page', 'similarity'], rows)
+
+
+if __name__ == '__main__':
+    main_cli()
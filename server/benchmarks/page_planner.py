@@ -0,0 +1,99 @@
+"""Pages read, time and field values of the PDF page planner vs the fixed page scopes it replaced.
+
+Usage:
+    python benchmarks/page_planner.py [CORPUS_DIR] [--synthetic-pages 6]
+
+Documents are CORPUS_DIR's PDFs plus a generated scanned statement of
+--synthetic-pages pages. For every single-field endpoint and for /extract-all's
+default fields, each from an empty OCR cache:
+
+  * scopes   the old path: the page scope helper of each field's scope
+             (first page, first and last page, or every page), then the extractors
+  * planner  extract_pdf_fields, which reads each field's likeliest page first
+             and further pages only on a miss
+
+Reported: pages each reads, seconds, and the fields whose values differ
+(ignoring whitespace in the matched text).
+"""
+import argparse
+import os
+import tempfile
+
+from common import corpus_files, print_table, synthetic_statement_text, timed, write_scanned_pdf
+
+import main
+from ocr_cache import OcrCache
+
+
+def scope_text(path, scope, fields):
+    """Text of one page scope, from the helper the endpoints used before the planner"""
+    if scope == 'first':
+        return main.extract_text_from_pdf_first_page(path, required=main.first_page_extractors(fields))
+    if scope == 'first_last':
+        return main.extract_text_first_and_last_page(path)
+    return main.extract_text_from_pdf(path)
+
+
+def extract_by_scope(path, fields):
+    """(results, pages read) the old way: every page of every scope the fields use"""
+    scopes = {main.EXTRACT_ALL_FIELDS[field][0] for field in fields}
+    texts = {scope: scope_text(path, scope, fields) for scope in scopes}
+    results = main.run_field_extractors(texts, '.pdf', fields)
+    with main.PdfPageSource(path) as source:
+        last = source.page_count
+    pages = set()
+    for scope in scopes:
+        pages |= {1} if scope == 'first' else {1, last} if scope == 'first_last' else set(range(1, last + 1))
+    return results, sorted(pages)
+
+
+def page_list(pages):
+    """'1,3' or, for long lists, '1,2,3..300 (300)'"""
+    if len(pages) <= 6:
+        return ','.join(map(str, pages))
+    return f"{','.join(map(str, pages[:3]))}..{pages[-1]} ({len(pages)})"
+
+
+def differing_fields(old, new):
+    """Fields whose results differ other than in whitespace"""
+    def normal(value):
+        return ' '.join(value.split()) if isinstance(value, str) else (
+            {k: normal(v) for k, v in value.items()} if isinstance(value, dict) else value
+        )
+    return [field for field in old if normal(old[field]) != normal(new.get(field))]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir', nargs='?')
+    parser.add_argument('--synthetic-pages', type=int, default=6, help='pages of the generated scanned statement')
+    args = parser.parse_args()
+
+    field_sets = [[field] for field in main.EXTRACT_ALL_FIELDS] + [list(main.DEFAULT_EXTRACT_ALL_FIELDS)]
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = list(corpus_files(args.corpus_dir, ('.pdf',))) if args.corpus_dir else []
+        if args.synthetic_pages:
+            text = synthetic_statement_text(transaction_lines=args.synthetic_pages * 60 - 12, seed=5)
+            documents.append(write_scanned_pdf(text, os.path.join(tmp, 'synthetic_scan.pdf')))
+
+        for path in documents:
+            for fields in field_sets:
+                main.OCR_CACHE = OcrCache()
+                (old, old_pages), old_seconds = timed(extract_by_scope, path, fields)
+                main.OCR_CACHE = OcrCache()
+                (new, new_pages), new_seconds = timed(main.extract_pdf_fields, path, fields)
+                rows.append([
+                    os.path.basename(path), fields[0] if len(fields) == 1 else 'extract-all default',
+                    page_list(old_pages), old_seconds, page_list(new_pages), new_seconds,
+                    ','.join(differing_fields(old, new)) or '-',
+                ])
+
+    print_table(
+        ['document', 'fields', 'scopes: pages', 'scopes: s', 'planner: pages', 'planner: s', 'differing fields'],
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main_cli()
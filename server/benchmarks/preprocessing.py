@@ -0,0 +1,125 @@
+"""OCR input size, time and field accuracy with each OCR_PREPROCESS pipeline, for ID cards and scanned statements.
+
+Usage:
+    python benchmarks/preprocessing.py [CORPUS_DIR] [--cards 3] [--statements 2] [--dpis 300,400,500]
+
+Samples are CORPUS_DIR's labelled files (labels.json, see common.py) plus
+generated ones with known fields: Aadhaar/PAN-like card photos (tinted,
+noisy, slightly rotated, 150 DPI) and scanned statements (noisy, skewed).
+
+  * images go through extract_text_from_image_aadhar_pan (450 DPI upscale)
+  * PDF pages through ocr_pdf_page at each of --dpis, to see whether
+    preprocessing lets a lower DPI keep the accuracy of a higher one
+
+Reported per sample kind, pipeline and DPI: MB handed to Tesseract per page,
+seconds per page (preprocessing included) and labelled-field accuracy.
+"""
+import argparse
+import os
+import tempfile
+
+import pdfplumber
+
+from common import (
+    corpus_files, field_accuracy, expected_fields, load_labels, print_table, require_tesseract,
+    synthetic_card_texts, synthetic_statement_text, timed, write_card_image, write_scanned_pdf,
+)
+
+import main
+from ocr_cache import OcrCache
+from preprocess import Preprocessor, parse_steps
+
+PIPELINES = ['off', 'grayscale', 'grayscale,threshold', 'denoise,deskew,threshold']
+CARD_FIELDS = ['pan_number', 'dob', 'aadhar_number']
+STATEMENT_FIELDS = [name for name, (scope, _, _) in main.EXTRACT_ALL_FIELDS.items() if scope == 'first']
+# Bits per pixel of what Tesseract receives
+MODE_BITS = {'1': 1, 'L': 8, 'RGB': 24, 'RGBA': 32}
+
+
+def build_samples(corpus_dir, cards, statements, tmp):
+    """(kind, path, expected fields) for every labelled corpus file and generated sample"""
+    samples = []
+    if corpus_dir:
+        labels = load_labels(corpus_dir)
+        for path in corpus_files(corpus_dir):
+            expected = labels.get(os.path.basename(path))
+            if expected:
+                samples.append(('pdf' if path.lower().endswith('.pdf') else 'image', path, expected))
+    card_texts = synthetic_card_texts()
+    for i in range(cards):
+        kind, text = card_texts[i % len(card_texts)]
+        path = write_card_image(text, os.path.join(tmp, f"{kind}_{i + 1}.png"), skew=1.5 + i, noise=12, seed=i)
+        samples.append(('card', path, expected_fields(text, CARD_FIELDS)))
+    for i in range(statements):
+        text = synthetic_statement_text(transaction_lines=40, seed=i)
+        path = write_scanned_pdf(text, os.path.join(tmp, f"statement_{i + 1}.pdf"), skew=1.0 + i, noise=10, seed=i)
+        samples.append(('statement', path, expected_fields(text, STATEMENT_FIELDS)))
+    return samples
+
+
+def measure_ocr_input():
+    """Wrap the OCR engine to record how many bytes each image handed to it holds"""
+    sizes = []
+    engine = main.OCR_ENGINE
+    image_to_string = engine.image_to_string
+
+    def recording(image, config=''):
+        sizes.append(image.width * image.height * MODE_BITS.get(image.mode, 24) / 8)
+        return image_to_string(image, config)
+
+    engine.image_to_string = recording
+    return sizes
+
+
+def ocr_sample(kind, path, dpi):
+    """Text of one sample the way its endpoint OCRs it, and the pages OCR'd"""
+    main.OCR_CACHE = OcrCache()
+    if kind in ('card', 'image'):
+        return main.extract_text_from_image_aadhar_pan(path), 1
+    texts = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages[:1]:
+            texts.append(main.ocr_pdf_page(page, dpi, r'--oem 3 --psm 6'))
+    return '\n'.join(texts), len(texts)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir', nargs='?')
+    parser.add_argument('--cards', type=int, default=3, help='generated ID card images')
+    parser.add_argument('--statements', type=int, default=2, help='generated scanned statements')
+    parser.add_argument('--dpis', default='300,400,500', help='PDF render resolutions to compare')
+    args = parser.parse_args()
+    require_tesseract()
+    dpis = [int(dpi) for dpi in args.dpis.split(',')]
+
+    sizes = measure_ocr_input()
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        samples = build_samples(args.corpus_dir, args.cards, args.statements, tmp)
+        kinds = sorted({kind for kind, _, _ in samples})
+        for kind in kinds:
+            kind_samples = [sample for sample in samples if sample[0] == kind]
+            for dpi in (dpis if kind in ('statement', 'pdf') else [None]):
+                for pipeline in PIPELINES:
+                    main.OCR_PREPROCESS = Preprocessor(parse_steps(pipeline))
+                    sizes.clear()
+                    seconds = pages = 0
+                    accuracies = []
+                    for _, path, expected in kind_samples:
+                        (text, page_count), elapsed = timed(ocr_sample, kind, path, dpi)
+                        seconds += elapsed
+                        pages += page_count
+                        accuracies.append(field_accuracy(text, expected))
+                    accuracies = [a for a in accuracies if a is not None]
+                    rows.append([
+                        kind, dpi or 'endpoint', pipeline, sum(sizes) / len(sizes) / 1e6, seconds / pages,
+                        sum(accuracies) / len(accuracies) if accuracies else None,
+                    ])
+
+    print(f"{len(samples)} samples ({', '.join(kinds)})")
+    print_table(['kind', 'dpi', 'preprocess', 'MB to OCR/page', 's/page', 'field accuracy'], rows)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,155 @@
+"""Peak memory and per-page time of handing rendered PDF pages to Tesseract, before and after grayscale raw handoff.
+
+Usage:
+    python benchmarks/raster_handoff.py [CORPUS_DIR] [--dpi 800] [--pages 1] [--synthetic 1]
+
+Pages are the first --pages pages of every PDF in CORPUS_DIR plus --synthetic
+generated scanned statements. Each pipeline runs in its own process so its
+peak RSS can be read from the OS:
+
+  * before  pdfplumber page.to_image(): a BGRx render converted to an RGB copy;
+            pytesseract writes it as a temp PNG, tesserocr's SetImage encodes a BMP
+  * after   render_pdf_page(): pdfium renders straight to 8-bit grayscale;
+            pytesseract writes an uncompressed PNM, tesserocr gets the raw buffer
+
+Reported per pipeline: render, pytesseract temp-file write (the encode only;
+the tesseract binary need not be installed), tesserocr OCR (when installed),
+raster MB per page, peak RSS above the process baseline, and how similar the
+OCR text is to the 'before' text.
+"""
+import argparse
+import difflib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pdfplumber
+import pytesseract.pytesseract
+
+from common import corpus_files, print_table, summarize, synthetic_statement_text, timed, write_scanned_pdf
+
+import main
+from ocr_backend import TesserocrBackend
+
+CUSTOM_CONFIG = r'--oem 3 --psm 6'
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def pdf_paths(corpus_dir, synthetic, tmp):
+    paths = list(corpus_files(corpus_dir, ('.pdf',))) if corpus_dir else []
+    for i in range(synthetic):
+        text = synthetic_statement_text(transaction_lines=50, seed=i)
+        paths.append(write_scanned_pdf(text, os.path.join(tmp, f"synthetic_{i + 1}.pdf")))
+    return paths
+
+
+def render_before(page, dpi):
+    with main._pdfium_lock:
+        return page.to_image(resolution=dpi).original
+
+
+def tempfile_write(image):
+    """Time pytesseract's temp-file save for image (its format picks PNG or PNM)"""
+    started = time.perf_counter()
+    with pytesseract.pytesseract.save(image):
+        pass
+    return time.perf_counter() - started
+
+
+def run_child(args):
+    """Run one pipeline over every page and print its measurements as JSON"""
+    try:
+        tesserocr_backend = TesserocrBackend(main.TESSDATA_DIR)
+    except (ImportError, RuntimeError):
+        tesserocr_backend = None
+    set_image_ocr = set_image_engine(tesserocr_backend) if tesserocr_backend and args.child == 'before' else None
+    baseline = peak_rss_mb()
+    renders, writes, ocrs, raster_mb, texts = [], [], [], [], []
+    for path in args.paths:
+        with pdfplumber.open(path) as pdf:
+            for page in pdf.pages[:args.pages]:
+                if args.child == 'before':
+                    image, elapsed = timed(render_before, page, args.dpi)
+                else:
+                    image, elapsed = timed(main.render_pdf_page, page, args.dpi)
+                renders.append(elapsed)
+                raster_mb.append(image.width * image.height * len(image.getbands()) / 1e6)
+                if args.child == 'after':
+                    image.format = 'PPM'
+                writes.append(tempfile_write(image))
+                if tesserocr_backend is not None:
+                    if args.child == 'before':
+                        text, elapsed = timed(set_image_ocr, image)
+                    else:
+                        text, elapsed = timed(tesserocr_backend.image_to_string, image, CUSTOM_CONFIG)
+                    ocrs.append(elapsed)
+                    texts.append(text)
+                del image
+    print(json.dumps({
+        'render': summarize(renders)[0], 'write': summarize(writes)[0], 'ocr': summarize(ocrs)[0],
+        'raster_mb': summarize(raster_mb)[0], 'peak_rss_mb': peak_rss_mb() - baseline,
+        'pages': len(renders), 'text': '\n'.join(texts),
+    }))
+
+
+def set_image_engine(backend):
+    """A tesserocr engine used the way TesserocrBackend did before raw handoff: SetImage, which encodes a BMP"""
+    import tesserocr
+
+    api = tesserocr.PyTessBaseAPI(path=backend.tessdata_path, lang=backend.lang, oem=tesserocr.OEM.DEFAULT)
+    api.SetPageSegMode(tesserocr.PSM.SINGLE_BLOCK)
+
+    def image_to_string(image):
+        api.SetImage(image)
+        return api.GetUTF8Text()
+    return image_to_string
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir', nargs='?')
+    parser.add_argument('--dpi', type=int, default=800, help='render resolution')
+    parser.add_argument('--pages', type=int, default=1, help='pages per PDF')
+    parser.add_argument('--synthetic', type=int, default=1, help='generated scanned statements to add')
+    parser.add_argument('--child', choices=['before', 'after'], help=argparse.SUPPRESS)
+    parser.add_argument('--paths', nargs='*', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = pdf_paths(args.corpus_dir, args.synthetic, tmp)
+        results = {}
+        for pipeline in ('before', 'after'):
+            output = subprocess.run(
+                [sys.executable, __file__, '--child', pipeline, '--dpi', str(args.dpi),
+                 '--pages', str(args.pages), '--paths', *paths],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results[pipeline] = json.loads(output.strip().splitlines()[-1])
+
+    reference = results['before']['text']
+    rows = []
+    for pipeline, result in results.items():
+        similarity = difflib.SequenceMatcher(None, reference, result['text']).ratio() if reference else None
+        rows.append([
+            pipeline, result['render'], result['write'], result['ocr'],
+            result['raster_mb'], result['peak_rss_mb'], similarity,
+        ])
+    print(f"{results['before']['pages']} pages at {args.dpi} DPI")
+    print_table(
+        ['pipeline', 'render s', 'temp file s', 'tesserocr s', 'raster MB', 'peak RSS +MB', 'similarity'], rows
+    )
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,144 @@
+"""Parity and speed check for the single-scan field engine (src/field_scan.py).
+
+Usage:
+    python benchmarks/scan_parity.py [--text-dir DIR] [--fuzz 500] [--repeat 10]
+
+Every text is checked twice:
+  * pattern level: for each anchored pattern, ScannedText.search / findall must
+    equal Pattern.search / findall over the whole text, and line_indexes must
+    cover every line the pattern matches in;
+  * field level: every EXTRACT_ALL_FIELDS extractor must return the same value
+    with label anchors as with anchors disabled (plain full-text scans).
+
+Texts are synthetic statements, every *.txt in --text-dir (e.g. saved
+/extract-text output) and --fuzz random label soups that mix keywords in odd
+cases, spacing, masked/spaced emails and case-folding special characters.
+Exits non-zero on the first mismatch. Timing compares running all fields over
+each text with anchors against the full-scan path.
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+
+from common import print_table, summarize, synthetic_statement_text, timed
+
+import main
+import patterns
+from field_scan import ScannedText
+
+FUZZ_TOKENS = [
+    'PAN', 'pan no.', 'Pan Number:', 'ABCPE1234F', 'abcpe 1234 f', 'Customer ID', 'CUST. ID:', 'CustID', 'CIF No',
+    'CRN', 'relationship no', 'User Id', 'Client Code', 'CKYC', 'ckyc no:', 'CKYC-', '12345678901234', '1234*****01234',
+    'IFSC Code', 'ifsc:', 'HDFC0001234', 'Mobile No.', 'phone number', 'Registered Mobile Number', 'Tel No', 'SMS',
+    '98XXXXXX12', '9876543210/9123456780', 'Account No', 'A/C No.', 'acc number', 'Bank Account Number',
+    '50100123456789', 'Account Type', 'A.C. Type', 'a/c category', 'SCHEME', 'Product Code', 'Mode of Operation',
+    'SAVINGS ACCOUNT', 'current a/c', 'Email', 'E-mail ID:', 'mail', 'foo.bar@gmail.com', 'a***b@yahoo.co',
+    'user @ domain . com', '@', ' @ ', 'x@y', 'Opening Balance', 'OPENINGBALANCE', 'opening bal.', 'Balance B/F',
+    'brought forward', 'Closing Balance', 'closing bal', 'Carried Forward', 'C/F Balance', 'book closing balance',
+    '42,650.00', '(CR)', '(DR)', '.00', 'AS ON 18-08-25 16:18:49 PM', 'DATE', 'Date of Birth', 'DOB:', 'D.O.B',
+    'born', 'birth date', '15/08/1990', '1990-08-15', '15 August 1990', 'Aug 15, 1990', 'UID', 'Aadhaar',
+    'enrolment no', '7723 2356 1747', '772323561747', 'Statement Period', 'from', 'to', '01/04/2025', '30/06 /2025',
+    'TRANSACTION', 'CONTACT', 'DETAILS', '-', ':', '/', ',', '.', '*', '=', '|', '\t', '  ',
+    'İ', 'ſ', 'K', 'é', '₹',
+]
+
+FUZZ_SEPARATORS = [' ', ' ', ' ', '', '\n', '\n', ': ', '  ', '\t']
+
+
+def fuzz_text(rng, tokens=120):
+    """Random label soup; about one text in eight contains a case-folding special character"""
+    pool = FUZZ_TOKENS if rng.random() < 0.125 else [t for t in FUZZ_TOKENS if t not in ('İ', 'ſ', 'K')]
+    parts = []
+    for _ in range(tokens):
+        token = rng.choice(pool)
+        if rng.random() < 0.3:
+            token = rng.choice([token.upper(), token.lower(), token.title()])
+        parts.append(token)
+        parts.append(rng.choice(FUZZ_SEPARATORS))
+    text = ''.join(parts)
+    return text.upper() if rng.random() < 0.5 else text
+
+
+def load_texts(args):
+    texts = [synthetic_statement_text(lines, seed) for lines in (0, 20, 500, 2000) for seed in (1, 2)]
+    if args.text_dir:
+        for name in sorted(os.listdir(args.text_dir)):
+            if name.endswith('.txt'):
+                with open(os.path.join(args.text_dir, name), 'r', encoding='utf-8') as f:
+                    text = f.read()
+                texts.extend([text, text.upper()])
+    rng = random.Random(args.seed)
+    texts.extend(fuzz_text(rng) for _ in range(args.fuzz))
+    return texts
+
+
+def match_key(match):
+    return None if match is None else (match.span(), match.groups())
+
+
+def check_patterns(text):
+    """Mismatch descriptions between anchored and full-text pattern results"""
+    problems = []
+    scanned = ScannedText(text)
+    lines = text.split('\n')
+    for pattern in list(patterns.PATTERN_ANCHORS) + list(patterns.AT_SIGN_ANCHORS):
+        if scanned.findall(pattern) != pattern.findall(text):
+            problems.append(f"findall {pattern.pattern[:60]!r}")
+        if match_key(scanned.search(pattern)) != match_key(pattern.search(text)):
+            problems.append(f"search {pattern.pattern[:60]!r}")
+    for pattern in (patterns.OPENING_BALANCE_HEADER, patterns.CLOSING_BALANCE_HEADER):
+        expected = {i for i, line in enumerate(lines) if pattern.search(line)}
+        if not expected <= set(scanned.line_indexes(pattern)):
+            problems.append(f"line_indexes {pattern.pattern[:60]!r}")
+    return problems
+
+
+def run_fields(scanned):
+    return {field: extractor(scanned) for field, (_, _, extractor) in main.EXTRACT_ALL_FIELDS.items()}
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--text-dir')
+    parser.add_argument('--fuzz', type=int, default=500, help='random label-soup texts to check')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=10, help='timing repeats per synthetic statement')
+    args = parser.parse_args()
+
+    texts = load_texts(args)
+    fallback_texts = 0
+    for number, text in enumerate(texts):
+        problems = check_patterns(text)
+        with contextlib.redirect_stdout(io.StringIO()):
+            anchored, full = ScannedText(text), ScannedText(text, anchors=False)
+            fallback_texts += not anchored.anchored
+            anchored_fields, full_fields = run_fields(anchored), run_fields(full)
+        problems += [
+            f"field {field}: {anchored_fields[field]!r} != {full_fields[field]!r}"
+            for field in full_fields if anchored_fields[field] != full_fields[field]
+        ]
+        if problems:
+            print(f"❌ text #{number} ({len(text)} chars):\n   " + "\n   ".join(problems), file=sys.stderr)
+            sys.exit(1)
+    print(f"✅ {len(texts)} texts identical ({fallback_texts} took the full-scan path for special characters)")
+
+    rows = []
+    for lines in (50, 500, 2000):
+        text = synthetic_statement_text(lines)
+        timings = {'full': [], 'anchored': []}
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.repeat):
+                timings['full'].append(timed(run_fields, ScannedText(text, anchors=False))[1] * 1000)
+                timings['anchored'].append(timed(run_fields, ScannedText(text))[1] * 1000)
+        full_mean = summarize(timings['full'])[0]
+        anchored_mean = summarize(timings['anchored'])[0]
+        rows.append([f"{len(text) // 1024} KiB ({lines} rows)", full_mean, anchored_mean, full_mean / anchored_mean])
+
+    print_table(['text', 'full scan ms', 'single scan ms', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    main_cli()
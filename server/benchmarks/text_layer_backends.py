@@ -0,0 +1,68 @@
+"""Speed and parity of the pdfplumber and pdfium PDF text-layer backends on digital statements.
+
+Usage:
+    python benchmarks/text_layer_backends.py [CORPUS_DIR] [--pages 50] [--repeat 3]
+
+Documents are CORPUS_DIR's PDFs plus a generated digital statement of --pages
+pages. For each backend (PDF_TEXT_BACKEND, see src/text_layer.py):
+
+  * seconds      every page's text, as extract_text_from_pdf reads it (median of --repeat)
+  * same pages   pages whose text is the same as pdfplumber's, ignoring whitespace
+  * fields       the fields whose extracted value differs from pdfplumber's, for
+                 every field of /extract-all
+
+Scanned pages are OCR'd the same way by both backends; the OCR cache is kept
+between runs so only the first run of a scanned document pays for OCR.
+"""
+import argparse
+import os
+import tempfile
+
+from common import corpus_files, print_table, summarize, synthetic_statement_text, timed, write_text_pdf
+
+import main
+
+
+def page_texts(path, layer):
+    with main.PdfPageSource(path, layer) as source:
+        return source.page_texts(range(source.page_count))
+
+
+def fields(path, layer):
+    with main.PdfPageSource(path, layer) as source:
+        return main.pdf_fields(source, list(main.EXTRACT_ALL_FIELDS))[0]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus_dir', nargs='?')
+    parser.add_argument('--pages', type=int, default=50, help='pages of the generated digital statement')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = list(corpus_files(args.corpus_dir, ('.pdf',))) if args.corpus_dir else []
+        if args.pages:
+            text = synthetic_statement_text(transaction_lines=args.pages * 60 - 10)
+            documents.append(write_text_pdf(text, os.path.join(tmp, 'synthetic_statement.pdf')))
+
+        for path in documents:
+            baseline = main.TEXT_LAYERS['pdfplumber']
+            baseline_texts = page_texts(path, baseline)
+            baseline_fields = fields(path, baseline)
+            for name, layer in main.TEXT_LAYERS.items():
+                seconds = summarize([timed(page_texts, path, layer)[1] for _ in range(args.repeat)])[1]
+                texts = page_texts(path, layer)
+                same = sum(a.split() == b.split() for a, b in zip(texts, baseline_texts))
+                values = fields(path, layer)
+                differing = [field for field, value in values.items() if value != baseline_fields[field]]
+                rows.append([
+                    os.path.basename(path), name, seconds, f"{same}/{len(baseline_texts)}", ','.join(differing) or '-',
+                ])
+
+    print_table(['document', 'backend', 'seconds', 'same pages', 'differing fields'], rows)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,157 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+
+class OcrBusy(Exception):
+    """OCR capacity is exhausted; the caller should retry after `retry_after` seconds"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class OcrTimeout(OcrBusy):
+    """A page's OCR was not done within the request's time limit; it finishes in the background"""
+
+
+class OcrTicket:
+    """A place in the OCR queue, taken when a page is submitted and given up once it holds a slot"""
+
+    def __init__(self, blocking):
+        self.blocking = blocking
+        self.queued_at = time.monotonic()
+        self.queued = True
+
+
+class OcrAdmission:
+    """Process-wide admission control for OCR pages.
+
+    At most `max_pages` pages are rendered/OCR'd at once, and their decoded
+    rasters together stay under `max_raster_bytes` (a single larger page is
+    still let through when nothing else is running). Pages waiting for a slot
+    form a queue of at most `max_queue`; when it is full, or a page has waited
+    `max_wait` seconds, OcrBusy is raised so the request can be answered with
+    429 instead of piling up tesseract processes until the container is OOM-killed.
+
+    Blocking tickets (background jobs) wait as long as needed and are never
+    rejected, but still count towards the queue depth.
+    """
+
+    def __init__(self, max_pages, max_raster_bytes=0, max_queue=16, max_wait=120):
+        self.max_pages = max_pages
+        self.max_raster_bytes = max_raster_bytes
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self._pages_in_flight = 0
+        self._raster_bytes = 0
+        self._queue_depth = 0
+        self._peak_queue_depth = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        # Moving average of how long a page holds its slot, for Retry-After
+        self._hold_seconds = 1.0
+
+    def enqueue(self, blocking=False):
+        """Join the OCR queue, or raise OcrBusy straight away when it is full"""
+        with self._cond:
+            if not blocking and self._queue_depth >= self.max_queue:
+                self._rejected += 1
+                raise OcrBusy(f"OCR queue is full ({self._queue_depth} pages waiting)", self._retry_after())
+            self._queue_depth += 1
+            self._peak_queue_depth = max(self._peak_queue_depth, self._queue_depth)
+        return OcrTicket(blocking)
+
+    def dequeue(self, ticket):
+        """Leave the queue without OCR'ing (cache hit, cancelled page); safe to call more than once"""
+        with self._cond:
+            if ticket.queued:
+                ticket.queued = False
+                self._queue_depth -= 1
+                self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, raster_bytes, ticket=None):
+        """Hold one OCR page slot and `raster_bytes` of the raster budget for the duration of the block.
+
+        `ticket` is the queue place taken when the page was submitted; a fresh
+        one is taken if it is missing or was already used (e.g. adaptive DPI
+        re-rendering the same page).
+        """
+        if ticket is None:
+            ticket = self.enqueue()
+        elif not ticket.queued:
+            ticket = self.enqueue(blocking=True)
+
+        with self._cond:
+            deadline = None if ticket.blocking else ticket.queued_at + self.max_wait
+            while not self._has_room(raster_bytes):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    ticket.queued = False
+                    self._queue_depth -= 1
+                    self._timed_out += 1
+                    self._cond.notify_all()
+                    raise OcrBusy(f"Waited {self.max_wait}s for an OCR slot", self._retry_after())
+                self._cond.wait(remaining)
+
+            ticket.queued = False
+            self._queue_depth -= 1
+            self._pages_in_flight += 1
+            self._raster_bytes += raster_bytes
+            self._admitted += 1
+            waited = time.monotonic() - ticket.queued_at
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._pages_in_flight -= 1
+                self._raster_bytes -= raster_bytes
+                self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * (time.monotonic() - started)
+                self._cond.notify_all()
+
+    def stats(self):
+        """Current load and counters for the health endpoint"""
+        with self._cond:
+            return {
+                'pages_in_flight': self._pages_in_flight,
+                'max_pages': self.max_pages,
+                'raster_bytes_in_flight': self._raster_bytes,
+                'max_raster_bytes': self.max_raster_bytes,
+                'queue_depth': self._queue_depth,
+                'peak_queue_depth': self._peak_queue_depth,
+                'max_queue': self.max_queue,
+                'admitted': self._admitted,
+                'rejected': self._rejected,
+                'timed_out': self._timed_out,
+                'wait_seconds_total': round(self._wait_seconds_total, 3),
+                'wait_seconds_max': round(self._wait_seconds_max, 3),
+                'wait_seconds_mean': round(self._wait_seconds_total / self._admitted, 3) if self._admitted else 0.0,
+            }
+
+    def retry_after(self):
+        """Seconds for the pages queued or in flight now to drain through the slots"""
+        with self._cond:
+            return self._retry_after()
+
+    def _has_room(self, raster_bytes):
+        # Caller holds self._cond
+        if self._pages_in_flight >= self.max_pages:
+            return False
+        if self.max_raster_bytes and self._pages_in_flight:
+            return self._raster_bytes + raster_bytes <= self.max_raster_bytes
+        return True
+
+    def _retry_after(self):
+        # Caller holds self._cond. Time for the pages ahead to drain through the slots.
+        backlog = self._queue_depth + self._pages_in_flight
+        return max(1, math.ceil(self._hold_seconds * backlog / self.max_pages))
@@ -0,0 +1,233 @@
+"""Batch field extraction over a folder (or glob) of PDFs and images.
+
+Replaces the hard-coded folder loop in regex.py with the server's extractors:
+
+    python src/batch.py /data/statements --output results.csv
+    python src/batch.py "/data/**/*.pdf" --output results.parquet --fields pan_number,customer_id,account_type
+
+Files are processed concurrently across worker processes. Every finished file
+is appended to a checkpoint (<output>.checkpoint.jsonl by default), so an
+interrupted run picks up where it stopped when started again with the same
+arguments; the final CSV / Parquet / JSONL output is written from the
+checkpoint at the end.
+
+A worker process that dies (OOM, segfault) breaks the whole pool. The files
+that were in flight on it are then rerun one at a time, each in a worker of
+its own, so only a file that kills its worker on its own is recorded as an
+error.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+# Parallelism comes from the worker processes, so each one OCRs its pages serially
+os.environ.setdefault('OCR_WORKERS', '1')
+
+import main
+
+SUPPORTED_EXTENSIONS = tuple(main.IMAGE_EXTENSIONS) + ('.pdf',)
+
+
+def find_input_files(inputs):
+    """Expand directories (recursively) and glob patterns into a sorted list of supported files"""
+    files = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                for name in names:
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        files.add(os.path.abspath(os.path.join(root, name)))
+        else:
+            for path in glob.glob(item, recursive=True):
+                if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS):
+                    files.add(os.path.abspath(path))
+    return sorted(files)
+
+
+def file_key(path):
+    """Checkpoint key: path plus size and mtime, so files changed since the last run are redone"""
+    stat = os.stat(path)
+    return f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def load_checkpoint(checkpoint_path, retry_errors=False):
+    """Records already written to the checkpoint, keyed by file_key"""
+    records = {}
+    if not os.path.exists(checkpoint_path):
+        return records
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Partial last line from a crash mid-write
+                continue
+            if retry_errors and record.get('error'):
+                continue
+            records[record['key']] = record
+    return records
+
+
+def end_partial_line(checkpoint_path):
+    """End a last line cut short by a crash, so the next record appended is not glued onto it"""
+    try:
+        with open(checkpoint_path, 'rb+') as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    except FileNotFoundError:
+        pass
+
+
+def process_file(path, fields):
+    """Worker: run the requested field extractors over one file"""
+    started = time.perf_counter()
+    record = {'file': path, 'file_type': os.path.splitext(path)[1].lower(), 'error': None}
+    main.wait_for_ocr_capacity()
+    try:
+        results, record['pages_read'] = main.extract_all_fields(path, record['file_type'], fields)
+        record.update(results)
+    except Exception as e:
+        record['error'] = str(e)
+    record['elapsed_s'] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def process_file_alone(path, fields):
+    """process_file in a worker process of its own, so a worker that dies can only be this file's doing"""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        try:
+            return executor.submit(process_file, path, fields).result()
+        except BrokenProcessPool as e:
+            return {'file': path, 'file_type': os.path.splitext(path)[1].lower(), 'error': f"worker process died: {e}"}
+
+
+def write_output(records, output_path, output_format, fields):
+    """Write the final results table as csv, parquet or jsonl"""
+    columns = ['file', 'file_type'] + list(fields) + ['pages_read', 'error', 'elapsed_s']
+
+    if output_format == 'jsonl':
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps({column: record.get(column) for column in columns}) + "\n")
+        return
+
+    import pandas as pd
+
+    # Nested results (balances, account type, email lists) become JSON strings in flat formats
+    rows = [
+        {
+            column: json.dumps(record.get(column)) if isinstance(record.get(column), (dict, list)) else record.get(column)
+            for column in columns
+        }
+        for record in records
+    ]
+    df = pd.DataFrame(rows, columns=columns)
+    if output_format == 'parquet':
+        df.to_parquet(output_path, index=False)
+    else:
+        df.to_csv(output_path, index=False)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='+', help='directories and/or glob patterns')
+    parser.add_argument('--output', required=True, help='output file (.csv, .parquet or .jsonl)')
+    parser.add_argument('--format', choices=['csv', 'parquet', 'jsonl'], help='defaults to the output file extension')
+    parser.add_argument('--fields', help=f"comma-separated fields (default: {','.join(main.DEFAULT_EXTRACT_ALL_FIELDS)})")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='worker processes')
+    parser.add_argument('--checkpoint', help='checkpoint file (default: <output>.checkpoint.jsonl)')
+    parser.add_argument('--retry-errors', action='store_true', help='redo files that failed in a previous run')
+    args = parser.parse_args()
+
+    output_format = args.format or os.path.splitext(args.output)[1].lstrip('.').lower()
+    if output_format not in ('csv', 'parquet', 'jsonl'):
+        parser.error('cannot infer output format; pass --format')
+
+    fields, unknown_fields = main.parse_requested_fields(args.fields)
+    if unknown_fields:
+        parser.error(f"unknown fields: {', '.join(unknown_fields)} (supported: {', '.join(main.EXTRACT_ALL_FIELDS)})")
+
+    checkpoint_path = args.checkpoint or f"{args.output}.checkpoint.jsonl"
+    files = find_input_files(args.inputs)
+    done = load_checkpoint(checkpoint_path, retry_errors=args.retry_errors)
+    keys = {path: file_key(path) for path in files}
+    todo = [path for path in files if keys[path] not in done]
+
+    print(f"📄 {len(files)} files found, {len(files) - len(todo)} already done, {len(todo)} to process", file=sys.stderr)
+
+    started = time.perf_counter()
+    completed = 0
+    end_partial_line(checkpoint_path)
+    with open(checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+
+        def finish(path, record):
+            nonlocal completed
+            record['key'] = keys[path]
+            checkpoint.write(json.dumps(record) + "\n")
+            checkpoint.flush()
+            done[record['key']] = record
+            completed += 1
+            if record.get('error'):
+                print(f"❌ {path}: {record['error']}", file=sys.stderr)
+            if completed % 100 == 0 or completed == len(todo):
+                rate = completed / (time.perf_counter() - started)
+                print(f"   {completed}/{len(todo)} files ({rate:.1f} files/s)", file=sys.stderr)
+
+        remaining = iter(todo)
+        executor = ProcessPoolExecutor(max_workers=max(1, args.workers))
+        try:
+            in_flight = {}
+            while True:
+                # Keep a bounded number of files queued so huge backfills don't build 50k futures up front
+                while len(in_flight) < args.workers * 4:
+                    path = next(remaining, None)
+                    if path is None:
+                        break
+                    in_flight[executor.submit(process_file, path, fields)] = path
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                if any(isinstance(future.exception(), BrokenProcessPool) for future in finished):
+                    # A worker died (e.g. OOM) and took the pool, and every file still on it, down with it.
+                    # Keep what finished, then rerun the rest one at a time so that only a file that kills a
+                    # worker on its own is checkpointed as an error.
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    suspects = []
+                    for future, path in in_flight.items():
+                        if future.done() and not future.cancelled() and future.exception() is None:
+                            finish(path, future.result())
+                        else:
+                            suspects.append(path)
+                    in_flight = {}
+                    print(f"⚠️  Worker process died; retrying {len(suspects)} files one at a time", file=sys.stderr)
+                    for path in sorted(suspects):
+                        finish(path, process_file_alone(path, fields))
+                    executor = ProcessPoolExecutor(max_workers=max(1, args.workers))
+                    continue
+
+                for future in finished:
+                    path = in_flight.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        record = {'file': path, 'file_type': os.path.splitext(path)[1].lower(), 'error': str(e)}
+                    finish(path, record)
+        finally:
+            executor.shutdown()
+
+    records = [done[keys[path]] for path in files if keys[path] in done]
+    write_output(records, args.output, output_format, fields)
+    print(f"✅ Wrote {len(records)} rows to {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,156 @@
+"""Single-scan engine for the text field extractors in main.py.
+
+ScannedText indexes a document's text once: it splits it into lines and finds
+the label keywords the extractors anchor on (PAN, IFSC, CIF, CKYC, balances,
+'@' for emails, ...). Each extractor then tries its patterns only at those
+keyword positions instead of running every pattern and fallback over the
+whole text again.
+
+A pattern is anchored when every match has to start at one of its keywords
+(patterns.PATTERN_ANCHORS) or, for emails, right before an '@'
+(patterns.AT_SIGN_ANCHORS). Trying such a pattern at each candidate position
+in order returns exactly the first match / findall result a full scan would,
+so anchored and full-scan extraction give the same values. Patterns without
+anchors are simply run over the whole text.
+"""
+import bisect
+
+import patterns
+
+# Non-ASCII characters that match ASCII letters case-insensitively in re, or
+# change length when lowercased; text containing them is scanned in full
+CASE_FOLD_SPECIALS = frozenset('İıſK')
+
+
+class ScannedText:
+    """Document text with its line index and label keyword positions, built once per text"""
+
+    def __init__(self, text, anchors=True):
+        self.text = text
+        self.anchored = anchors and CASE_FOLD_SPECIALS.isdisjoint(text)
+        self._lines = None
+        self._lowered = None
+        self._keyword_positions = {}
+        self._pattern_positions = {}
+        self._line_starts = None
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            self._lines = self.text.split('\n')
+        return self._lines
+
+    def search(self, pattern):
+        """Same result as pattern.search(text)"""
+        matches = self._matches(pattern)
+        if matches is None:
+            return pattern.search(self.text)
+        return next(matches, None)
+
+    def findall(self, pattern):
+        """Same result as pattern.findall(text)"""
+        matches = self._matches(pattern)
+        if matches is None:
+            return pattern.findall(self.text)
+        if pattern.groups == 0:
+            return [m.group(0) for m in matches]
+        if pattern.groups == 1:
+            return [m.group(1) for m in matches]
+        return [m.groups('') for m in matches]
+
+    def line_indexes(self, pattern):
+        """Indexes of the lines pattern can match in (all lines when it is not anchored)"""
+        positions = self._anchor_positions(pattern)
+        if positions is None:
+            return range(len(self.lines))
+        if self._line_starts is None:
+            self._line_starts = []
+            offset = 0
+            for line in self.lines:
+                self._line_starts.append(offset)
+                offset += len(line) + 1
+        indexes = []
+        for position in positions:
+            index = bisect.bisect_right(self._line_starts, position) - 1
+            if not indexes or indexes[-1] != index:
+                indexes.append(index)
+        return indexes
+
+    def keyword_positions(self, keyword):
+        """Sorted start offsets of a lowercase keyword in the text, case-insensitively"""
+        positions = self._keyword_positions.get(keyword)
+        if positions is None:
+            if self._lowered is None:
+                self._lowered = self.text.lower()
+            positions = []
+            index = self._lowered.find(keyword)
+            while index != -1:
+                positions.append(index)
+                index = self._lowered.find(keyword, index + 1)
+            self._keyword_positions[keyword] = positions
+        return positions
+
+    def _anchor_positions(self, pattern):
+        """Sorted candidate start offsets for a keyword-anchored pattern, or None"""
+        if not self.anchored or pattern not in patterns.PATTERN_ANCHORS:
+            return None
+        positions = self._pattern_positions.get(pattern)
+        if positions is None:
+            positions = sorted({
+                position
+                for keyword in patterns.PATTERN_ANCHORS[pattern]
+                for position in self.keyword_positions(keyword)
+            })
+            self._pattern_positions[pattern] = positions
+        return positions
+
+    def _matches(self, pattern):
+        """Iterator over the non-overlapping matches of an anchored pattern, or None"""
+        if not self.anchored:
+            return None
+        if pattern in patterns.AT_SIGN_ANCHORS:
+            local_char, spaced = patterns.AT_SIGN_ANCHORS[pattern]
+            return self._at_sign_matches(pattern, local_char, spaced)
+        positions = self._anchor_positions(pattern)
+        if positions is None:
+            return None
+        return self._keyword_matches(pattern, positions)
+
+    def _keyword_matches(self, pattern, positions):
+        end = 0
+        for position in positions:
+            if position < end:
+                continue
+            match = pattern.match(self.text, position)
+            if match:
+                yield match
+                end = match.end()
+
+    def _at_sign_matches(self, pattern, local_char, spaced):
+        # A match holds exactly one '@' and starts inside the run of local-part
+        # characters before it (and the whitespace after that run, if allowed)
+        text = self.text
+        end = 0
+        for at in self.keyword_positions('@'):
+            if at < end:
+                continue
+            stop = at
+            if spaced:
+                while stop > end and text[stop - 1].isspace():
+                    stop -= 1
+            start = stop
+            while start > end and local_char.match(text, start - 1):
+                start -= 1
+            for position in range(start, stop):
+                match = pattern.match(text, position)
+                if match:
+                    yield match
+                    end = match.end()
+                    break
+
+
+def scan_text(text):
+    """Index text for the field extractors; an already scanned text is returned as is"""
+    if isinstance(text, ScannedText):
+        return text
+    return ScannedText(text)
@@ -0,0 +1,97 @@
+"""Gunicorn settings for serving the OCR API in production.
+
+    gunicorn --config src/gunicorn.conf.py
+
+This is the container's default command; `python src/main.py` still starts the
+Flask development server for local work. Every setting can be overridden with
+an environment variable:
+
+    WEB_CONCURRENCY            worker processes (default: half the cores, at least 2)
+    GUNICORN_THREADS           request threads per worker (default 4)
+    OCR_WORKERS                tesseract processes per worker (default: cores / workers)
+    GUNICORN_TIMEOUT           seconds before a silent worker is killed (default 300)
+    GUNICORN_GRACEFUL_TIMEOUT  seconds in-flight OCR gets to finish on reload/shutdown (default 300)
+    GUNICORN_MAX_REQUESTS      recycle a worker after this many requests, 0 = never (default 0)
+    METRICS_DIR                where workers share /metrics snapshots (default /tmp/ocr-metrics with 2+ workers)
+
+With OCR_BACKEND=pool each worker starts its own OCR worker processes (OCR_WORKERS
+of them, or OCR_POOL_SIZE) and warms them up before it accepts requests.
+
+Worker processes run text-layer extraction (pure Python, GIL-bound) in
+parallel; inside each worker, page OCR fans out to OCR_WORKERS tesseract
+processes. OCR_WORKERS defaults to cores / workers so the whole server runs
+about one tesseract per core instead of workers x cores.
+"""
+import multiprocessing
+import os
+
+CPU_COUNT = multiprocessing.cpu_count()
+
+# Import main.py from this directory whatever the current working directory is
+chdir = os.path.dirname(os.path.abspath(__file__))
+wsgi_app = 'main:app'
+
+bind = f"{os.getenv('APP_HOST', '0.0.0.0')}:{os.getenv('APP_PORT', '5001')}"
+
+workers = max(1, int(os.getenv('WEB_CONCURRENCY') or max(2, CPU_COUNT // 2)))
+# Threads let one worker keep several uploads going while they wait on OCR
+worker_class = 'gthread'
+threads = max(1, int(os.getenv('GUNICORN_THREADS', '4')))
+
+# Read by main.py at import, so set before the app is preloaded
+os.environ.setdefault('OCR_WORKERS', str(max(1, CPU_COUNT // workers)))
+if workers > 1:
+    # Job status polls can land on any worker; share job state through a directory
+    os.environ.setdefault('JOB_STATE_DIR', '/tmp/ocr-jobs')
+    # Likewise /metrics scrapes: each worker publishes its counters for the others to merge
+    os.environ.setdefault('METRICS_DIR', '/tmp/ocr-metrics')
+
+# Load the app (pandas, pdfplumber, Tesseract lookup) once in the master and fork
+# workers from it, instead of importing everything again in every worker
+preload_app = True
+
+# A large scanned PDF at 800 DPI takes minutes; gthread workers keep heartbeating
+# while requests run, so the timeout only catches workers that are truly stuck
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '300'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '300'))
+keepalive = 5
+
+# Recycling bounds memory growth from rasterization but drops in-memory OCR cache
+# entries, so it is opt-in
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = max_requests // 10
+
+# Heartbeat files on tmpfs; Docker's overlay /tmp can stall workers under load
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'info').lower()
+
+
+def on_starting(server):
+    from metrics import clear_state_dir
+
+    # Counters start from zero with every server start, not from the last run's snapshots
+    clear_state_dir(os.getenv('METRICS_DIR'))
+
+
+def when_ready(server):
+    import main
+
+    server.log.info(
+        f"OCR API ready: {workers} workers x {threads} threads, "
+        f"{main.OCR_WORKERS} OCR processes per worker, timeout {timeout}s"
+    )
+    # Load tesseract and its language data once before workers are forked
+    if not isinstance(main.OCR_ENGINE, main.OcrWorkerPool):
+        main.warm_up_tesseract()
+
+
+def post_worker_init(worker):
+    import main
+
+    # Pool processes are per worker: starting them in the master would share their pipes with every fork
+    if isinstance(main.OCR_ENGINE, main.OcrWorkerPool):
+        main.warm_up_tesseract()
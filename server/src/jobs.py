@@ -0,0 +1,260 @@
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from admission import OcrBusy
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """State of one background extraction job: status, per-page progress and the final result"""
+
+    def __init__(self, manager, job_id, metadata):
+        self._manager = manager
+        self.id = job_id
+        self.metadata = metadata
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.pages = {}
+        self.result = None
+        self.error = None
+
+    def set_pages(self, page_indexes):
+        """Record the pages this job will read, all initially pending"""
+        with self._manager._lock:
+            self.pages = {index: {'page': index + 1, 'status': 'pending'} for index in page_indexes}
+        self._manager._persist(self)
+
+    def add_pages(self, page_indexes):
+        """Record more pages this job will read (pages the PDF page planner schedules on a miss)"""
+        with self._manager._lock:
+            for index in page_indexes:
+                self.pages.setdefault(index, {'page': index + 1, 'status': 'pending'})
+        self._manager._persist(self)
+
+    def page_done(self, index, source, elapsed):
+        """Mark one page as read, with where its text came from and how long it took"""
+        with self._manager._lock:
+            self.pages[index] = {
+                'page': index + 1,
+                'status': 'done',
+                'source': source,
+                'elapsed_ms': round(elapsed * 1000, 1)
+            }
+        self._manager._persist(self)
+
+    def to_dict(self):
+        with self._manager._lock:
+            pages = [self.pages[index] for index in sorted(self.pages)]
+            pages_done = sum(1 for page in pages if page['status'] == 'done')
+            return {
+                'job_id': self.id,
+                'status': self.status,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'expires_at': (self.finished_at + self._manager.ttl) if self.finished_at else None,
+                'progress': {
+                    'pages_total': len(pages),
+                    'pages_done': pages_done,
+                },
+                'pages': pages,
+                'result': self.result,
+                'error': self.error,
+                **self.metadata
+            }
+
+
+class JobManager:
+    """In-process job queue backed by a thread pool, with results kept for `ttl` seconds.
+
+    No external broker is needed. When `state_dir` is set, job snapshots are also
+    written there as JSON so any server process sharing the directory can answer
+    status requests for jobs running in another process.
+
+    At most `max_queue` jobs wait for a worker at once (0 = no limit); past that
+    submit() raises OcrBusy, so the caller answers 429 as for OCR admission.
+    Each process touches the snapshots of its unfinished jobs every
+    `heartbeat_interval` seconds. A queued or running snapshot left untouched
+    for three intervals belongs to a process that died; it is reported, and
+    rewritten, as failed instead of staying 'running' for good.
+    """
+
+    def __init__(self, workers=2, ttl=3600, state_dir=None, max_queue=0, heartbeat_interval=10):
+        self.ttl = ttl
+        self.state_dir = state_dir
+        self.workers = workers
+        self.max_queue = max_queue
+        self.heartbeat_interval = heartbeat_interval
+        self._jobs = {}
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self._heartbeat_pid = None
+        # Moving average of how long a job runs, for Retry-After
+        self._job_seconds = 10.0
+
+        if self.state_dir:
+            try:
+                os.makedirs(self.state_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"⚠️  Job state directory disabled, cannot use {self.state_dir}: {e}")
+                self.state_dir = None
+        self.fail_orphaned()
+
+    def submit(self, fn, *args, metadata=None):
+        """Queue fn(job, *args); its return value becomes the job result. Raises OcrBusy when the queue is full."""
+        self.purge_expired()
+        job = Job(self, uuid.uuid4().hex, metadata or {})
+        with self._lock:
+            statuses = [queued.status for queued in self._jobs.values()]
+            if self.max_queue and statuses.count('queued') >= self.max_queue:
+                # Time for the jobs ahead to drain through the workers
+                backlog = statuses.count('queued') + statuses.count('running')
+                retry_after = max(1, math.ceil(self._job_seconds * backlog / self.workers))
+                raise OcrBusy(f"Job queue is full ({statuses.count('queued')} jobs waiting)", retry_after)
+            self._jobs[job.id] = job
+        self._ensure_heartbeat()
+        self._persist(job)
+        self._executor.submit(self._run, job, fn, args)
+        return job
+
+    def get(self, job_id):
+        """Job status dict, or None if the job is unknown or its result has expired"""
+        self.purge_expired()
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        return self._load(job_id)
+
+    def stats(self):
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {status: statuses.count(status) for status in ('queued', 'running', 'done', 'failed')}
+
+    def purge_expired(self):
+        """Forget finished jobs older than the retention TTL"""
+        now = time.time()
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at and now - job.finished_at > self.ttl
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+        for job_id in expired:
+            self._remove_state(job_id)
+
+    def fail_orphaned(self):
+        """Mark unfinished jobs whose process stopped as failed and drop expired snapshots (called at startup)"""
+        if not self.state_dir:
+            return
+        try:
+            names = os.listdir(self.state_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith('.json'):
+                # Loading settles orphaned and expired snapshots
+                self._load(name[:-len('.json')])
+
+    def _run(self, job, fn, args):
+        with self._lock:
+            job.status = 'running'
+            job.started_at = time.time()
+        self._persist(job)
+        try:
+            result = fn(job, *args)
+            with self._lock:
+                job.result = result
+                job.status = 'done'
+        except Exception as e:
+            logger.exception(f"Job {job.id} failed")
+            with self._lock:
+                job.error = str(e)
+                job.status = 'failed'
+        finally:
+            with self._lock:
+                job.finished_at = time.time()
+                self._job_seconds = 0.8 * self._job_seconds + 0.2 * (job.finished_at - job.started_at)
+            self._persist(job)
+
+    def _ensure_heartbeat(self):
+        # One heartbeat thread per process; started lazily because threads do not survive fork
+        if not self.state_dir or self._heartbeat_pid == os.getpid():
+            return
+        with self._lock:
+            if self._heartbeat_pid == os.getpid():
+                return
+            self._heartbeat_pid = os.getpid()
+        threading.Thread(target=self._heartbeat_loop, name='job-heartbeat', daemon=True).start()
+
+    def _heartbeat_loop(self):
+        while True:
+            time.sleep(self.heartbeat_interval)
+            with self._lock:
+                unfinished = [job.id for job in self._jobs.values() if not job.finished_at]
+            for job_id in unfinished:
+                try:
+                    os.utime(self._state_path(job_id))
+                except OSError:
+                    pass
+
+    def _state_path(self, job_id):
+        return os.path.join(self.state_dir, f"{job_id}.json")
+
+    def _persist(self, job):
+        if not self.state_dir:
+            return
+        self._write_state(job.id, job.to_dict())
+
+    def _write_state(self, job_id, state):
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.state_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self._state_path(job_id))
+        except OSError as e:
+            logger.warning(f"⚠️  Could not persist job {job_id}: {e}")
+
+    def _load(self, job_id):
+        if not self.state_dir or not all(c in '0123456789abcdef' for c in job_id):
+            return None
+        try:
+            with open(self._state_path(job_id), 'r', encoding='utf-8') as f:
+                touched_at = os.fstat(f.fileno()).st_mtime
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        now = time.time()
+        if state.get('finished_at') and now - state['finished_at'] > self.ttl:
+            self._remove_state(job_id)
+            return None
+        if not state.get('finished_at') and now - touched_at > 3 * self.heartbeat_interval:
+            # No heartbeat from the process that owned it: the job will never finish
+            logger.warning(f"⚠️  Job {job_id} was {state.get('status')} in a process that stopped; marking it failed")
+            state.update(
+                status='failed',
+                error='Job was interrupted: the server process running it stopped',
+                finished_at=now,
+                expires_at=now + self.ttl,
+            )
+            self._write_state(job_id, state)
+        return state
+
+    def _remove_state(self, job_id):
+        if not self.state_dir:
+            return
+        try:
+            os.remove(self._state_path(job_id))
+        except OSError:
+            pass
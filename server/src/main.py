@@ -1,21 +1,44 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context, g, has_request_context
 from flask_cors import CORS
 from PIL import Image
 import pdfplumber
+import pypdfium2
 import io
 import os
+import math
+import hashlib
+import json
+import time
 import shutil
 import platform
 import pandas as pd
-import re
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dotenv import load_dotenv
+from ocr_cache import OcrCache
+from jobs import JobManager
+from admission import OcrAdmission, OcrBusy, OcrTimeout
+from metrics import Metrics
+from ocr_backend import PytesseractBackend, TesserocrBackend
+from ocr_pool import OcrWorkerPool
+from preprocess import Preprocessor, parse_steps
+from image_scale import ocr_scale
+from page_plan import PagePlan
+from pdf_pages import LazyPdfPages
+from text_layer import PdfplumberTextLayer, PdfiumTextLayer
+import request_log
+from request_log import log_text_sample
+import patterns
+from field_scan import scan_text
 
 load_dotenv()
 app = Flask(__name__)
 
-logging.basicConfig(format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+# LOG_LEVEL / LOG_FORMAT / LOG_TEXT_SAMPLE_*: see request_log.py
+request_log.configure_logging()
 logger = logging.getLogger(__name__)
 
 # Try to import pytesseract
@@ -68,27 +91,80 @@ def _locate_tesseract():
 # Initialize Tesseract
 TESSERACT_PATH = _locate_tesseract()
 TESSERACT_AVAILABLE = False
-
-if not PYTESSERACT_AVAILABLE:
-    logger.error("❌ pytesseract library not installed!")
-    logger.error("   Run: pip install pytesseract")
-elif TESSERACT_PATH:
+OCR_ENGINE = None
+
+# OCR engine: 'pytesseract' (default) runs the tesseract binary once per page; 'tesserocr'
+# calls libtesseract in-process with the language model kept loaded (tesserocr, see requirements.txt),
+# reading traineddata from TESSDATA_PREFIX or the bundled server/tessdata; 'pool' runs
+# tesserocr in long-lived worker processes that are health-checked and recycled
+OCR_BACKEND = os.getenv('OCR_BACKEND', 'pytesseract').lower()
+TESSDATA_DIR = os.getenv('TESSDATA_PREFIX') or os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tessdata')
+if OCR_BACKEND == 'tesserocr':
     try:
-        pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH
+        OCR_ENGINE = TesserocrBackend(TESSDATA_DIR, lang=os.getenv('OCR_LANG', 'eng'))
         TESSERACT_AVAILABLE = True
-        logger.info(f"✅ Using Tesseract: {TESSERACT_PATH}")
-    except Exception as e:
-        logger.exception("Failed to configure Tesseract")
-else:
-    logger.error("❌ Tesseract OCR not found!")
-    logger.error("")
-    logger.error("🐳 OPTION 1: Use Docker (Recommended)")
-    logger.error("   docker-compose up -d")
-    logger.error("")
-    logger.error("📝 OPTION 2: Set path in .env file")
-    logger.error("   1. Copy .env.example to .env")
-    logger.error("   2. Set: TESSERACT_CMD=C:/path/to/tesseract.exe")
-    logger.error("")
+        logger.info(f"✅ Using in-process Tesseract {OCR_ENGINE.version()} ({OCR_ENGINE.tessdata_path})")
+    except ImportError:
+        logger.warning("⚠️  OCR_BACKEND=tesserocr but tesserocr is not installed; using pytesseract")
+    except RuntimeError as e:
+        logger.warning(f"⚠️  OCR_BACKEND=tesserocr unavailable ({e}); using pytesseract")
+elif OCR_BACKEND == 'pool':
+    # Worker processes start on warm-up (per gunicorn worker, after the fork) or on first use
+    try:
+        OCR_ENGINE = OcrWorkerPool(
+            size=max(1, int(os.getenv('OCR_POOL_SIZE') or os.getenv('OCR_WORKERS') or os.cpu_count() or 1)),
+            tessdata_path=TESSDATA_DIR,
+            lang=os.getenv('OCR_LANG', 'eng'),
+            # Recycle a worker after about this many pages to cap libtesseract memory growth, 0 = never
+            max_pages=int(os.getenv('OCR_POOL_MAX_PAGES', '500')),
+            page_timeout=float(os.getenv('OCR_POOL_PAGE_TIMEOUT', '120')),
+            health_interval=float(os.getenv('OCR_POOL_HEALTH_INTERVAL', '30')),
+        )
+        TESSERACT_AVAILABLE = True
+        logger.info(f"✅ Using a pool of {OCR_ENGINE.size} OCR worker processes")
+    except ImportError:
+        logger.warning("⚠️  OCR_BACKEND=pool but tesserocr is not installed; using pytesseract")
+    except RuntimeError as e:
+        logger.warning(f"⚠️  OCR_BACKEND=pool unavailable ({e}); using pytesseract")
+elif OCR_BACKEND != 'pytesseract':
+    logger.warning(f"⚠️  Unknown OCR_BACKEND '{OCR_BACKEND}'; using pytesseract")
+
+if OCR_ENGINE is None:
+    if not PYTESSERACT_AVAILABLE:
+        logger.error("❌ pytesseract library not installed!")
+        logger.error("   Run: pip install pytesseract")
+    elif TESSERACT_PATH:
+        try:
+            pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH
+            TESSERACT_AVAILABLE = True
+            logger.info(f"✅ Using Tesseract: {TESSERACT_PATH}")
+        except Exception as e:
+            logger.exception("Failed to configure Tesseract")
+    else:
+        logger.error("❌ Tesseract OCR not found!")
+        logger.error("")
+        logger.error("🐳 OPTION 1: Use Docker (Recommended)")
+        logger.error("   docker-compose up -d")
+        logger.error("")
+        logger.error("📝 OPTION 2: Set path in .env file")
+        logger.error("   1. Copy .env.example to .env")
+        logger.error("   2. Set: TESSERACT_CMD=C:/path/to/tesseract.exe")
+        logger.error("")
+    if PYTESSERACT_AVAILABLE:
+        OCR_ENGINE = PytesseractBackend(pytesseract)
+
+def warm_up_tesseract():
+    """Run Tesseract once on a blank image so its binary and language data are loaded before traffic arrives"""
+    if not TESSERACT_AVAILABLE:
+        return False
+    try:
+        version = OCR_ENGINE.version()
+        OCR_ENGINE.image_to_string(Image.new('L', (200, 50), 255), config=r'--oem 3 --psm 6')
+        logger.info(f"✅ Tesseract {version} warmed up ({OCR_ENGINE.name})")
+        return True
+    except Exception:
+        logger.exception("Tesseract warm-up failed")
+        return False
 
 # App runtime config from .env
 APP_HOST = os.getenv('APP_HOST', '127.0.0.1')
@@ -96,6 +172,146 @@ APP_PORT = int(os.getenv('APP_PORT', '5001'))
 DEBUG = os.getenv('DEBUG', 'true').lower() in ('1', 'true', 'yes')
 app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 20 * 1024 * 1024))
 
+# OCR result cache: in-memory LRU, plus an on-disk tier when OCR_CACHE_DIR is set
+OCR_CACHE = OcrCache(
+    max_entries=int(os.getenv('OCR_CACHE_SIZE', '256')),
+    disk_dir=os.getenv('OCR_CACHE_DIR') or None,
+    disk_max_bytes=int(os.getenv('OCR_CACHE_DISK_MAX_BYTES', 512 * 1024 * 1024)),
+)
+
+# Page OCR scheduling. pytesseract runs every page in its own tesseract process, so a
+# shared thread pool gives real multi-core OCR while page order is kept by executor.map.
+OCR_WORKERS = max(1, int(os.getenv('OCR_WORKERS', os.cpu_count() or 1)))
+# Upper bound on rendered page images held in memory at once (across all requests)
+OCR_MAX_INFLIGHT_PAGES = max(1, int(os.getenv('OCR_MAX_INFLIGHT_PAGES', OCR_WORKERS)))
+# Longest a request waits for one page's OCR, counted from when the page was queued; a page
+# still not done fails the request with 503 and Retry-After while its OCR finishes in the
+# background, filling the cache for the retry. 0 waits forever. Jobs and batch runs always wait.
+OCR_PAGE_TIMEOUT = float(os.getenv('OCR_PAGE_TIMEOUT', '300'))
+if OCR_WORKERS > 1:
+    # Stop each tesseract process from also spawning one OpenMP thread per core
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+_page_ocr_executor = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix='page-ocr')
+# Guards every pypdfium2 call (loading, rendering, pdfium text): pdfium keeps global state
+# and is not thread-safe even across documents. pdfminer parsing only shares state within
+# one document, so PdfPageSource serializes that per document instead.
+_pdfium_lock = threading.Lock()
+# pypdfium2 document per open pdfplumber PDF, so pages are rendered without re-loading the
+# whole file into pdfium for every page; dropped with the PDF
+_pdfium_documents = weakref.WeakKeyDictionary()
+
+# OCR admission control across all requests: pages rendered/OCR'd at once, their decoded
+# raster memory and how many pages may wait for a slot. Past that, requests get 429 with
+# Retry-After instead of spawning more tesseract processes.
+OCR_ADMISSION = OcrAdmission(
+    max_pages=OCR_MAX_INFLIGHT_PAGES,
+    max_raster_bytes=int(os.getenv('OCR_MAX_RASTER_MB', '1024')) * 1024 * 1024,
+    # Never below one document's read-ahead window, so a lone request is not turned away
+    max_queue=max(2 * OCR_WORKERS, int(os.getenv('OCR_MAX_QUEUE', 4 * OCR_MAX_INFLIGHT_PAGES))),
+    max_wait=float(os.getenv('OCR_MAX_QUEUE_WAIT', '120')),
+)
+# Per-thread OCR admission state: the queue ticket of the page a pool thread is working on,
+# and whether this thread's OCR may wait indefinitely (background jobs) instead of failing fast
+_ocr_context = threading.local()
+
+# Background extraction jobs (/jobs): worker threads, result retention and optional
+# shared state directory so every server process can answer status polls. Jobs waiting
+# for a worker are capped per process (429 past that, 0 = no limit); each process
+# heartbeats its jobs' state files so jobs of a process that died are reported as failed.
+JOB_MANAGER = JobManager(
+    workers=max(1, int(os.getenv('JOB_WORKERS', '2'))),
+    ttl=int(os.getenv('JOB_RESULT_TTL', '3600')),
+    state_dir=os.getenv('JOB_STATE_DIR') or None,
+    max_queue=max(0, int(os.getenv('JOB_MAX_QUEUE', '20'))),
+    heartbeat_interval=float(os.getenv('JOB_HEARTBEAT_SECONDS', '10')),
+)
+
+# Prometheus metrics served on /metrics. Under gunicorn, METRICS_DIR holds each worker's
+# snapshot so a scrape reports all workers, not just the one that answered it.
+METRICS = Metrics(
+    state_dir=os.getenv('METRICS_DIR') or None,
+    flush_interval=float(os.getenv('METRICS_FLUSH_SECONDS', '5')),
+)
+# Stage durations also go into each request's summary log line
+METRICS.add_stage_listener(request_log.record_stage)
+METRICS.describe('ocr_http_request_duration_seconds', 'histogram', 'Request duration by endpoint, method and status')
+METRICS.describe(
+    'ocr_stage_duration_seconds', 'histogram',
+    'Time spent per pipeline stage: upload_read, pdf_open, text_layer, rasterize, resize, preprocess, '
+    'tesseract, table_extraction, regex_extraction'
+)
+METRICS.describe('ocr_pdf_pages_total', 'counter', 'PDF pages served, by source (text-layer or ocr fallback)')
+METRICS.describe('ocr_page_timeouts_total', 'counter', 'PDF pages whose OCR was not done within OCR_PAGE_TIMEOUT')
+METRICS.describe('ocr_pages_in_flight', 'gauge', 'Pages currently holding an OCR admission slot')
+METRICS.describe('ocr_raster_bytes_in_flight', 'gauge', 'Decoded raster bytes of the pages being OCR\'d')
+METRICS.describe('ocr_queue_depth', 'gauge', 'Pages waiting for an OCR admission slot')
+METRICS.describe('ocr_admission_total', 'counter', 'OCR admission decisions, by result (admitted, rejected, timed_out)')
+METRICS.describe('ocr_admission_wait_seconds_total', 'counter', 'Total time admitted pages waited for an OCR slot')
+METRICS.describe('ocr_jobs', 'gauge', 'Background extraction jobs held by this server, by status')
+METRICS.describe('ocr_cache_lookups_total', 'counter', 'OCR cache lookups, by result (memory_hit, disk_hit, miss)')
+METRICS.describe('ocr_cache_entries', 'gauge', 'OCR results held in the in-memory cache')
+# Every worker sees the same cache directory, so its size is not summed across workers
+METRICS.describe('ocr_cache_disk_bytes', 'gauge', 'Size of the on-disk OCR cache tier', merge='max')
+METRICS.describe('ocr_image_scaling_total', 'counter', 'Aadhaar/PAN images OCR\'d, by what set their upscale (text_height, dpi, pixel_budget)')
+METRICS.describe('ocr_plan_pages_total', 'counter', 'PDF pages of field extraction requests, by result (read, skipped by the page planner)')
+METRICS.describe('ocr_header_region_total', 'counter', 'Header-region first page OCR, by result (hit, fallback to full page)')
+METRICS.describe('ocr_pool_workers', 'gauge', 'OCR worker processes (OCR_BACKEND=pool) by state')
+METRICS.describe('ocr_pool_restarts_total', 'counter', 'OCR worker process restarts after a failure or the page limit')
+METRICS.describe('ocr_pool_failed_health_checks_total', 'counter', 'OCR worker processes that failed a health-check ping')
+
+# Pages whose text layer has fewer non-blank characters than this are OCR'd instead
+MIN_TEXT_LAYER_CHARS = int(os.getenv('MIN_TEXT_LAYER_CHARS', '10'))
+
+# PDF text-layer extraction: 'pdfplumber' (pdfminer layout analysis in pure Python) or 'pdfium'
+# (pypdfium2, in C and several times faster; see text_layer.py). PDF_TEXT_BACKEND_ENDPOINTS
+# picks it per endpoint by Flask endpoint name, e.g. 'extract_all=pdfium,create_job=pdfium'
+# (create_job: background jobs). Formatted text and tables always use pdfplumber.
+PDF_TEXT_BACKEND = os.getenv('PDF_TEXT_BACKEND', 'pdfplumber').lower()
+PDF_TEXT_BACKEND_ENDPOINTS = dict(
+    (part.split('=', 1)[0].strip(), part.split('=', 1)[1].strip().lower())
+    for part in os.getenv('PDF_TEXT_BACKEND_ENDPOINTS', '').split(',') if '=' in part
+)
+
+# Render DPI mode: 'fixed' renders every page at the caller's resolution (500/800 DPI);
+# 'adaptive' starts at the lowest OCR_ADAPTIVE_DPI_TIERS tier and only re-renders at the
+# next tier when Tesseract's mean word confidence or median text height is too low
+OCR_DPI_MODE = os.getenv('OCR_DPI_MODE', 'fixed').lower()
+OCR_ADAPTIVE_DPI_TIERS = sorted(
+    int(dpi) for dpi in os.getenv('OCR_ADAPTIVE_DPI_TIERS', '300,400').split(',') if dpi.strip()
+)
+OCR_ADAPTIVE_MIN_CONFIDENCE = float(os.getenv('OCR_ADAPTIVE_MIN_CONFIDENCE', '80'))
+OCR_ADAPTIVE_MIN_TEXT_HEIGHT = int(os.getenv('OCR_ADAPTIVE_MIN_TEXT_HEIGHT', '20'))
+
+# First-page region for the header field endpoints: 'full' OCRs the whole scanned first page;
+# 'header' OCRs only its top OCR_HEADER_FRACTION (where PAN, IFSC, customer ID, ... sit, above
+# the transaction table) and falls back to the full page when a requested field is not there
+OCR_FIRST_PAGE_REGION = os.getenv('OCR_FIRST_PAGE_REGION', 'full').lower()
+OCR_HEADER_FRACTION = min(1.0, max(0.05, float(os.getenv('OCR_HEADER_FRACTION', '0.35'))))
+
+# Optional OpenCV preprocessing of every image before OCR, e.g. 'denoise,deskew,threshold'
+# (see preprocess.py); off by default
+try:
+    OCR_PREPROCESS = Preprocessor(parse_steps(os.getenv('OCR_PREPROCESS', 'off')))
+except (ValueError, RuntimeError) as e:
+    logger.warning(f"⚠️  OCR preprocessing disabled: {e}")
+    OCR_PREPROCESS = Preprocessor()
+
+# PDF DOB / Aadhaar extraction reads pages in order and stops at the first confident match,
+# OCR'ing OCR_INCREMENTAL_WAVE pages at a time; 'false' OCRs the whole document first
+OCR_INCREMENTAL_SCAN = os.getenv('OCR_INCREMENTAL_SCAN', 'true').lower() in ('1', 'true', 'yes')
+OCR_INCREMENTAL_WAVE = max(1, int(os.getenv('OCR_INCREMENTAL_WAVE', '1')))
+# Pages the PDF page planner searches for a first/last-page field after its usual pages miss
+# (nearest pages first); 0 keeps every field to the pages its dedicated endpoint always read
+OCR_PLAN_EXTRA_PAGES = max(0, int(os.getenv('OCR_PLAN_EXTRA_PAGES', '0')))
+
+# Upscaling of Aadhaar/PAN photos before OCR: 'text' measures the text line height and scales it
+# to OCR_IMAGE_TEXT_HEIGHT px (falling back to the DPI tag when no lines are found); 'dpi' scales
+# the DPI tag (72 when missing) to 450. Either way the result stays within OCR_IMAGE_MAX_PIXELS
+OCR_IMAGE_SCALING = os.getenv('OCR_IMAGE_SCALING', 'text').lower()
+OCR_IMAGE_TEXT_HEIGHT = int(os.getenv('OCR_IMAGE_TEXT_HEIGHT', '32'))
+OCR_IMAGE_MAX_PIXELS = int(float(os.getenv('OCR_IMAGE_MAX_PIXELS', '12e6')))
+
 # CORS configuration
 cors_origins = os.getenv('CORS_ORIGINS')
 if cors_origins and cors_origins != '*':
@@ -104,16 +320,265 @@ if cors_origins and cors_origins != '*':
 else:
     CORS(app)
 
+@METRICS.timed_stage('upload_read')
+def read_upload(file_input):
+    """Read an uploaded file (file-like object or path) into bytes"""
+    if isinstance(file_input, (str, os.PathLike)):
+        with open(file_input, 'rb') as f:
+            return f.read()
+    if hasattr(file_input, 'seek'):
+        file_input.seek(0)
+    return file_input.read()
+
+def hash_upload(data):
+    """SHA-256 of the uploaded bytes, used as the document part of OCR cache keys"""
+    return hashlib.sha256(data).hexdigest()
+
+def has_usable_text_layer(text):
+    """Whether a page's text layer has at least MIN_TEXT_LAYER_CHARS non-blank characters"""
+    return sum(not c.isspace() for c in text) >= MIN_TEXT_LAYER_CHARS
+
+def cached_ocr(doc_hash, page_number, resolution, config, uppercase, run_ocr):
+    """Return cached OCR text for this document/page/settings, or call run_ocr() and cache its result"""
+    if doc_hash is None:
+        return run_ocr()
+
+    # Engines differ slightly in output; pytesseract keeps its original keys
+    if OCR_ENGINE is not None and OCR_ENGINE.name != 'pytesseract':
+        config = f"{OCR_ENGINE.name}:{config}"
+    if OCR_PREPROCESS:
+        config = f"{config}|{OCR_PREPROCESS.signature}"
+    key = OCR_CACHE.make_key(doc_hash, page_number, resolution, config, uppercase)
+    text = OCR_CACHE.get(key)
+    if text is None:
+        text = run_ocr()
+        OCR_CACHE.put(key, text)
+    return text
+
+def page_raster_bytes(page, resolution, header_only=False):
+    """Decoded size of a PDF page (or its header band) rendered to 8-bit grayscale at resolution"""
+    scale = resolution / 72
+    height = page.height * OCR_HEADER_FRACTION if header_only else page.height
+    return math.ceil(page.width * scale) * math.ceil(height * scale)
+
+def image_raster_bytes(width, height, image):
+    """Decoded size of an image of this mode at width x height"""
+    return width * height * len(image.getbands())
+
+def ocr_slot(raster_bytes):
+    """OCR admission slot for one raster, using the queue place of the page this thread is working on"""
+    ticket = getattr(_ocr_context, 'ticket', None)
+    if ticket is None:
+        ticket = OCR_ADMISSION.enqueue(blocking=getattr(_ocr_context, 'blocking', False))
+    return OCR_ADMISSION.slot(raster_bytes, ticket)
+
+def pdfium_document(pdf):
+    """pypdfium2 document of an open pdfplumber PDF, loaded on first use (call with _pdfium_lock held)"""
+    document = _pdfium_documents.get(pdf)
+    if document is None:
+        if pdf.path:
+            source = str(pdf.path)
+        elif hasattr(pdf.stream, 'getvalue'):
+            # Without seeking: another thread may be parsing this stream under the document's lock
+            source = pdf.stream.getvalue()
+        else:
+            pdf.stream.seek(0)
+            source = pdf.stream.read()
+        document = pypdfium2.PdfDocument(source, password=pdf.password)
+        _pdfium_documents[pdf] = document
+    return document
+
+TEXT_LAYERS = {layer.name: layer for layer in (PdfplumberTextLayer(), PdfiumTextLayer(pdfium_document, _pdfium_lock))}
+for _name in {PDF_TEXT_BACKEND, *PDF_TEXT_BACKEND_ENDPOINTS.values()} - set(TEXT_LAYERS):
+    logger.warning(f"⚠️  Unknown PDF text backend '{_name}'; using pdfplumber")
+
+def text_layer_for(endpoint=None):
+    """Text-layer extractor for an endpoint (default: the current request's), see PDF_TEXT_BACKEND_ENDPOINTS"""
+    if endpoint is None and has_request_context():
+        endpoint = request.endpoint
+    name = PDF_TEXT_BACKEND_ENDPOINTS.get(endpoint, PDF_TEXT_BACKEND)
+    return TEXT_LAYERS.get(name, TEXT_LAYERS['pdfplumber'])
+
+def render_pdf_page(page, resolution, header_only=False):
+    """Render a pdfplumber page (or only its top OCR_HEADER_FRACTION) to an 8-bit grayscale PIL image.
+
+    pdfium draws straight into a grayscale bitmap that the PIL image shares,
+    instead of pdfplumber's BGRx render plus RGB copy, so Tesseract gets
+    1 byte per pixel with no conversion. Renders of all documents are
+    serialized because pdfium is not thread-safe; pdfminer parsing of other
+    documents goes on meanwhile.
+    """
+    with _pdfium_lock, METRICS.stage('rasterize'):
+        pdfium_page = pdfium_document(page.pdf)[page.page_number - 1]
+        try:
+            # (left, bottom, right, top) in PDF units cut off the rendered page
+            crop = (0, pdfium_page.get_height() * (1 - OCR_HEADER_FRACTION), 0, 0) if header_only else (0, 0, 0, 0)
+            # Same rendering as pdfplumber's to_image(): no anti-aliasing
+            bitmap = pdfium_page.render(
+                scale=resolution / 72, crop=crop, grayscale=True,
+                no_smoothtext=True, no_smoothpath=True, no_smoothimage=True,
+            )
+            return bitmap.to_pil()
+        finally:
+            pdfium_page.close()
+
+def preprocess_for_ocr(image, cleaned=False):
+    """Apply OCR_PREPROCESS to an image about to be OCR'd (returned as is when preprocessing is off)"""
+    if not OCR_PREPROCESS:
+        return image
+    with METRICS.stage('preprocess'):
+        return OCR_PREPROCESS(image, cleaned=cleaned)
+
+def ocr_image_with_stats(image, config):
+    """OCR an image in a single tesseract run, returning (text, mean word confidence, median word height in px)"""
+    with METRICS.stage('tesseract'):
+        data = OCR_ENGINE.image_to_data(image, config=config)
+
+    lines = []
+    words = []
+    confidences = []
+    heights = []
+    current_line = None
+    for i, word in enumerate(data['text']):
+        # Level 5 rows are words; rebuild the text layout from their block/paragraph/line numbers
+        if data['level'][i] != 5:
+            continue
+        line_key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        if line_key != current_line:
+            if words:
+                lines.append(' '.join(words))
+                words = []
+            if current_line is not None and line_key[:2] != current_line[:2]:
+                lines.append('')
+            current_line = line_key
+        if word.strip():
+            words.append(word)
+        confidence = float(data['conf'][i])
+        if confidence >= 0 and word.strip():
+            confidences.append(confidence)
+            heights.append(data['height'][i])
+    if words:
+        lines.append(' '.join(words))
+
+    text = '\n'.join(lines) + '\n' if lines else ''
+    mean_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    median_height = sorted(heights)[len(heights) // 2] if heights else 0
+    return text, mean_confidence, median_height
+
+def adaptive_dpi_tiers(max_resolution):
+    """Render tiers for adaptive mode: configured tiers below the caller's resolution, then the resolution itself"""
+    return [dpi for dpi in OCR_ADAPTIVE_DPI_TIERS if dpi < max_resolution] + [max_resolution]
+
+def adaptive_cache_resolution(max_resolution):
+    """Resolution part of the OCR cache key in adaptive mode.
+
+    The DPI a page ends up at depends on the tiers and on the thresholds that
+    decide whether to go on to the next one, so all of them are in the key;
+    changing any of them must not keep serving text OCR'd under the old ones.
+    """
+    tiers = ','.join(map(str, adaptive_dpi_tiers(max_resolution)))
+    return f"adaptive:{tiers}:conf{OCR_ADAPTIVE_MIN_CONFIDENCE:g}:height{OCR_ADAPTIVE_MIN_TEXT_HEIGHT}"
+
+def ocr_pdf_page_adaptive(page, max_resolution, config, header_only=False):
+    """OCR a page starting at a moderate DPI, re-rendering higher only while the result looks unreliable.
+
+    Returns (text, resolution used, mean word confidence). The highest-confidence
+    attempt wins if no tier meets the thresholds.
+    """
+    best = None
+    for resolution in adaptive_dpi_tiers(max_resolution):
+        with ocr_slot(page_raster_bytes(page, resolution, header_only)):
+            page_image = preprocess_for_ocr(render_pdf_page(page, resolution, header_only))
+            text, confidence, text_height = ocr_image_with_stats(page_image, config)
+            del page_image
+
+        if best is None or confidence > best[2]:
+            best = (text, resolution, confidence)
+
+        if confidence >= OCR_ADAPTIVE_MIN_CONFIDENCE and text_height >= OCR_ADAPTIVE_MIN_TEXT_HEIGHT:
+            break
+        logger.info(
+            f"Page {page.page_number}: confidence {confidence:.1f}, text height {text_height}px "
+            f"at {resolution} DPI, trying higher resolution"
+        )
+
+    return best
+
+def ocr_pdf_page(page, resolution, config, doc_hash=None, uppercase=True, header_only=False):
+    """Rasterize a pdfplumber page and OCR it (or only its header band) through the OCR result cache"""
+    adaptive = OCR_DPI_MODE == 'adaptive'
+
+    def run_ocr():
+        if adaptive:
+            page_text = ocr_pdf_page_adaptive(page, resolution, config, header_only)[0]
+        else:
+            # Hold an OCR slot from render until OCR is done to bound peak memory
+            with ocr_slot(page_raster_bytes(page, resolution, header_only)):
+                page_image = preprocess_for_ocr(render_pdf_page(page, resolution, header_only))
+                with METRICS.stage('tesseract'):
+                    page_text = OCR_ENGINE.image_to_string(page_image, config=config)
+        return page_text.upper() if uppercase else page_text
+
+    cache_resolution = adaptive_cache_resolution(resolution) if adaptive else resolution
+    cache_page = f"{page.page_number}:header:{OCR_HEADER_FRACTION}" if header_only else page.page_number
+    return cached_ocr(doc_hash, cache_page, cache_resolution, config, uppercase, run_ocr)
+
+def wait_for_ocr_capacity():
+    """Make OCR started from this thread wait for admission instead of raising OcrBusy (jobs, batch runs)"""
+    _ocr_context.blocking = True
+
+def submit_page_ocr(page_ocr_fn, *args):
+    """Queue a page OCR call on the shared page OCR pool, returning its future.
+
+    The page joins the OCR admission queue here, so a full queue raises OcrBusy
+    in the request thread before any work is queued.
+    """
+    ticket = OCR_ADMISSION.enqueue(blocking=getattr(_ocr_context, 'blocking', False))
+
+    def run():
+        _ocr_context.ticket = ticket
+        try:
+            return page_ocr_fn(*args)
+        finally:
+            _ocr_context.ticket = None
+
+    # Run in the request's context so page logs and stage timings belong to it
+    future = _page_ocr_executor.submit(request_log.in_request_context(run))
+    # Cache hits and cancelled pages never take a slot; give their queue place back
+    future.add_done_callback(lambda _: OCR_ADMISSION.dequeue(ticket))
+    return future
+
+def page_ocr_result(future, queued):
+    """Result of a submit_page_ocr future, raising OcrTimeout if it is not done OCR_PAGE_TIMEOUT seconds after `queued`"""
+    if not OCR_PAGE_TIMEOUT or getattr(_ocr_context, 'blocking', False):
+        return future.result()
+    try:
+        return future.result(timeout=max(0, queued + OCR_PAGE_TIMEOUT - time.perf_counter()))
+    except FutureTimeoutError:
+        # Still queued: drop it. Already running: it finishes in the background and fills the cache.
+        future.cancel()
+        METRICS.inc('ocr_page_timeouts_total')
+        raise OcrTimeout(f"OCR not done after {OCR_PAGE_TIMEOUT:g}s", OCR_ADMISSION.retry_after())
+
 def extract_text_from_image(image_file):
     """Extract text from image file using Tesseract OCR"""
     try:
-        image = Image.open(image_file)
+        data = read_upload(image_file)
         # Custom config for better OCR accuracy: OEM 3 (default engine + neural nets), PSM 6 (uniform block of text)
         custom_config = r'--oem 3 --psm 6'
-        text = pytesseract.image_to_string(image, config=custom_config)
-        # Normalize to uppercase to reduce case-related OCR errors
-        text = text.upper()
+
+        def run_ocr():
+            image = Image.open(io.BytesIO(data))
+            with ocr_slot(image_raster_bytes(image.width, image.height, image)):
+                image = preprocess_for_ocr(image)
+                with METRICS.stage('tesseract'):
+                    # Normalize to uppercase to reduce case-related OCR errors
+                    return OCR_ENGINE.image_to_string(image, config=custom_config).upper()
+
+        text = cached_ocr(hash_upload(data), 1, 'native', custom_config, True, run_ocr)
         return text
+    except OcrBusy:
+        raise
     except Exception as e:
         raise Exception(f"Error processing image: {str(e)}")
 
@@ -121,27 +586,56 @@ def extract_text_from_image(image_file):
 def extract_text_from_image_aadhar_pan(image_file):
     """Extract text from image file using Tesseract OCR with resolution enhancement"""
     try:
-        image = Image.open(image_file)
-        
-        # Get current DPI (default to 72 if not set)
-        current_dpi = image.info.get('dpi', (72, 72))[0]
-        
+        data = read_upload(image_file)
+
         # Target DPI
         target_dpi = 450
-        
-        # If current DPI is less than target, upscale the image
-        if current_dpi < target_dpi:
-            scale_factor = target_dpi / current_dpi
-            new_width = int(image.width * scale_factor)
-            new_height = int(image.height * scale_factor)
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            print(f"DEBUG: Upscaled image from {current_dpi} DPI to {target_dpi} DPI")
-        
+
         # Custom config for better OCR accuracy
         custom_config = r'--oem 3 --psm 6'
-        text = pytesseract.image_to_string(image, config=custom_config)
-        text = text.upper()
+
+        def run_ocr():
+            image = Image.open(io.BytesIO(data))
+
+            # Get current DPI (default to 72 if not set)
+            current_dpi = image.info.get('dpi', (72, 72))[0]
+            # With preprocessing on, upscale a third of the data, with the speckle already filtered out
+            # at scan resolution (after a 3x upscale it is too coarse for the denoise filter)
+            if OCR_PREPROCESS:
+                with METRICS.stage('preprocess'):
+                    image = OCR_PREPROCESS.clean(image)
+
+            with METRICS.stage('resize'):
+                scale_factor, basis = ocr_scale(
+                    image, OCR_IMAGE_TEXT_HEIGHT if OCR_IMAGE_SCALING == 'text' else None,
+                    OCR_IMAGE_MAX_PIXELS, current_dpi, target_dpi,
+                )
+            new_width = int(image.width * scale_factor)
+            new_height = int(image.height * scale_factor)
+            raster_bytes = image_raster_bytes(new_width, new_height, image)
+            METRICS.inc('ocr_image_scaling_total', basis=basis)
+            logger.info(
+                f"Image {image.width}x{image.height} -> {new_width}x{new_height} "
+                f"(x{scale_factor:.2f} by {basis}, {raster_bytes / 1e6:.1f} MB raster)"
+            )
+
+            with ocr_slot(raster_bytes):
+                if scale_factor > 1:
+                    with METRICS.stage('resize'):
+                        image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+                image = preprocess_for_ocr(image, cleaned=True)
+                with METRICS.stage('tesseract'):
+                    return OCR_ENGINE.image_to_string(image, config=custom_config).upper()
+
+        if OCR_IMAGE_SCALING == 'text':
+            cache_resolution = f"text:{OCR_IMAGE_TEXT_HEIGHT}:{OCR_IMAGE_MAX_PIXELS}"
+        else:
+            cache_resolution = f"{target_dpi}:{OCR_IMAGE_MAX_PIXELS}"
+        text = cached_ocr(hash_upload(data), 1, cache_resolution, custom_config, True, run_ocr)
         return text
+    except OcrBusy:
+        raise
     except Exception as e:
         raise Exception(f"Error processing image: {str(e)}")
 
@@ -150,224 +644,476 @@ def extract_text_from_image_aadhar_pan(image_file):
 def extract_formatted_text_from_image(image_file):
     """Extract formatted text from image file using Tesseract OCR with PSM 3 for line-based output"""
     try:
-        image = Image.open(image_file)
+        data = read_upload(image_file)
         # Use PSM 3 for raw line recognition to preserve line breaks
         custom_config = r'--oem 3 --psm 3'
-        text = pytesseract.image_to_string(image, config=custom_config)
-        # Normalize to uppercase to reduce case-related OCR errors
-        text = text.upper()
+
+        def run_ocr():
+            image = Image.open(io.BytesIO(data))
+            with ocr_slot(image_raster_bytes(image.width, image.height, image)):
+                image = preprocess_for_ocr(image)
+                with METRICS.stage('tesseract'):
+                    # Normalize to uppercase to reduce case-related OCR errors
+                    return OCR_ENGINE.image_to_string(image, config=custom_config).upper()
+
+        text = cached_ocr(hash_upload(data), 1, 'native', custom_config, True, run_ocr)
         return text
+    except OcrBusy:
+        raise
     except Exception as e:
         raise Exception(f"Error processing image for formatted text: {str(e)}")
 
-def process_pdf_page_ocr(page):
+def process_pdf_page_ocr(page, doc_hash=None):
     """Helper function to process a single PDF page for OCR"""
     try:
-        # Increased resolution to 450 for better accuracy
-        page_image = page.to_image(resolution=500).original
         # Custom config for better OCR accuracy: OEM 3 (default engine + neural nets), PSM 6 (uniform block of text)
         custom_config = r'--oem 3 --psm 6'
-        page_text = pytesseract.image_to_string(page_image, config=custom_config)
-        # Normalize to uppercase to reduce case-related OCR errors
-        page_text = page_text.upper()
+        # Increased resolution to 500 for better accuracy; text is normalized to uppercase
+        page_text = ocr_pdf_page(page, 500, custom_config, doc_hash)
         return page_text if page_text else ""
+    except OcrBusy:
+        raise
     except Exception as e:
-        print(f"Warning: Skipping page due to error - {str(e)}")
+        logger.warning("⚠️  Skipping page due to error - %s", e)
         return ""
 
+def process_first_last_page_ocr(page, doc_hash=None):
+    """Helper function to OCR a first/last PDF page at high resolution for field extraction"""
+    try:
+        # Custom config for better OCR accuracy: OEM 3 (default engine + neural nets), PSM 6 (uniform block of text)
+        custom_config = r'--oem 3 --psm 6'
+        page_text = ocr_pdf_page(page, 800, custom_config, doc_hash)
+        return page_text if page_text else ""
+    except OcrBusy:
+        raise
+    except Exception as e:
+        logger.warning("⚠️  Skipping page due to error - %s", e)
+        return ""
+
+def process_header_region_ocr(page, doc_hash=None):
+    """Helper function to OCR only the header band of a first PDF page, at the first/last page resolution"""
+    try:
+        custom_config = r'--oem 3 --psm 6'
+        page_text = ocr_pdf_page(page, 800, custom_config, doc_hash, header_only=True)
+        return page_text if page_text else ""
+    except OcrBusy:
+        raise
+    except Exception as e:
+        logger.warning("⚠️  Skipping header region due to error - %s", e)
+        return ""
+
+def first_page_ocr(required=None):
+    """OCR helper for a scanned first page whose text is searched by the `required` extractors.
+
+    In OCR_FIRST_PAGE_REGION=header mode the header band is OCR'd first and
+    the full page only when one of the extractors finds nothing there.
+    Without extractors (callers that want the whole page text) the full page
+    is always OCR'd.
+    """
+    if OCR_FIRST_PAGE_REGION != 'header' or not required:
+        return process_first_last_page_ocr
+
+    def process_header_then_page_ocr(page, doc_hash=None):
+        header_text = process_header_region_ocr(page, doc_hash)
+        scanned = scan_text(header_text)
+        missing = [extractor.__name__ for extractor in required if not extractor(scanned)]
+        if not missing:
+            METRICS.inc('ocr_header_region_total', result='hit')
+            return header_text
+        METRICS.inc('ocr_header_region_total', result='fallback')
+        logger.debug("Header region missed %s; OCR'ing the full first page", ', '.join(missing))
+        return process_first_last_page_ocr(page, doc_hash)
+
+    return process_header_then_page_ocr
+
+
+class PdfPageSource:
+    """A PDF parsed once, serving each page from its text layer or, when that is unusable, from OCR.
+
+    The fallback is decided per page, so mixed digital/scanned documents only
+    OCR the scanned pages. Pages are only parsed when first served (see
+    pdf_pages.py), so a first/last page request costs the same on 3 pages or 300.
+    Text layers come from `text_layer` (default: text_layer_for() the current endpoint).
+    """
+
+    def __init__(self, pdf_file, text_layer=None):
+        self.data = read_upload(pdf_file)
+        self.doc_hash = hash_upload(self.data)
+        with METRICS.stage('pdf_open'):
+            self._pdf = pdfplumber.open(io.BytesIO(self.data))
+        self._pages = LazyPdfPages(self._pdf)
+        # Guards pdfminer parsing of this document (page building, pdfplumber text layer);
+        # requests for other documents parse in parallel
+        self._lock = threading.Lock()
+        self.text_layer = text_layer or text_layer_for()
+        self._layer_texts = {}
+        # Page index -> 'text-layer' or 'ocr' for every page served so far
+        self.page_sources = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        with _pdfium_lock:
+            document = _pdfium_documents.pop(self._pdf, None)
+            if document is not None:
+                document.close()
+        with self._lock:
+            self._pages.close()
+
+    @property
+    def page_count(self):
+        with self._lock:
+            return len(self._pages)
+
+    def page(self, index):
+        """pdfplumber page at index, parsed on first use"""
+        with self._lock:
+            return self._pages[index]
+
+    def layer_text(self, index):
+        """Text layer of one page (empty string for image-only pages)"""
+        if index not in self._layer_texts:
+            page = self.page(index)
+            # The pdfium text layer also takes _pdfium_lock, always after this one
+            with self._lock, METRICS.stage('text_layer'):
+                self._layer_texts[index] = self.text_layer.page_text(page)
+        return self._layer_texts[index]
+
+    def iter_page_texts(self, indexes, ocr_page=process_pdf_page_ocr, window=None):
+        """Yield (index, source, uppercased text, seconds) for each page index, in order, as soon as it is ready.
+
+        Pages without a usable text layer are OCR'd with ocr_page(page, doc_hash),
+        one of the process_*_page_ocr helpers. They run concurrently on the shared
+        page OCR pool, with at most `window` (default 2 * OCR_WORKERS) pages of
+        this document queued at a time so one large upload cannot monopolize the
+        pool. Closing the generator early cancels the queued pages.
+        """
+        return self.iter_pages(((index, ocr_page) for index in indexes), window)
+
+    def iter_pages(self, requests, window=None):
+        """iter_page_texts for (index, ocr_page) requests, so pages OCR'd differently share one window.
+
+        Raises OcrTimeout for a page whose OCR is not done within OCR_PAGE_TIMEOUT
+        rather than yielding it without its text.
+        """
+        def timed_ocr(page, ocr_page, started):
+            text = ocr_page(page, self.doc_hash)
+            return text, time.perf_counter() - started
+
+        pending = deque()
+        remaining = iter(requests)
+        window = window or 2 * OCR_WORKERS
+
+        try:
+            while True:
+                while len(pending) < window:
+                    request = next(remaining, None)
+                    if request is None:
+                        break
+                    index, ocr_page = request
+                    started = time.perf_counter()
+                    layer_text = self.layer_text(index)
+                    if has_usable_text_layer(layer_text):
+                        pending.append((index, layer_text, None, time.perf_counter() - started))
+                    else:
+                        pending.append((index, layer_text, submit_page_ocr(timed_ocr, self.page(index), ocr_page, started), started))
+
+                if not pending:
+                    return
+
+                # OCR'd pages carry the time they were queued instead of their elapsed seconds
+                index, text, future, elapsed = pending.popleft()
+                source = 'text-layer'
+                if future is not None:
+                    try:
+                        ocr_text, elapsed = page_ocr_result(future, elapsed)
+                    except OcrTimeout as e:
+                        logger.warning(f"⚠️  Page {index + 1}: {e}, failing the request")
+                        raise OcrTimeout(f"Page {index + 1}: {e}", e.retry_after) from None
+                    # Keep whatever the text layer had if OCR found nothing either
+                    if ocr_text.strip():
+                        text = ocr_text
+                        source = 'ocr'
+                self.page_sources[index] = source
+                METRICS.inc('ocr_pdf_pages_total', source=source)
+                yield index, source, text.upper(), elapsed
+        finally:
+            # Drop queued OCR for pages nobody will read (e.g. a streaming client disconnected)
+            for _, _, future, _ in pending:
+                if future is not None:
+                    future.cancel()
+
+    def page_texts(self, indexes, ocr_page=process_pdf_page_ocr):
+        """Uppercased text for each page index, OCR'ing only pages without a usable text layer"""
+        return [text for _, _, text, _ in self.iter_page_texts(indexes, ocr_page)]
+
+    def first_last_indexes(self):
+        """Indexes of the first and (if different) last page"""
+        if self.page_count == 0:
+            return []
+        if self.page_count == 1:
+            return [0]
+        return [0, self.page_count - 1]
+
+
+def join_first_last_page_texts(page_texts):
+    """Join first/last page texts the way extract_text_first_and_last_page always has"""
+    text = ""
+    if page_texts and page_texts[0]:
+        text += page_texts[0] + "\n\n--- PAGE BREAK ---\n\n"
+    if len(page_texts) > 1:
+        text += page_texts[1]
+    return text
+
 def extract_text_from_pdf(pdf_file):
-    """Extract text from PDF file using pdfplumber, fallback to Tesseract for image-based PDFs"""
+    """Extract text from PDF file using pdfplumber, fallback to Tesseract for image-based pages"""
     try:
+        with PdfPageSource(pdf_file) as source:
+            page_texts = source.page_texts(range(source.page_count), process_pdf_page_ocr)
+
         text = ""
-        with pdfplumber.open(pdf_file) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-
-        # Normalize the extracted text to uppercase
-        text = text.upper()
-
-        # If no text was extracted, assume it's an image-based PDF and use Tesseract
-        if not text.strip():
-            text = ""
-            with pdfplumber.open(pdf_file) as pdf:
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    page_texts = list(executor.map(process_pdf_page_ocr, pdf.pages))
-                for page_text in page_texts:
-                    if page_text:
-                        text += page_text + "\n"
+        for page_text in page_texts:
+            if page_text:
+                text += page_text + "\n"
 
         return text
+    except OcrBusy:
+        raise
     except Exception as e:
         raise Exception(f"Error processing PDF: {str(e)}")
 
-def extract_text_from_pdf_first_page(pdf_file):
-    """Extract text from first page of PDF file only, using pdfplumber, fallback to Tesseract for image-based PDFs"""
+def extract_text_from_pdf_first_page(pdf_file, required=None):
+    """Extract text from first page of PDF file only, using pdfplumber, fallback to Tesseract for image-based PDFs.
+
+    `required` lists the extractors the text is for; with OCR_FIRST_PAGE_REGION=header
+    a scanned page may then be OCR'd only as far as they need (see first_page_ocr).
+    """
     try:
         text = ""
-        with pdfplumber.open(pdf_file) as pdf:
-            if len(pdf.pages) > 0:
-                page = pdf.pages[0]
-                page_text = page.extract_text()
-                if page_text:
-                    text = page_text
-
-        # If no text was extracted, assume it's an image-based PDF and use Tesseract
-        if not text.strip():
-            with pdfplumber.open(pdf_file) as pdf:
-                if len(pdf.pages) > 0:
-                    page = pdf.pages[0]
-                    page_image = page.to_image(resolution=800).original
-                    # Custom config for better OCR accuracy: OEM 3 (default engine + neural nets), PSM 6 (uniform block of text)
-                    custom_config = r'--oem 3 --psm 6'
-                    page_text = pytesseract.image_to_string(page_image, config=custom_config)
-                    if page_text:
-                        text = page_text
-
-        # Normalize the extracted text to uppercase
-        text = text.upper()
-
-        print(f"DEBUG: Extracted text length from first page: {len(text)} characters")
-        print(f"DEBUG: First 1000 characters: {text[:1000]}")
+        with PdfPageSource(pdf_file) as source:
+            if source.page_count > 0:
+                text = source.page_texts([0], first_page_ocr(required))[0]
+
+        logger.debug("Extracted text length from first page: %s characters", len(text))
+        log_text_sample(logger, "First page text", text)
 
         return text
+    except OcrBusy:
+        raise
     except Exception as e:
         raise Exception(f"Error processing PDF first page: {str(e)}")
     
 
 
 def extract_text_first_and_last_page(pdf_file):
-    """Extract text from first and last page of PDF file, using pdfplumber, fallback to Tesseract for image-based PDFs"""
+    """Extract text from first and last page of PDF file, using pdfplumber, fallback to Tesseract for image-based PDFs.
+
+    Scanned first and last pages are rendered and OCR'd concurrently on the shared page OCR pool.
+    """
     try:
-        text = ""
-        with pdfplumber.open(pdf_file) as pdf:
-            total_pages = len(pdf.pages)
-            
-            if total_pages == 0:
-                return ""
-            
-            # Extract first page
-            first_page = pdf.pages[0]
-            first_page_text = first_page.extract_text()
-            if first_page_text:
-                text += first_page_text + "\n\n--- PAGE BREAK ---\n\n"
-            
-            # Extract last page (only if it's different from first page)
-            if total_pages > 1:
-                last_page = pdf.pages[-1]
-                last_page_text = last_page.extract_text()
-                if last_page_text:
-                    text += last_page_text
-
-        # If no text was extracted, assume it's an image-based PDF and use Tesseract
-        if not text.strip():
-            text = ""
-            with pdfplumber.open(pdf_file) as pdf:
-                total_pages = len(pdf.pages)
-                
-                if total_pages == 0:
-                    return ""
-                
-                # OCR first page
-                first_page = pdf.pages[0]
-                first_page_image = first_page.to_image(resolution=800).original
-                custom_config = r'--oem 3 --psm 6'
-                first_page_text = pytesseract.image_to_string(first_page_image, config=custom_config)
-                if first_page_text:
-                    text += first_page_text + "\n\n--- PAGE BREAK ---\n\n"
-                
-                # OCR last page (only if it's different from first page)
-                if total_pages > 1:
-                    last_page = pdf.pages[-1]
-                    last_page_image = last_page.to_image(resolution=800).original
-                    last_page_text = pytesseract.image_to_string(last_page_image, config=custom_config)
-                    if last_page_text:
-                        text += last_page_text
+        with PdfPageSource(pdf_file) as source:
+            page_texts = source.page_texts(source.first_last_indexes(), process_first_last_page_ocr)
 
-        # Normalize the extracted text to uppercase
-        text = text.upper()
+        text = join_first_last_page_texts(page_texts)
 
-        print(f"DEBUG: Extracted text length from first and last page: {len(text)} characters")
-        print(f"DEBUG: First 1000 characters: {text[:1000]}")
+        logger.debug("Extracted text length from first and last page: %s characters", len(text))
+        log_text_sample(logger, "First and last page text", text)
 
         return text
+    except OcrBusy:
+        raise
     except Exception as e:
         raise Exception(f"Error processing PDF first and last page: {str(e)}")
 
 
+PAGE_BREAK = "\n\n--- PAGE BREAK ---\n\n"
+
+def join_page_texts(order, page_texts):
+    """Join a field's page texts the way the text helper for its scope does"""
+    if order == 'all':
+        # As extract_text_from_pdf
+        return ''.join(text + "\n" for text in page_texts if text)
+    # As extract_text_first_and_last_page
+    return PAGE_BREAK.join(text for text in page_texts if text)
+
+def find_field(field, text):
+    """(value, final) of a field in text; final means no other page could give a better value"""
+    if field == 'dob':
+        dob = extract_dob_from_text(text)
+        # A date without a DOB keyword next to it may be any other date: keep looking
+        return dob, bool(dob) and dob['confidence'] == 'high'
+    if field == 'aadhar_number':
+        match = find_aadhar_number(text)
+        if not match:
+            return None, False
+        return match[0], match[1] == 'high'
+    value = EXTRACT_ALL_FIELDS[field][2](text)
+    return value, bool(value)
+
+def pdf_fields(source, fields, on_page=None, on_step=None):
+    """Extract the requested fields from an open PdfPageSource, reading only the pages the page planner asks for.
+
+    Each field searches its pages in the order PDF_PAGE_ORDERS gives it (see
+    page_plan.py) and stops at its first final value. First/last-page fields
+    read at the first/last page resolution, and page 1 alone may be OCR'd only
+    as far as the header fields need (see first_page_ocr). 'all' fields read
+    at the full-document resolution, OCR_INCREMENTAL_WAVE pages at a time. A
+    page read for one field serves every field of the same resolution, and
+    the pages of one planner step are OCR'd concurrently. A page wanted at both
+    resolutions in one step (page 1 for header fields and DOB) is OCR'd once,
+    as a full page at the higher one, and a full page read at the higher
+    resolution also serves later lower-resolution reads of it. A page first
+    read at the lower resolution is read again if a higher-resolution field
+    asks for it later.
+
+    Returns (results, pages_read), where pages_read holds the 1-based numbers
+    of the pages read. on_step(indexes) is called with the pages about to be
+    read at each planner step, and on_page(index, source, seconds) as each one
+    is read, for progress reporting.
+    """
+    orders = {field: PDF_PAGE_ORDERS.get(field, EXTRACT_ALL_FIELDS[field][0]) for field in fields}
+    plan = PagePlan(
+        source.page_count, orders, OCR_PLAN_EXTRA_PAGES, OCR_INCREMENTAL_WAVE if OCR_INCREMENTAL_SCAN else None,
+    )
+    # Page texts are kept per resolution: 'first_last' (800 DPI) or 'all' (500 DPI);
+    # 'both' reads a full 800 DPI page for fields of either resolution
+    header_only = all(order in ('first', 'all') for order in orders.values())
+    ocr_pages = {
+        'first_last': first_page_ocr(first_page_extractors(fields)) if header_only else process_first_last_page_ocr,
+        'all': process_pdf_page_ocr,
+        'both': process_first_last_page_ocr,
+    }
+    resolution = {field: 'all' if order == 'all' else 'first_last' for field, order in orders.items()}
+    texts = {}
+    results = {field: None for field in fields}
 
-import re
+    while True:
+        step = plan.next_step()
+        if not step:
+            break
+        needed = {
+            (index, resolution[field]) for field, indexes in step.items() for index in indexes
+            if (index, resolution[field]) not in texts
+        }
+        both = {index for index, kind in needed if kind == 'all' and (index, 'first_last') in needed}
+        to_read = sorted({(index, 'both' if index in both else kind) for index, kind in needed})
+        if on_step and to_read:
+            on_step(sorted({index for index, _ in to_read}))
+        # Every page of the step goes to the page OCR pool at once, e.g. the first and last page
+        pages = source.iter_pages((index, ocr_pages[kind]) for index, kind in to_read)
+        for (_, kind), (index, page_source, text, elapsed) in zip(to_read, pages):
+            if kind == 'both' or ocr_pages[kind] is process_first_last_page_ocr:
+                # A full page at the higher resolution: good for fields of either resolution
+                texts[(index, 'first_last')] = text
+                texts.setdefault((index, 'all'), text)
+            else:
+                texts[(index, kind)] = text
+            if on_page:
+                on_page(index, page_source, elapsed)
+
+        for field, indexes in step.items():
+            searched = plan.searched_pages(field, indexes)
+            # Searching the new pages alone keeps a long 'all' scan linear in document size
+            value, final = find_field(field, join_page_texts(orders[field], [texts[(i, resolution[field])] for i in indexes]))
+            if len(searched) > len(indexes) and (final or plan.exhausted(field)):
+                # The value from every page the field read, as its scope's text helper would give it
+                page_texts = [texts[(i, resolution[field])] for i in searched]
+                value, final = find_field(field, join_page_texts(orders[field], page_texts))
+            results[field] = value
+            if final:
+                plan.resolve(field)
+
+    pages_read = sorted({index + 1 for index, _ in texts})
+    logger.debug("Read pages %s of %s for %s", pages_read, source.page_count, ', '.join(fields))
+    METRICS.inc('ocr_plan_pages_total', len(pages_read), result='read')
+    METRICS.inc('ocr_plan_pages_total', source.page_count - len(pages_read), result='skipped')
+    return results, pages_read
+
+def extract_pdf_fields(pdf_file, fields):
+    """Extract the requested fields from a PDF with the page planner (see pdf_fields); returns (results, pages_read)"""
+    try:
+        with PdfPageSource(pdf_file) as source:
+            return pdf_fields(source, fields)
+    except OcrBusy:
+        raise
+    except Exception as e:
+        raise Exception(f"Error processing PDF: {str(e)}")
+
+
+def extract_pdf_field_or_none(pdf_file, field):
+    """(value, pages_read) of one field from a PDF, or (None, None) when the PDF cannot be read.
+
+    /extract-dob, /extract-aadhar and /extract-statement-period have always
+    answered an unreadable PDF with a null value rather than an error; OcrBusy
+    still propagates.
+    """
+    try:
+        results, pages_read = extract_pdf_fields(pdf_file, [field])
+        return results[field], pages_read
+    except OcrBusy:
+        raise
+    except Exception as e:
+        logger.error("Exception while extracting %s: %s", field, e)
+        return None, None
 
 def extract_dob(file_input, file_type='pdf'):
     try:
         # Extract text based on file type
         if file_type.lower() == 'pdf':
-            text = extract_text_from_pdf(file_input)
+            return extract_pdf_field_or_none(file_input, 'dob')[0]
         elif file_type.lower() == 'image':
             text = extract_text_from_image_aadhar_pan(file_input)
         else:
-            print(f"ERROR: Unsupported file type: {file_type}")
+            logger.error("Unsupported file type: %s", file_type)
             return None
         
         if not text:
-            print("ERROR: No text extracted from file")
+            logger.error("No text extracted from file")
             return None
+
+        return extract_dob_from_text(text)
+
+    except OcrBusy:
+        raise
+    except Exception as e:
+        logger.error("Exception while extracting DOB: %s", e)
+        return None
+
+
+@METRICS.timed_stage('regex_extraction')
+def extract_dob_from_text(text):
+    """Extract DOB from already-extracted document text"""
+    try:
+        doc = scan_text(text)
+        text = doc.text
+        log_text_sample(logger, "Extracted text", text)
         
-        print(f"DEBUG: Extracted text (first 500 chars): {text[:500]}")
-        
-        # Date patterns for DOB extraction
-        # Priority order: most specific to least specific
-        date_patterns = [
-            # dd-mm-yyyy (with various separators)
-            (r'\b(\d{2})[-/.](\d{2})[-/.](\d{4})\b', 'dd-mm-yyyy'),
-            # dd-mm-yy
-            (r'\b(\d{2})[-/.](\d{2})[-/.](\d{2})\b', 'dd-mm-yy'),
-            # yyyy-mm-dd (ISO format)
-            (r'\b(\d{4})[-/.](\d{2})[-/.](\d{2})\b', 'yyyy-mm-dd'),
-            # dd month yyyy (e.g., 15 August 1990)
-            (r'\b(\d{1,2})\s+(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[,\s]+(\d{4})\b', 'dd-month-yyyy'),
-            # month dd, yyyy (e.g., August 15, 1990)
-            (r'\b(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2})[,\s]+(\d{4})\b', 'month-dd-yyyy'),
-        ]
-        
-        # Common DOB keywords to look for context
-        dob_keywords = [
-            r'date\s+of\s+birth',
-            r'dob',
-            r'birth\s+date',
-            r'date\s+of\s+brith',  # common typo
-            r'born',
-            r'd\.?o\.?b\.?',
-        ]
-        
-        # Search for DOB with context
-        for keyword in dob_keywords:
-            # Look for keyword followed by date within 50 characters
-            keyword_pattern = rf'(?i){keyword}[:\s]{{0,50}}'
-            
-            for date_pattern, format_type in date_patterns:
-                combined_pattern = keyword_pattern + date_pattern
-                match = re.search(combined_pattern, text, re.IGNORECASE)
-                
-                if match:
-                    # Extract the date part (exclude the keyword)
-                    date_match = re.search(date_pattern, match.group(), re.IGNORECASE)
-                    if date_match:
-                        dob = date_match.group().strip()
-                        print(f"DEBUG: Found DOB with context - {dob}")
-                        return {
-                            'dob': dob,
-                            'format': format_type,
-                            'confidence': 'high'
-                        }
+        # Search for DOB with context: keyword followed by date within 50 characters
+        for combined_pattern, date_pattern, format_type in patterns.DOB_WITH_CONTEXT:
+            match = doc.search(combined_pattern)
+
+            if match:
+                # Extract the date part (exclude the keyword)
+                date_match = date_pattern.search(match.group())
+                if date_match:
+                    dob = date_match.group().strip()
+                    logger.debug("Found DOB with context - %s", dob)
+                    return {
+                        'dob': dob,
+                        'format': format_type,
+                        'confidence': 'high'
+                    }
         
         # If no DOB found with context, try to find dates without context
         # (lower confidence, return first valid-looking date)
-        print("DEBUG: No DOB found with context, searching for dates without context...")
+        logger.debug("No DOB found with context, searching for dates without context...")
         
-        for date_pattern, format_type in date_patterns:
-            matches = re.finditer(date_pattern, text, re.IGNORECASE)
+        for date_pattern, format_type in patterns.DOB_DATES:
+            matches = date_pattern.finditer(text)
             
             for match in matches:
                 dob = match.group().strip()
@@ -375,23 +1121,23 @@ def extract_dob(file_input, file_type='pdf'):
                 # Basic validation: check if it looks like a reasonable birth date
                 # (avoid matching other dates like transaction dates, expiry dates, etc.)
                 if format_type == 'dd-mm-yyyy':
-                    parts = re.split(r'[-/.]', dob)
+                    parts = patterns.DATE_PART_SEPARATOR.split(dob)
                     day, month, year = int(parts[0]), int(parts[1]), int(parts[2])
                     
                     # Reasonable birth year range (1900-2024)
                     if 1900 <= year <= 2024 and 1 <= month <= 12 and 1 <= day <= 31:
-                        print(f"DEBUG: Found potential DOB (no context) - {dob}")
+                        logger.debug("Found potential DOB (no context) - %s", dob)
                         return {
                             'dob': dob,
                             'format': format_type,
                             'confidence': 'low'
                         }
         
-        print("DEBUG: No DOB found in document")
+        logger.debug("No DOB found in document")
         return None
     
     except Exception as e:
-        print(f"ERROR: Exception while extracting DOB: {str(e)}")
+        logger.error("Exception while extracting DOB: %s", e)
         return None
 
 
@@ -400,7 +1146,7 @@ def extract_aadhar_number(file_input, file_type='pdf'):
     """
     Extract Aadhaar number from image or PDF file.
     Uses extract_text_from_image_aadhar_pan for images,
-    extract_text_from_pdf for PDFs.
+    the page planner (extract_pdf_fields) for PDFs.
     Aadhaar format expected: 
     - Standard: xxxx xxxx xxxx (3 sets of 4 digits) OR
     - Full: xxxx xxxx xxxx xxxx (4 sets of 4 digits)
@@ -416,29 +1162,50 @@ def extract_aadhar_number(file_input, file_type='pdf'):
         if file_type.lower() == 'image':
             text = extract_text_from_image_aadhar_pan(file_input)
         elif file_type.lower() == 'pdf':
-            text = extract_text_from_pdf(file_input)
+            return extract_pdf_field_or_none(file_input, 'aadhar_number')[0]
         else:
-            print(f"ERROR: Unsupported file type: {file_type}")
+            logger.error("Unsupported file type: %s", file_type)
             return None
 
         if not text:
-            print("ERROR: No text extracted from file")
+            logger.error("No text extracted from file")
             return None
 
-        print(f"DEBUG: Extracted text (first 500 chars): {text[:500]}")
+        return extract_aadhar_number_from_text(text)
+
+    except OcrBusy:
+        raise
+    except Exception as e:
+        logger.error("Exception while extracting Aadhaar number: %s", e)
+        return None
+
+
+def extract_aadhar_number_from_text(text):
+    """Extract Aadhaar number from already-extracted document text"""
+    match = find_aadhar_number(text)
+    return match[0] if match else None
+
+
+@METRICS.timed_stage('regex_extraction')
+def find_aadhar_number(text):
+    """(Aadhaar number, confidence) from document text, or None.
+
+    Confidence is 'high' for a number printed in 4-digit groups or next to a
+    UID keyword, 'low' for a bare 12-digit run (which may be any other number).
+    """
+    try:
+        doc = scan_text(text)
+        text = doc.text
+        log_text_sample(logger, "Extracted text", text)
 
         # Pattern 1: Standard Aadhaar format - 3 sets of 4 digits (12 digits total)
         # Example: 7723 2356 1747
-        aadhar_pattern_3 = re.compile(r'\b(\d{4})\s+(\d{4})\s+(\d{4})\b')
-        
         # # Pattern 2: Full Aadhaar format - 4 sets of 4 digits (16 digits total, less common)
         # # Example: 1234 5678 9012 3456
         # aadhar_pattern_4 = re.compile(r'\b(\d{4})\s+(\d{4})\s+(\d{4})\s+(\d{4})\b')
         
         # Pattern 3: Aadhaar with variable spacing (handles OCR errors)
         # Example: 7723  2356   1747 (multiple spaces)
-        aadhar_pattern_flex = re.compile(r'\b(\d{4})\s{1,5}(\d{4})\s{1,5}(\d{4})\b')
-
         # # Try to find 4-part Aadhaar first (more specific)
         # match = aadhar_pattern_4.search(text)
         # if match:
@@ -447,50 +1214,43 @@ def extract_aadhar_number(file_input, file_type='pdf'):
         #     return aadhar_number
 
         # Try to find 3-part Aadhaar (standard format)
-        match = aadhar_pattern_3.search(text)
+        match = doc.search(patterns.AADHAR_GROUPED)
         if match:
             aadhar_number = ' '.join(match.groups())
-            print(f"DEBUG: Found 3-part Aadhaar Number: {aadhar_number}")
-            return aadhar_number
+            logger.debug("Found 3-part Aadhaar Number: %s", aadhar_number)
+            return aadhar_number, 'high'
 
         # Try flexible spacing pattern as fallback
-        match = aadhar_pattern_flex.search(text)
+        match = doc.search(patterns.AADHAR_FLEX_SPACING)
         if match:
             aadhar_number = ' '.join(match.groups())
-            print(f"DEBUG: Found Aadhaar Number (flexible spacing): {aadhar_number}")
-            return aadhar_number
+            logger.debug("Found Aadhaar Number (flexible spacing): %s", aadhar_number)
+            return aadhar_number, 'high'
 
         # Pattern 4: Look for Aadhaar near "UID" keyword (common in Aadhaar cards)
         # Example: "UID : 9176 0790 6943 5824" or "UID: 7723 2356 1747"
-        uid_pattern = re.compile(
-            r'(?i)(?:uid|uidai|enrollment|enrolment|aadhaar|aadhar)[\s:]*'
-            r'(\d{4})\s+(\d{4})\s+(\d{4})(?:\s+(\d{4}))?',
-            re.IGNORECASE
-        )
-        
-        match = uid_pattern.search(text)
+        match = doc.search(patterns.AADHAR_NEAR_UID)
         if match:
             groups = [g for g in match.groups() if g is not None]
             aadhar_number = ' '.join(groups)
-            print(f"DEBUG: Found Aadhaar Number near UID keyword: {aadhar_number}")
-            return aadhar_number
+            logger.debug("Found Aadhaar Number near UID keyword: %s", aadhar_number)
+            return aadhar_number, 'high'
 
         # Pattern 5: Look for 12 consecutive digits (no spaces) and format them
         # Example: 772323561747 → 7723 2356 1747
-        consecutive_pattern = re.compile(r'\b(\d{12})\b')
-        match = consecutive_pattern.search(text)
+        match = doc.search(patterns.AADHAR_12_DIGITS)
         if match:
             aadhar_raw = match.group(1)
             # Format as xxxx xxxx xxxx
             aadhar_number = f"{aadhar_raw[0:4]} {aadhar_raw[4:8]} {aadhar_raw[8:12]}"
-            print(f"DEBUG: Found 12-digit sequence, formatted as: {aadhar_number}")
-            return aadhar_number
+            logger.debug("Found 12-digit sequence, formatted as: %s", aadhar_number)
+            return aadhar_number, 'low'
 
-        print("DEBUG: No Aadhaar number found in text")
+        logger.debug("No Aadhaar number found in text")
         return None
 
     except Exception as e:
-        print(f"ERROR: Exception while extracting Aadhaar number: {str(e)}")
+        logger.error("Exception while extracting Aadhaar number: %s", e)
         return None
 
 
@@ -520,48 +1280,40 @@ def extract_text_first_last_page():
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 def extract_formatted_text_from_pdf(pdf_file):
-    """Extract formatted text from PDF file using pdfplumber, fallback to Tesseract for image-based PDFs"""
+    """Extract formatted text from PDF file using pdfplumber, fallback to Tesseract (PSM 3) for image-based pages"""
     try:
+        # pdfplumber's text layer, whatever PDF_TEXT_BACKEND says, for the layout
+        with PdfPageSource(pdf_file, TEXT_LAYERS['pdfplumber']) as source:
+            page_texts = source.page_texts(range(source.page_count), process_formatted_pdf_page_ocr)
+
         text = ""
-        with pdfplumber.open(pdf_file) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-
-        # Normalize the extracted text to uppercase
-        text = text.upper()
-
-        # If no text was extracted, assume it's an image-based PDF and use Tesseract with PSM 3
-        if not text.strip():
-            text = ""
-            with pdfplumber.open(pdf_file) as pdf:
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    page_texts = list(executor.map(process_formatted_pdf_page_ocr, pdf.pages))
-                for page_text in page_texts:
-                    if page_text:
-                        text += page_text + "\n"
+        for page_text in page_texts:
+            if page_text:
+                text += page_text + "\n"
 
         return text
+    except OcrBusy:
+        raise
     except Exception as e:
         raise Exception(f"Error processing PDF for formatted text: {str(e)}")
 
-def process_formatted_pdf_page_ocr(page):
+def process_formatted_pdf_page_ocr(page, doc_hash=None):
     """Helper function to process a single PDF page for formatted OCR"""
     try:
-        # Increased resolution to 450 for better accuracy
-        page_image = page.to_image(resolution=800).original
         # Use PSM 3 for raw line recognition to preserve line breaks
         custom_config = r'--oem 3 --psm 3'
-        page_text = pytesseract.image_to_string(page_image, config=custom_config)
-        # Normalize to uppercase to reduce case-related OCR errors
-        page_text = page_text.upper()
+        # Increased resolution to 800 for better accuracy; text is normalized to uppercase
+        page_text = ocr_pdf_page(page, 800, custom_config, doc_hash)
         return page_text if page_text else ""
+    except OcrBusy:
+        raise
     except Exception as e:
-        print(f"Warning: Skipping page due to error - {str(e)}")
+        logger.warning("⚠️  Skipping page due to error - %s", e)
         return ""
 
 def extract_tables_from_pdf(pdf_file):
@@ -570,7 +1322,8 @@ def extract_tables_from_pdf(pdf_file):
         all_tables = []
         with pdfplumber.open(pdf_file) as pdf:
             for page in pdf.pages:
-                tables = page.extract_tables()
+                with METRICS.stage('table_extraction'):
+                    tables = page.extract_tables()
                 for table in tables:
                     if table:
                         df = pd.DataFrame(table)
@@ -585,42 +1338,26 @@ def extract_tables_from_pdf(pdf_file):
     except Exception as e:
         raise Exception(f"Error processing PDF tables: {str(e)}")
 
+@METRICS.timed_stage('regex_extraction')
 def extract_pan_number(text):
     """Extract PAN number from text using improved regex patterns"""
-    print(f"DEBUG: Searching for PAN in text (first 500 chars): {text[:500]}")
+    doc = scan_text(text)
+    text = doc.text
+    log_text_sample(logger, "Searching for PAN in text", text)
 
     # 1️⃣ Labeled PAN (looks for "PAN", "PAN No", "PAN Number")
-    labeled_pan_pattern = re.compile(
-        r'(?i)\b(?:pan(?:\s*(?:no\.?|number)?)?)\b[:\-\s]*'
-        r'([A-Z]{3}[ABCFGHLJPTK][A-Z]\s*[0-9]{4}\s*[A-Z])',
-        re.IGNORECASE
-    )
-
     # 2️⃣ Fallback pattern (general PAN match with stricter rules)
-    generic_pan_pattern = re.compile(
-        r'\b(?<![A-Za-z])'
-        r'[A-Z]{3}'
-        r'[ABCFGHLJPTK]'
-        r'[A-Z]'
-        r'\s*'
-        r'[0-9]{4}'
-        r'\s*'
-        r'[A-Z]'
-        r'(?![A-Za-z0-9])\b',
-        re.IGNORECASE
-    )
-
     # Try labeled pattern first
-    lbl_match = labeled_pan_pattern.search(text)
+    lbl_match = doc.search(patterns.PAN_LABELED)
     if lbl_match:
         raw_pan = lbl_match.group(1).replace(" ", "").upper()
-        print(f"DEBUG: Found labeled PAN: {raw_pan}")
+        logger.debug("Found labeled PAN: %s", raw_pan)
     else:
         # Try generic pattern
-        pan_match = generic_pan_pattern.search(text)
+        pan_match = doc.search(patterns.PAN_GENERIC)
         raw_pan = pan_match.group(0).replace(" ", "").upper() if pan_match else ""
         if raw_pan:
-            print(f"DEBUG: Found generic PAN: {raw_pan}")
+            logger.debug("Found generic PAN: %s", raw_pan)
 
     if raw_pan and len(raw_pan) == 10:
         # Normalize OCR misreads in digits only (positions 5–8)
@@ -638,18 +1375,21 @@ def extract_pan_number(text):
                 digits[i] = '1'
 
         pan_number = letters_first3 + fourth_char + fifth_char + ''.join(digits) + last
-        print(f"DEBUG: Final PAN after normalization: {pan_number}")
+        logger.debug("Final PAN after normalization: %s", pan_number)
         return pan_number
     elif raw_pan:
-        print(f"DEBUG: Returning raw PAN (length {len(raw_pan)}): {raw_pan}")
+        logger.debug("Returning raw PAN (length %s): %s", len(raw_pan), raw_pan)
         return raw_pan
 
-    print("DEBUG: No PAN found")
+    logger.debug("No PAN found")
     return None
 
+@METRICS.timed_stage('regex_extraction')
 def extract_opening_balance(text):
     """Extract Opening Balance from text using regex patterns"""
-    print(f"DEBUG: Searching for Opening Balance in text (first 500 chars): {text[:500]}")
+    doc = scan_text(text)
+    text = doc.text
+    log_text_sample(logger, "Searching for Opening Balance in text", text)
     
     # Helper function to check if a number is part of a date/timestamp
     def is_part_of_date_context(full_text, number_str, position):
@@ -661,16 +1401,8 @@ def extract_opening_balance(text):
         
         # Check if this specific number is part of a date pattern
         # Look for patterns like: 18-08-25, 18/08/25, 18:10:49
-        date_time_in_context = [
-            r'\b' + re.escape(number_str) + r'[-/:]\d{1,2}[-/:]\d{2,4}',  # 18-08-25
-            r'\d{1,2}[-/:]+' + re.escape(number_str) + r'[-/:]\d{2,4}',  # 08-18-25
-            r'\d{2,4}[-/:]\d{1,2}[-/:]+' + re.escape(number_str) + r'\b',  # 2025-08-18
-            r'\b' + re.escape(number_str) + r':\d{2}:\d{2}',  # 18:10:49
-            r'\d{1,2}:+' + re.escape(number_str) + r':\d{2}',  # 16:18:49
-        ]
-        
-        for pattern in date_time_in_context:
-            if re.search(pattern, context):
+        for pattern in patterns.date_context_patterns(number_str):
+            if pattern.search(context):
                 return True
         
         return False
@@ -679,29 +1411,13 @@ def extract_opening_balance(text):
     # Matches both spaced and non-spaced variations
     # Spaced: "OPENING BALANCE : 22.38(CR)" or "Opening Balance: 42,650.00"
     # Non-spaced: "OpeningBalance:22.38" or "OPENINGBALANCE22.38"
-    labeled_pattern = re.compile(
-        r'(?i)(?:'
-        r'(opening\s+balance|openingbalance)(?:\s+amount)?'
-        r'|openingbal\.?'
-        r'|opening\s+ledger\s+balance|openingledgerbalance'
-        r'|opening\s+available\s+balance|openingavailablebalance'
-        r'|balance\s+brought\s+forward|balancebroughtforward'
-        r'|brought\s+forward(?:\s+balance)?|broughtforward(?:balance)?'
-        r'|balance\s+b/f|balanceb/f'
-        r'|b/f\s+balance|b/fbalance'
-        r'|opening\s+book\s+balance|openingbookbalance'
-        r')\s*[:\-]?\s*'
-        r'([0-9,]*\.?[0-9]+)\s*(?:\((?:CR|DR)\))?',
-        re.IGNORECASE
-    )
-    
-    match = labeled_pattern.search(text)
+    match = doc.search(patterns.OPENING_BALANCE_LABELED)
     if match:
         opening_balance = match.group(2).replace(',', '')
         credit_debit = match.group(0)
         is_credit = 'CR' in credit_debit.upper()
         is_debit = 'DR' in credit_debit.upper()
-        print(f"DEBUG: Found Opening Balance (labeled): {opening_balance} {'(CR)' if is_credit else '(DR)' if is_debit else ''}")
+        logger.debug("Found Opening Balance (labeled): %s %s", opening_balance, '(CR)' if is_credit else '(DR)' if is_debit else '')
         return {
             'amount': opening_balance,
             'type': 'CR' if is_credit else 'DR' if is_debit else 'UNKNOWN',
@@ -710,48 +1426,20 @@ def extract_opening_balance(text):
     
     # Pattern 2: Table format - headers in one line, values in next line
     # Supports both spaced and non-spaced variations
-    header_pattern = re.compile(
-        r'(?i)('
-        r'(opening\s+balance|openingbalance)(?:\s+amount)?'
-        r'|opening\s+bal\.?|openingbal\.?'
-        r'|opening\s+ledger\s+balance|openingledgerbalance'
-        r'|opening\s+available\s+balance|openingavailablebalance'
-        r'|balance\s+brought\s+forward|balancebroughtforward'
-        r'|brought\s+forward(?:\s+balance)?|broughtforward(?:balance)?'
-        r'|balance\s+b/f|balanceb/f'
-        r'|b/f\s+balance|b/fbalance'
-        r'|opening\s+book\s+balance|openingbookbalance'
-        r')',
-        re.IGNORECASE
-    )
-    
-    lines = text.split('\n')
-    for i, line in enumerate(lines):
-        header_match = header_pattern.search(line)
+    # Only lines holding an opening-balance keyword can contain the header
+    lines = doc.lines
+    for i in doc.line_indexes(patterns.OPENING_BALANCE_HEADER):
+        line = lines[i]
+        header_match = patterns.OPENING_BALANCE_HEADER.search(line)
         if header_match:
             # Found header line, now find the position of "opening balance" in the header
             header_position = header_match.start()
             
             # Check if there's a number on the same line (inline format)
-            inline_number_pattern = re.compile(
-                r'(?i)(?:'
-                r'opening\s+balance(?:\s+amount)?|openingbalance(?:amount)?'
-                r'|opening\s+bal\.?|openingbal\.?'
-                r'|opening\s+ledger\s+balance|openingledgerbalance'
-                r'|opening\s+available\s+balance|openingavailablebalance'
-                r'|balance\s+brought\s+forward|balancebroughtforward'
-                r'|brought\s+forward(?:\s+balance)?|broughtforward(?:balance)?'
-                r'|balance\s+b/f|balanceb/f'
-                r'|b/f\s+balance|b/fbalance'
-                r'|opening\s+book\s+balance|openingbookbalance'
-                r')\s*[:\-]?\s*([0-9,]+\.?\d*)',
-                re.IGNORECASE
-            )
-            
-            inline_match = inline_number_pattern.search(line)
+            inline_match = patterns.OPENING_BALANCE_INLINE.search(line)
             if inline_match:
                 opening_balance = inline_match.group(1).replace(',', '')
-                print(f"DEBUG: Found Opening Balance (inline table): {opening_balance}")
+                logger.debug("Found Opening Balance (inline table): %s", opening_balance)
                 return {
                     'amount': opening_balance,
                     'type': 'UNKNOWN',
@@ -764,17 +1452,17 @@ def extract_opening_balance(text):
                     value_line = lines[i + j]
                     
                     # First, skip the entire line if it starts with date-related keywords
-                    if re.match(r'^\s*(?:AS\s+ON|DATE|ON)\s+\d', value_line, re.IGNORECASE):
-                        print(f"DEBUG: Line {j} starts with date context, extracting numbers after date")
+                    if patterns.BALANCE_DATE_LINE.match(value_line):
+                        logger.debug("Line %s starts with date context, extracting numbers after date", j)
                         # Remove the date portion and continue with remaining numbers
                         # Remove everything up to and including "PM" or "AM" or time pattern
-                        cleaned_line = re.sub(r'^.*?(?:\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM)?)\s*', '', value_line, flags=re.IGNORECASE)
+                        cleaned_line = patterns.BALANCE_LEADING_TIMESTAMP.sub('', value_line)
                         if cleaned_line:
                             value_line = cleaned_line
-                            print(f"DEBUG: Cleaned line: {cleaned_line[:100]}")
+                            logger.debug("Cleaned line: %s", cleaned_line[:100])
                     
                     # Extract all numbers from the value line
-                    numbers = re.findall(r'[0-9,]+\.?\d*', value_line)
+                    numbers = patterns.AMOUNT.findall(value_line)
                     if numbers:
                         # Filter out numbers that are part of dates
                         for num in numbers:
@@ -784,12 +1472,12 @@ def extract_opening_balance(text):
                             
                             # Check if it's part of a date/time in this specific line
                             if is_part_of_date_context(value_line, num, num_pos):
-                                print(f"DEBUG: Skipping number '{num}' - part of date/time")
+                                logger.debug("Skipping number '%s' - part of date/time", num)
                                 continue
                             
                             # Found a valid opening balance
                             opening_balance = num_clean
-                            print(f"DEBUG: Found Opening Balance (table format, line {j} below): {opening_balance}")
+                            logger.debug("Found Opening Balance (table format, line %s below): %s", j, opening_balance)
                             return {
                                 'amount': opening_balance,
                                 'type': 'UNKNOWN',
@@ -798,65 +1486,35 @@ def extract_opening_balance(text):
     
     # Pattern 3: Generic fallback - find any number near "opening balance"
     # Supports both spaced and non-spaced variations
-    generic_pattern = re.compile(
-        r'(?i)(?:'
-        r'opening\s+balance(?:\s+amount)?|openingbalance(?:amount)?'
-        r'|opening\s+bal\.?|openingbal\.?'
-        r'|opening\s+ledger\s+balance|openingledgerbalance'
-        r'|opening\s+available\s+balance|openingavailablebalance'
-        r'|balance\s+brought\s+forward|balancebroughtforward'
-        r'|brought\s+forward(?:\s+balance)?|broughtforward(?:balance)?'
-        r'|balance\s+b/f|balanceb/f'
-        r'|b/f\s+balance|b/fbalance'
-        r'|opening\s+book\s+balance|openingbookbalance'
-        r')'
-        r'[\s\S]{0,50}?'  # Look ahead up to 50 characters
-        r'([0-9,]+\.?\d*)',
-        re.IGNORECASE
-    )
-    
-    match = generic_pattern.search(text)
+    match = doc.search(patterns.OPENING_BALANCE_GENERIC)
     if match:
         opening_balance = match.group(1).replace(',', '')
-        print(f"DEBUG: Found Opening Balance (generic): {opening_balance}")
+        logger.debug("Found Opening Balance (generic): %s", opening_balance)
         return {
             'amount': opening_balance,
             'type': 'UNKNOWN',
             'raw': match.group(0)
         }
     
-    print("DEBUG: No Opening Balance found")
+    logger.debug("No Opening Balance found")
     return None
+@METRICS.timed_stage('regex_extraction')
 def extract_closing_balance(text):
     """Extract Closing Balance from text using regex patterns"""
-    print(f"DEBUG: Searching for Closing Balance in text : {text[:]}")
+    doc = scan_text(text)
+    text = doc.text
+    log_text_sample(logger, "Searching for Closing Balance in text", text)
 
     # Pattern 1: Labeled closing balance with amount on same line
     # Matches: "CLOSING BALANCE : 2,983.38(CR)" or "Closing Balance: 10,77,026.42" or "Closing Balance: .00"
-    labeled_pattern = re.compile(
-        r'(?:'
-        r'(?:closingbalance|closing\s+balance)(?:\s+amount)?'
-        r'|(?:closingbal|closing\s+bal\.?)'
-        r'|(?:closingledgerbalance|closing\s+ledger\s+balance)'
-        r'|(?:closingavailablebalance|closing\s+available\s+balance)'
-        r'|(?:balancecarriedforward|balance\s+carried\s+forward)'
-        r'|(?:carriedforward(?:balance)?|carried\s+forward(?:\s+balance)?)'
-        r'|(?:balancec/f|balance\s+c\/f)'
-        r'|(?:c/fbalance|c\/f\s+balance)'
-        r'|(?:bookclosingbalance|book\s+closing\s+balance)'
-        r')\s*[:\-]?\s*'
-        r'([0-9,]*\.?\d*)\s*(?:\((?:CR|DR)\))?',
-        re.IGNORECASE
-    )
-
-    match = labeled_pattern.search(text)
+    match = doc.search(patterns.CLOSING_BALANCE_LABELED)
     if match:
         closing_balance = match.group(1).replace(',', '')
         credit_debit = match.group(0)
         is_credit = 'CR' in credit_debit.upper()
         is_debit = 'DR' in credit_debit.upper()
         
-        print(f"DEBUG: Found Closing Balance (labeled): {closing_balance} {'(CR)' if is_credit else '(DR)' if is_debit else ''}")
+        logger.debug("Found Closing Balance (labeled): %s %s", closing_balance, '(CR)' if is_credit else '(DR)' if is_debit else '')
         return {
             'amount': closing_balance,
             'type': 'CR' if is_credit else 'DR' if is_debit else 'UNKNOWN',
@@ -866,39 +1524,18 @@ def extract_closing_balance(text):
     # ----------------------------
     # Pattern 2 (Improved): Table format extraction using column positions
     # ----------------------------
-    # header_pattern finds possible closing-balance header (with/without spaces)
-    header_pattern = re.compile(
-        r'(closing\s*balance|closingbalance|closing\s*bal\.?|closingbal|closingledgerbalance|closing\s*ledger\s*balance|'
-        r'closingavailablebalance|closing\s*available\s*balance|balancecarriedforward|balance\s*carried\s*forward|'
-        r'carriedforward|carried\s*forward|balancec/f|balance\s*c/f|c/fbalance|c/f\s*balance|'
-        r'bookclosingbalance|book\s*closing\s*balance)',
-        re.IGNORECASE
-    )
-
-    lines = text.split("\n")
+    # Find possible closing-balance header lines (with/without spaces)
+    lines = doc.lines
 
-    for i, line in enumerate(lines):
-        header_match = header_pattern.search(line)
+    for i in doc.line_indexes(patterns.CLOSING_BALANCE_HEADER):
+        line = lines[i]
+        header_match = patterns.CLOSING_BALANCE_HEADER.search(line)
         if header_match:
             # First — check if there's a number on the same header line (inline number)
-            inline_number_pattern = re.compile(
-                r'(?:'
-                r'(?:closingbalance|closing\s+balance)(?:\s+amount)?'
-                r'|(?:closingbal|closing\s+bal\.?)'
-                r'|(?:closingledgerbalance|closing\s+ledger\s+balance)'
-                r'|(?:closingavailablebalance|closing\s+available\s+balance)'
-                r'|(?:balancecarriedforward|balance\s+carried\s+forward)'
-                r'|(?:carriedforward(?:balance)?|carried\s+forward(?:\s+balance)?)'
-                r'|(?:balancec/f|balance\s+c\/f)'
-                r'|(?:c/fbalance|c\/f\s+balance)'
-                r'|(?:bookclosingbalance|book\s+closing\s+balance)'
-                r')\s+([0-9,]+\.?\d*)',
-                re.IGNORECASE
-            )
-            inline_match = inline_number_pattern.search(line)
+            inline_match = patterns.CLOSING_BALANCE_INLINE.search(line)
             if inline_match:
                 closing_balance = inline_match.group(1).replace(',', '')
-                print(f"DEBUG: Found Closing Balance (inline table): {closing_balance}")
+                logger.debug("Found Closing Balance (inline table): %s", closing_balance)
                 return {
                     'amount': closing_balance,
                     'type': 'UNKNOWN',
@@ -906,7 +1543,7 @@ def extract_closing_balance(text):
                 }
 
             # Collect positions of the closing header occurrences (handles 'closingbalance' and 'closing balance')
-            header_keywords = list(re.finditer(header_pattern, line))
+            header_keywords = list(patterns.CLOSING_BALANCE_HEADER.finditer(line))
 
             header_cols = []
             for hk in header_keywords:
@@ -935,7 +1572,7 @@ def extract_closing_balance(text):
                 value_line = lines[i + j]
 
                 # Find all numbers + their positions in the value line
-                number_matches = list(re.finditer(r'[0-9,]+\.?\d*', value_line))
+                number_matches = list(patterns.AMOUNT.finditer(value_line))
 
                 best_number = None
                 best_distance = float("inf")
@@ -952,7 +1589,7 @@ def extract_closing_balance(text):
 
                 if best_number:
                     closing_balance = best_number.replace(",", "")
-                    print(f"DEBUG: Found Closing Balance (table column detection): {closing_balance}")
+                    logger.debug("Found Closing Balance (table column detection): %s", closing_balance)
                     return {
                         "amount": closing_balance,
                         "type": "UNKNOWN",
@@ -960,96 +1597,56 @@ def extract_closing_balance(text):
                     }
 
     # Pattern 3: Generic fallback - find any number near "closing balance"
-    generic_pattern = re.compile(
-        r'(?:'
-        r'(?:closing\s+balance|closingbalance)(?:\s+amount)?'
-        r'|(?:closingbal|closing\s+bal\.?)'
-        r'|(?:closing\s+ledger\s+balance|closingledgerbalance)'
-        r'|(?:closing\s+available\s+balance|closingavailablebalance)'
-        r'|(?:balance\s+carried\s+forward|balancecarriedforward)'
-        r'|(?:carried\s+forward(?:\s+balance)?|carriedforward(?:balance)?)'
-        r'|(?:balance\s+c\/f|balancec\/f|c\/f\s+balance|c\/fbalance)'
-        r'|(?:book\s+closing\s+balance|bookclosingbalance)'
-        r')'
-        r'[\s\S]{0,50}?'
-        r'([0-9,]+\.?\d*)',
-        re.IGNORECASE
-    )
-
-    match = generic_pattern.search(text)
+    match = doc.search(patterns.CLOSING_BALANCE_GENERIC)
     if match:
         closing_balance = match.group(1).replace(',', '')
-        print(f"DEBUG: Found Closing Balance (generic): {closing_balance}")
+        logger.debug("Found Closing Balance (generic): %s", closing_balance)
         return {
             'amount': closing_balance,
             'type': 'UNKNOWN',
             'raw': match.group(0)
         }
 
-    print("DEBUG: No Closing Balance found")
+    logger.debug("No Closing Balance found")
     return None
 
+@METRICS.timed_stage('regex_extraction')
 def extract_customer_id(text):
     """Extract Customer ID from text using regex patterns"""
-    print(f"DEBUG: Searching for Customer ID in text (first 500 chars): {text[:500]}")
-
-    customer_id_pattern = re.compile(
-        r'(?i)((?:'
-        r'customer\s*id'            # Customer ID
-        r'|cust\.?\s*id'            # Cust ID / Cust. ID
-        r'|customer\s*no\.?'        # Customer No / Customer No.
-        r'|customer\s*number'       # Customer Number
-        r'|cif\s*no\.?'             # CIF No / CIF No.
-        r'|cif\s*id'                # CIF ID
-        r'|cif\s*number'            # CIF Number
-        r'|user\s*id'               # User ID
-        r'|relationship\s*no\.?'    # Relationship No / Relationship No.
-        r'|cust\.?\s*reln\.?\s*no\.?' # Cust Reln No / Cust. Reln. No.
-        r'|crn'                     # CRN
-        r'|client\s*id'             # Client ID (added)
-        r'|customer\s*code'         # Customer Code (added)
-        r'|customer\s*no\.?\s*/\s*cif\s*id'  # Customer No/CIF ID
-        r'|cif\s*id\s*/\s*customer\s*no\.?'  # CIF ID/Customer No
-        r'|custid'                  # CustID
-        r'|client\s*no\.?'          # Client No
-        r'|user\s*no\.?'            # User No
-        r'|ckyc\s*id'               # CKYC ID
-        r'))\s*[:\-=\s/]*\s*([A-Za-z0-9\-/]+)(?=\s|$)'
-    )
+    doc = scan_text(text)
+    text = doc.text
+    log_text_sample(logger, "Searching for Customer ID in text", text)
 
-    match = customer_id_pattern.search(text)
+    match = doc.search(patterns.CUSTOMER_ID_LABELED)
     if match:
         customer_id = match.group(2).strip().replace(" ", "").replace("-", "").replace("/", "")
-        print(f"DEBUG: Found Customer ID: {customer_id}")
+        logger.debug("Found Customer ID: %s", customer_id)
         return customer_id
 
     # Additional pattern for "CustID : 290556726" format
-    alt_pattern = re.compile(r'(?i)custid\s*[:\-]?\s*([A-Za-z0-9]+)')
-    alt_match = alt_pattern.search(text)
+    alt_match = doc.search(patterns.CUSTOMER_ID_CUSTID)
     if alt_match:
         customer_id = alt_match.group(1).strip()
-        print(f"DEBUG: Found Customer ID (alt pattern): {customer_id}")
+        logger.debug("Found Customer ID (alt pattern): %s", customer_id)
         return customer_id
 
-    print("DEBUG: No Customer ID found")
+    logger.debug("No Customer ID found")
     return None
 
+@METRICS.timed_stage('regex_extraction')
 def extract_ifsc_code(text):
     """Extract IFSC Code from text using regex patterns"""
-    print(f"DEBUG: Searching for IFSC Code in text (first 500 chars): {text[:500]}")
+    doc = scan_text(text)
+    text = doc.text
+    log_text_sample(logger, "Searching for IFSC Code in text", text)
 
     # IFSC Code pattern: 4 letters + 0 + 6 alphanumeric characters
     # Format: XXXX0YYYYYY where X = letters, Y = letters or numbers
     # Allow digits in first 4 positions to handle OCR misreads (e.g., B as 8)
-    ifsc_pattern = re.compile(
-        r'(?i)(?:ifsc(?:\s*code)?)\s*[:\-]?\s*([A-Z0-9]{4}0[A-Z0-9]{6})',
-        re.IGNORECASE
-    )
-
-    match = ifsc_pattern.search(text)
+    match = doc.search(patterns.IFSC_LABELED)
     if match:
         ifsc_code = match.group(1).upper().strip()
-        print(f"DEBUG: Raw IFSC Code extracted: {ifsc_code}")
+        logger.debug("Raw IFSC Code extracted: %s", ifsc_code)
 
         # Normalize OCR misreads in the first 4 positions (should be letters)
         normalized_ifsc = list(ifsc_code)
@@ -1075,154 +1672,102 @@ def extract_ifsc_code(text):
             # Add more corrections as needed for other common OCR misreads
 
         ifsc_code = ''.join(normalized_ifsc)
-        print(f"DEBUG: Normalized IFSC Code: {ifsc_code}")
+        logger.debug("Normalized IFSC Code: %s", ifsc_code)
         return ifsc_code
 
-    print("DEBUG: No IFSC Code found")
+    logger.debug("No IFSC Code found")
     return None
 
+@METRICS.timed_stage('regex_extraction')
 def extract_mobile_number(text):
     """Extract Mobile Number from text using regex patterns"""
-    print(f"DEBUG: Searching for Mobile Number in text (first 500 chars): {text[:500]}")
-
-    mobile_pattern = re.compile(
-        r'(?i)((?:'
-        r'mobile\s*no\.?'                    # Mobile No / Mobile No.
-        r'|mobile\s*number'                  # Mobile Number
-        r'|phone\s*no\.?'                    # Phone No / Phone No.
-        r'|phone\s*number'                   # Phone Number
-        r'|contact\s*no\.?'                  # Contact No / Contact No.
-        r'|contact\s*number'                 # Contact Number
-        r'|registered\s*mobile\s*no\.?'      # Registered Mobile No
-        r'|registered\s*mobile\s*number'     # Registered Mobile Number
-        r'|registered\s*phone\s*no\.?'       # Registered Phone No
-        r'|registered\s*phone\s*number'      # Registered Phone Number
-        r'|registered\s*contact\s*no\.?'     # Registered Contact No
-        r'|registered\s*contact\s*number'    # Registered Contact Number
-        r'|tel\s*no\.?'                      # Tel No
-        r'|tel\s*number'                     # Tel Number
-        r'|cell\s*no\.?'                     # Cell No
-        r'|cell\s*number'                    # Cell Number
-        r'|sms\s*no\.?'                      # SMS No
-        r'|sms\s*number'                     # SMS Number
-        r'))\s*[:\-=\s/]*\s*([0-9xX*]+(?:[/,][0-9xX*]+)*)'    # Followed by digits, x, or *, possibly multiple separated by / or ,
-    )
+    doc = scan_text(text)
+    text = doc.text
+    log_text_sample(logger, "Searching for Mobile Number in text", text)
 
-    match = mobile_pattern.search(text)
+    match = doc.search(patterns.MOBILE_LABELED)
     if match:
         mobile_raw = match.group(2)
         # Remove separators and clean to digits, x, *
-        cleaned = re.sub(r'[/,]', '', mobile_raw).upper()
+        cleaned = patterns.MOBILE_SEPARATORS.sub('', mobile_raw).upper()
         # Extract only valid characters: digits, X, *
-        valid_chars = re.findall(r'[0-9X*]', cleaned)
+        valid_chars = patterns.MOBILE_VALID_CHARS.findall(cleaned)
         if valid_chars:
             mobile_number = ''.join(valid_chars)
-            print(f"DEBUG: Found Mobile Number: {mobile_number}")
+            logger.debug("Found Mobile Number: %s", mobile_number)
             return mobile_number
 
     # Fallback: extract numbers after "phone number" until non-alphanumeric or end
-    fallback_pattern = re.compile(r'(?i)phone\s*number\s*[:\-]?\s*([0-9xX*/,\s]+?)(?=\W|$)')
-    fallback_match = fallback_pattern.search(text)
+    fallback_match = doc.search(patterns.MOBILE_PHONE_NUMBER_FALLBACK)
     if fallback_match:
         fallback_raw = fallback_match.group(1).strip()
         # Clean and extract valid characters
-        cleaned = re.sub(r'[/,]', '', fallback_raw).upper()
-        valid_chars = re.findall(r'[0-9X*]', cleaned)
+        cleaned = patterns.MOBILE_SEPARATORS.sub('', fallback_raw).upper()
+        valid_chars = patterns.MOBILE_VALID_CHARS.findall(cleaned)
         if valid_chars:
             mobile_number = ''.join(valid_chars)
-            print(f"DEBUG: Found Mobile Number (fallback): {mobile_number}")
+            logger.debug("Found Mobile Number (fallback): %s", mobile_number)
             return mobile_number
 
-    print("DEBUG: No Mobile Number found")
+    logger.debug("No Mobile Number found")
     return None
 
+@METRICS.timed_stage('regex_extraction')
 def extract_account_number(text):
     """Extract Account Number from text using regex patterns"""
-    print(f"DEBUG: Searching for Account Number in text (first 500 chars): {text[:500]}")
-
-    account_pattern = re.compile(
-        r'(?i)((?:'
-        r'account\s*no\.?'                   # Account No / Account No.
-        r'|account\s*number'                 # Account Number
-        r'|acc\s*no\.?'                      # Acc No / Acc No.
-        r'|acc\s*number'                     # Acc Number
-        r'|account\s*id'                     # Account ID
-        r'|acc\s*id'                         # Acc ID
-        r'|bank\s*account\s*no\.?'           # Bank Account No
-        r'|bank\s*account\s*number'          # Bank Account Number
-        r'|saving\s*account\s*no\.?'         # Saving Account No
-        r'|saving\s*account\s*number'        # Saving Account Number
-        r'|current\s*account\s*no\.?'        # Current Account No
-        r'|current\s*account\s*number'       # Current Account Number
-        r'|a/c\s*no\.?'                      # A/C No
-        r'|a/c\s*number'                     # A/C Number
-        r'))\s*[:\-=\s/]*\s*([0-9\s\-/]+)'
-    )
+    doc = scan_text(text)
+    text = doc.text
+    log_text_sample(logger, "Searching for Account Number in text", text)
 
-    match = account_pattern.search(text)
+    match = doc.search(patterns.ACCOUNT_NUMBER_LABELED)
     if match:
         account_raw = match.group(2).strip()
         # Clean up the account number: remove spaces, dashes, slashes
-        account_number = re.sub(r'[\s\-/]', '', account_raw)
+        account_number = patterns.ID_SEPARATORS.sub('', account_raw)
         # Ensure it's numeric and reasonable length (8-18 digits for bank accounts)
         if account_number.isdigit() and 8 <= len(account_number) <= 18:
-            print(f"DEBUG: Found Account Number: {account_number}")
+            logger.debug("Found Account Number: %s", account_number)
             return account_number
 
     # Fallback: look for sequences of 8-18 digits that might be account numbers
-    fallback_pattern = re.compile(r'\b(\d{8,18})\b')
-    fallback_matches = fallback_pattern.findall(text)
+    fallback_matches = doc.findall(patterns.ACCOUNT_NUMBER_FALLBACK)
     if fallback_matches:
         # Take the first reasonable match
         for match in fallback_matches:
             if len(match) >= 8:
-                print(f"DEBUG: Found Account Number (fallback): {match}")
+                logger.debug("Found Account Number (fallback): %s", match)
                 return match
 
-    print("DEBUG: No Account Number found")
+    logger.debug("No Account Number found")
     return None
 
+@METRICS.timed_stage('regex_extraction')
 def extract_email_ids(text):
     """Extract all Email IDs from text using regex patterns, including labeled and plain emails"""
-    print(f"DEBUG: Searching for Email IDs in text (first 500 chars): {text[:500]}")
+    doc = scan_text(text)
+    text = doc.text
+    log_text_sample(logger, "Searching for Email IDs in text", text)
 
     email_ids = []
     seen_emails = set()  # Track unique emails
 
     # Pattern 1: Extract all plain email addresses first (most reliable)
-    plain_email_pattern = re.compile(
-        r'\b[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}\b',
-        re.IGNORECASE
-    )
-
-    plain_matches = plain_email_pattern.findall(text)
+    plain_matches = doc.findall(patterns.EMAIL_PLAIN)
     for email_raw in plain_matches:
         email_clean = email_raw.strip().lower()
         if email_clean not in seen_emails:
             seen_emails.add(email_clean)
             email_ids.append(email_clean)
-            print(f"DEBUG: Found plain Email ID: {email_clean}")
+            logger.debug("Found plain Email ID: %s", email_clean)
 
     # Pattern 2: Extract labeled emails with potential masking/truncation
-    labeled_email_pattern = re.compile(
-        r'(?i)(?:'
-        r'email\s*(?:id|address)?'            # Email / Email ID / Email Address
-        r'|e-?mail\s*(?:id|address)?'         # E-mail / E-mail ID
-        r'|registered\s+e-?mail\s*(?:id|address)?'  # Registered Email
-        r'|contact\s+e-?mail'                 # Contact Email
-        r'|mail\s*(?:id|address)?'            # Mail / Mail ID
-        r')\s*[:\-=\s/]*\s*'
-        r'([a-zA-Z0-9._%+\-*]+@[a-zA-Z0-9.*\-]+(?:\.[a-zA-Z]{1,})?)',  # Allow partial domains
-        re.IGNORECASE
-    )
-
-    labeled_matches = labeled_email_pattern.findall(text)
+    labeled_matches = doc.findall(patterns.EMAIL_LABELED)
     for email_raw in labeled_matches:
         email_raw = email_raw.strip()
-        print(f"DEBUG: Raw labeled email extracted: {email_raw}")
+        logger.debug("Raw labeled email extracted: %s", email_raw)
 
         # Remove all spaces from email
-        email_raw = re.sub(r'\s+', '', email_raw)
+        email_raw = patterns.WHITESPACE.sub('', email_raw)
 
         # Check if @ symbol exists
         if '@' not in email_raw:
@@ -1262,146 +1807,95 @@ def extract_email_ids(text):
         if email_id not in seen_emails and '@' in email_id:
             seen_emails.add(email_id)
             email_ids.append(email_id)
-            print(f"DEBUG: Found labeled Email ID: {email_id}")
+            logger.debug("Found labeled Email ID: %s", email_id)
 
     # Pattern 3: Look for masked emails (with asterisks)
     # Example: "abc***@gmail.com" or "a***b@domain.com"
-    masked_email_pattern = re.compile(
-        r'\b[a-zA-Z0-9._%+\-*]+@[a-zA-Z0-9.*\-]+\.[a-zA-Z]{2,}\b',
-        re.IGNORECASE
-    )
-
-    masked_matches = masked_email_pattern.findall(text)
+    masked_matches = doc.findall(patterns.EMAIL_MASKED)
     for email_raw in masked_matches:
         email_clean = email_raw.strip().lower()
         if email_clean not in seen_emails and '@' in email_clean:
             seen_emails.add(email_clean)
             email_ids.append(email_clean)
-            print(f"DEBUG: Found masked Email ID: {email_clean}")
+            logger.debug("Found masked Email ID: %s", email_clean)
 
     # Pattern 4: Search for email-like patterns with spaces that need cleanup
     # Example: "user @ domain . com"
-    spaced_email_pattern = re.compile(
-        r'\b([a-zA-Z0-9._%+\-]+)\s*@\s*([a-zA-Z0-9.\-]+)\s*\.\s*([a-zA-Z]{2,})\b',
-        re.IGNORECASE
-    )
-
-    spaced_matches = spaced_email_pattern.findall(text)
+    spaced_matches = doc.findall(patterns.EMAIL_SPACED)
     for match in spaced_matches:
         local, domain, tld = match
         email_clean = f"{local}@{domain}.{tld}".lower()
         if email_clean not in seen_emails:
             seen_emails.add(email_clean)
             email_ids.append(email_clean)
-            print(f"DEBUG: Found spaced Email ID: {email_clean}")
+            logger.debug("Found spaced Email ID: %s", email_clean)
 
     if email_ids:
-        print(f"DEBUG: Total Email IDs found: {len(email_ids)}")
-        print(f"DEBUG: All emails: {email_ids}")
+        logger.debug("Total Email IDs found: %s", len(email_ids))
+        logger.debug("All emails: %s", email_ids)
         return email_ids
     else:
-        print("DEBUG: No Email IDs found")
+        logger.debug("No Email IDs found")
         return []
 
+@METRICS.timed_stage('regex_extraction')
 def extract_ckyc(text):
     """Extract CKYC from text using regex patterns"""
-    print(f"DEBUG: Searching for CKYC in text (first 500 chars): {text[:500]}")
+    doc = scan_text(text)
+    text = doc.text
+    log_text_sample(logger, "Searching for CKYC in text", text)
 
     # Pattern 1: CKYC with label (most common)
     # Handles various formats: "CKYC: 12345", "CKYC ID: 12345", etc.
-    labeled_ckyc_pattern = re.compile(
-        r'(?i)\b(?:'
-        r'ckyc\s*(?:id|no\.?|number|identifier)?'  # CKYC, CKYC ID, CKYC No, etc.
-        r')\s*[:,\-=]\s*'  # ← CHANGED: Require at least one separator (colon, comma, dash, equals)
-        r'([A-Z0-9][A-Z0-9*\-/\s]{8,20})',  # Capture alphanumeric with *, -, /, spaces
-        re.IGNORECASE
-    )
-
-    match = labeled_ckyc_pattern.search(text)
+    match = doc.search(patterns.CKYC_LABELED)
     if match:
         ckyc_raw = match.group(1).strip()
         # Clean up: remove spaces, dashes, slashes but keep asterisks (for masked data)
-        ckyc = re.sub(r'[\s\-/]', '', ckyc_raw)
-        print(f"DEBUG: Found CKYC (labeled): {ckyc}")
+        ckyc = patterns.ID_SEPARATORS.sub('', ckyc_raw)
+        logger.debug("Found CKYC (labeled): %s", ckyc)
         return ckyc
 
     # Pattern 2: Look for 14-digit number after "CKYC" (common format)
-    digit_pattern = re.compile(
-        r'(?i)\bckyc\b[:\s\-]+([0-9*]{14})',  # ← CHANGED: Require at least one separator
-        re.IGNORECASE
-    )
-
-    match = digit_pattern.search(text)
+    match = doc.search(patterns.CKYC_14_DIGITS)
     if match:
         ckyc = match.group(1).strip()
-        print(f"DEBUG: Found CKYC (14-digit): {ckyc}")
+        logger.debug("Found CKYC (14-digit): %s", ckyc)
         return ckyc
 
     # Pattern 3: Generic alphanumeric pattern near "CKYC"
     # Look for sequences that might be CKYC (typically 10-20 characters)
-    generic_pattern = re.compile(
-        r'(?i)ckyc[:\-=]+([A-Z0-9*\-/]{10,20})',  # ← CHANGED: Require at least one separator
-        re.IGNORECASE
-    )
-
-    match = generic_pattern.search(text)
+    match = doc.search(patterns.CKYC_GENERIC)
     if match:
         ckyc_raw = match.group(1).strip()
-        ckyc = re.sub(r'[\s\-/]', '', ckyc_raw)
-        print(f"DEBUG: Found CKYC (generic): {ckyc}")
+        ckyc = patterns.ID_SEPARATORS.sub('', ckyc_raw)
+        logger.debug("Found CKYC (generic): %s", ckyc)
         return ckyc
 
     # Pattern 4: Standalone 14-digit number (fallback - use cautiously)
     # Only if you're sure CKYC is always 14 digits
-    standalone_pattern = re.compile(r'\b([0-9*]{14})\b')
-    matches = standalone_pattern.findall(text)
+    matches = doc.findall(patterns.CKYC_STANDALONE)
     if matches:
         # Return the first 14-digit number found
         ckyc = matches[0]
-        print(f"DEBUG: Found CKYC (standalone 14-digit): {ckyc}")
+        logger.debug("Found CKYC (standalone 14-digit): %s", ckyc)
         return ckyc
 
-    print("DEBUG: No CKYC found")
+    logger.debug("No CKYC found")
     return None
 
+@METRICS.timed_stage('regex_extraction')
 def extract_account_type(text):
     """Extract Account Type from text using regex patterns"""
-    print(f"DEBUG: Searching for Account Type in text (first 500 chars): {text[:500]}")
+    doc = scan_text(text)
+    text = doc.text
+    log_text_sample(logger, "Searching for Account Type in text", text)
 
     # Account Type regex pattern - captures label in group 1, value in group 2
-    account_type_pattern = re.compile(
-        r'(?i)((?:'
-        r'account\s*type'                    # Account Type
-        r'|a/c\s*type'                       # A/c Type
-        r'|a\.c\.?\s*type'                   # A.C. Type / A.C Type
-        r'|type\s*of\s*account'              # Type of Account
-        r'|ac\s*type'                        # Ac Type
-        r'|account\s*category'               # Account Category
-        r'|a/c\s*category'                   # A/c Category
-        r'|acct\s*type'                      # Acct Type
-        r'|scheme\s*type'                    # Scheme Type
-        r'|scheme\s*code'                    # Scheme Code
-        r'|scheme'                           # Scheme
-        r'|product\s*type'                   # Product Type
-        r'|product\s*code'                   # Product Code
-        r'|relationship\s*type'              # Relationship Type
-        r'|relation\s*type'                  # Relation Type
-        r'|customer\s*relationship'          # Customer Relationship
-        r'|customer\s*relation\s*type'       # Customer Relation Type
-        r'|mode\s*of\s*operation'            # Mode of Operation
-        r'|operating\s*type'                 # Operating Type
-        r'|operative\s*type'                 # Operative Type
-        r'|a/c\s*operation'                  # A/c Operation
-        r'|account\s*operation\s*mode'       # Account Operation Mode
-        r'|operation\s*mode'                 # Operation Mode
-        r'))\s*[:\-=\s/]*\s*([A-Za-z0-9\s\-/]+)(?=\s|$)'
-    )
-
     # Find all matches
-    matches = account_type_pattern.findall(text)
+    matches = doc.findall(patterns.ACCOUNT_TYPE_LABELED)
 
     # Prioritize matches where the value contains "account", "a/c", or "a.c"
-    prioritized_matches = [m for m in matches if re.search(r'(?i)account|a/c|a\.c', m[1])]
+    prioritized_matches = [m for m in matches if patterns.ACCOUNT_WORD.search(m[1])]
 
     # If prioritized matches exist, use the first one; otherwise, use the first match
     if prioritized_matches:
@@ -1409,17 +1903,17 @@ def extract_account_type(text):
     elif matches:
         selected_match = matches[0]
     else:
-        print("DEBUG: No Account Type found")
+        logger.debug("No Account Type found")
         return None
 
     label = selected_match[0].strip()
     account_type_raw = selected_match[1].strip()
 
     # Process the value: find the word containing "account"/"a/c"/"a.c", take previous word and that word
-    words = re.split(r'\s+', account_type_raw)
+    words = patterns.WHITESPACE.split(account_type_raw)
     account_word_index = None
     for i, word in enumerate(words):
-        if re.search(r'(?i)account|a/c|a\.c', word):
+        if patterns.ACCOUNT_WORD.search(word):
             account_word_index = i
             break
 
@@ -1433,7 +1927,7 @@ def extract_account_type(text):
         account_type = '  '.join(words[:3])
 
     account_type = account_type.upper()
-    print(f"DEBUG: Found Account Type - Label: '{label}', Value: '{account_type}'")
+    logger.debug("Found Account Type - Label: '%s', Value: '%s'", label, account_type)
     return {
         'label': label,
         'account_type': account_type
@@ -1441,32 +1935,24 @@ def extract_account_type(text):
 
 def extract_statement_period(pdf_file):
     """Extract statement period from the first page of a PDF using regex"""
-    try:
-        # Extract text from the first page
-        text = extract_text_from_pdf_first_page(pdf_file)
-        if not text:
-            return None
+    return extract_pdf_field_or_none(pdf_file, 'statement_period')[0]
 
-        print(f"DEBUG: Extracted text for statement period (first 500 chars): {text[:500]}")
+
+@METRICS.timed_stage('regex_extraction')
+def extract_statement_period_from_text(text):
+    """Extract statement period from already-extracted first page text"""
+    try:
+        text = scan_text(text).text
+        log_text_sample(logger, "Extracted text for statement period", text)
 
         # First, fix dates that are split across lines by removing spaces between date components
         # This handles cases like "30/06 /2025" -> "30/06/2025"
-        text = re.sub(r'(\d{1,2}[-/.]\d{1,2})\s+([-/.])\s*(\d{2,4})', r'\1\2\3', text)
-        text = re.sub(r'(\d{4}[-/.]\d{1,2})\s+([-/.])\s*(\d{1,2})', r'\1\2\3', text)
+        text = patterns.STATEMENT_SPLIT_DATE_DMY.sub(r'\1\2\3', text)
+        text = patterns.STATEMENT_SPLIT_DATE_YMD.sub(r'\1\2\3', text)
         
-        print(f"DEBUG: Text after date fixing (first 500 chars): {text[:500]}")
-
-        # Date pattern: 
-        # - dd-mm-yyyy, dd-mm-yy, dd/mm/yyyy, dd/mm/yy, dd.mm.yy, dd.mm.yyyy
-        # - yyyy-mm-dd, yy-mm-dd, yyyy/mm/dd, yy/mm/dd (ISO format)
-        # - dd month yyyy, dd mon yyyy
-        # - mon dd, yyyy (e.g., JUL 01, 2025)
-        date_pattern = r'\b\d{4}[-/.]\d{1,2}[-/.]\d{1,2}\b|\b\d{2}[-/.]\d{1,2}[-/.]\d{1,2}\b|\b\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4}\b|\b\d{1,2}\s+(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{4}\b|\b(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{1,2},?\s+\d{4}\b'
-
-        # Period pattern: from: date to: date or date to date (case-insensitive, handles optional asterisks)
-        period_pattern = r'(?i)(?:statement\s+)?period[:\s*]+(' + date_pattern + r')[:\s*]+to[:\s*]+(' + date_pattern + r')|(?:period\s+)?from[:\s*]*(' + date_pattern + r')[:\s*]+to[:\s*]+(' + date_pattern + r')|(' + date_pattern + r')\s+to\s+(' + date_pattern + r')'
+        log_text_sample(logger, "Text after date fixing", text)
 
-        match = re.search(period_pattern, text, re.IGNORECASE)
+        match = patterns.STATEMENT_PERIOD.search(text)
         if match:
             # Extract the matched groups
             groups = match.groups()
@@ -1481,19 +1967,179 @@ def extract_statement_period(pdf_file):
                     break
             
             if from_date and to_date:
-                print(f"DEBUG: Found Statement Period - From: {from_date}, To: {to_date}")
+                logger.debug("Found Statement Period - From: %s, To: %s", from_date, to_date)
                 return {
                     'from_date': from_date,
                     'to_date': to_date
                 }
 
-        print("DEBUG: No Statement Period found")
+        logger.debug("No Statement Period found")
         return None
 
     except Exception as e:
-        print(f"DEBUG: Error extracting statement period: {str(e)}")
+        logger.debug("Error extracting statement period: %s", e)
         return None
-    
+
+
+# Field name -> (PDF page scope, image OCR mode, text extractor)
+# Scopes and OCR modes mirror what each dedicated /extract-* endpoint uses
+EXTRACT_ALL_FIELDS = {
+    'pan_number': ('first', 'aadhar_pan', extract_pan_number),
+    'customer_id': ('first', 'standard', extract_customer_id),
+    'mobile_number': ('first', 'standard', extract_mobile_number),
+    'account_number': ('first', 'standard', extract_account_number),
+    'ifsc_code': ('first', 'standard', extract_ifsc_code),
+    'email_ids': ('first', 'standard', extract_email_ids),
+    'ckyc': ('first', 'standard', extract_ckyc),
+    'account_type': ('first', 'standard', extract_account_type),
+    'opening_balance': ('first_last', 'standard', extract_opening_balance),
+    'closing_balance': ('first_last', 'standard', extract_closing_balance),
+    'statement_period': ('first', 'standard', extract_statement_period_from_text),
+    'dob': ('all', 'aadhar_pan', extract_dob_from_text),
+    'aadhar_number': ('all', 'aadhar_pan', extract_aadhar_number_from_text),
+}
+
+# Page order for the PDF page planner where it differs from the field's scope (see page_plan.py)
+PDF_PAGE_ORDERS = {
+    # Printed at the end of the statement; page 1 only has it in summary boxes
+    'closing_balance': 'last_first',
+}
+
+# DOB and Aadhaar may read every page of a PDF, so they are only run when requested via fields=
+DEFAULT_EXTRACT_ALL_FIELDS = [
+    name for name, (pdf_scope, _, _) in EXTRACT_ALL_FIELDS.items() if pdf_scope != 'all'
+]
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']
+
+
+def parse_requested_fields(fields_param):
+    """Turn a comma-separated fields= value into a field list; returns (fields, unknown_fields)"""
+    if not fields_param:
+        return list(DEFAULT_EXTRACT_ALL_FIELDS), []
+    fields = [f.strip() for f in fields_param.split(',') if f.strip()]
+    unknown_fields = [f for f in fields if f not in EXTRACT_ALL_FIELDS]
+    return fields, unknown_fields
+
+def run_field_extractors(texts, file_ext, fields):
+    """Run each requested field extractor on the text for its page scope (PDF) or OCR mode (image)"""
+    results = {}
+    scanned = {}
+    for field in fields:
+        pdf_scope, image_mode, extractor = EXTRACT_ALL_FIELDS[field]
+        key = pdf_scope if file_ext == '.pdf' else image_mode
+        # Index each text once; every extractor reuses its lines and label positions
+        if key not in scanned:
+            scanned[key] = scan_text(texts[key])
+        results[field] = extractor(scanned[key])
+    return results
+
+def first_page_extractors(fields):
+    """Extractors of the requested fields that read the first page"""
+    return [EXTRACT_ALL_FIELDS[field][2] for field in fields if EXTRACT_ALL_FIELDS[field][0] == 'first']
+
+def image_texts_by_mode(data, fields):
+    """OCR an uploaded image once per OCR mode the requested fields need"""
+    modes = {EXTRACT_ALL_FIELDS[field][1] for field in fields}
+    texts = {}
+    if 'standard' in modes:
+        texts['standard'] = extract_text_from_image(io.BytesIO(data))
+    if 'aadhar_pan' in modes:
+        texts['aadhar_pan'] = extract_text_from_image_aadhar_pan(io.BytesIO(data))
+    return texts
+
+def extract_all_fields(file, file_ext, fields):
+    """Run each requested field extractor, reading only the PDF pages they need (or OCR'ing an image once per mode).
+
+    Returns (results, pages_read); pages_read is None for images.
+    """
+    data = read_upload(file)
+
+    if file_ext == '.pdf':
+        return extract_pdf_fields(io.BytesIO(data), fields)
+
+    texts = image_texts_by_mode(data, fields)
+    return run_field_extractors(texts, file_ext, fields), None
+
+def run_extraction_job(job, data, file_ext, fields):
+    """Background job body for /jobs: same extraction as /extract-all, with per-page progress"""
+    # Accepted jobs wait for OCR capacity instead of failing with OcrBusy
+    wait_for_ocr_capacity()
+    # Log the job's work under its own id
+    request_log.begin_request(job.id)
+    if file_ext == '.pdf':
+        # Jobs run outside the request, so take the text backend of the endpoint that created them
+        with PdfPageSource(io.BytesIO(data), text_layer_for('create_job')) as source:
+            # Pages are added to the job as the page planner schedules them
+            results, _ = pdf_fields(source, fields, on_page=job.page_done, on_step=job.add_pages)
+        return results
+
+    job.set_pages([0])
+    started = time.perf_counter()
+    texts = image_texts_by_mode(data, fields)
+    job.page_done(0, 'ocr', time.perf_counter() - started)
+    return run_field_extractors(texts, file_ext, fields)
+
+@METRICS.gauge_callback
+def ocr_state_metrics():
+    """Scrape-time values from the OCR admission controller, job manager and OCR cache"""
+    admission = OCR_ADMISSION.stats()
+    cache = OCR_CACHE.stats()
+    yield 'ocr_pages_in_flight', {}, admission['pages_in_flight']
+    yield 'ocr_raster_bytes_in_flight', {}, admission['raster_bytes_in_flight']
+    yield 'ocr_queue_depth', {}, admission['queue_depth']
+    for result in ('admitted', 'rejected', 'timed_out'):
+        yield 'ocr_admission_total', {'result': result}, admission[result]
+    yield 'ocr_admission_wait_seconds_total', {}, admission['wait_seconds_total']
+    for status, count in JOB_MANAGER.stats().items():
+        yield 'ocr_jobs', {'status': status}, count
+    for result, stat in (('memory_hit', 'memory_hits'), ('disk_hit', 'disk_hits'), ('miss', 'misses')):
+        yield 'ocr_cache_lookups_total', {'result': result}, cache[stat]
+    yield 'ocr_cache_entries', {}, cache['memory_entries']
+    yield 'ocr_cache_disk_bytes', {}, cache['disk_bytes']
+    if isinstance(OCR_ENGINE, OcrWorkerPool):
+        pool = OCR_ENGINE.stats()
+        yield 'ocr_pool_workers', {'state': 'alive'}, pool['alive']
+        yield 'ocr_pool_workers', {'state': 'idle'}, pool['idle']
+        for reason, stat in (('failure', 'restarts'), ('page_limit', 'recycled')):
+            yield 'ocr_pool_restarts_total', {'reason': reason}, pool[stat]
+        yield 'ocr_pool_failed_health_checks_total', {}, pool['failed_health_checks']
+
+@app.before_request
+def start_request():
+    g.request_started = time.perf_counter()
+    g.request_id = request_log.begin_request(request.headers.get('X-Request-ID'))
+
+@app.after_request
+def finish_request(response):
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    response.headers['X-Request-ID'] = g.request_id
+    # Label by route pattern, not path, so /jobs/<job_id> stays one series
+    labels = {
+        'endpoint': request.url_rule.rule if request.url_rule else 'unmatched',
+        'method': request.method,
+        'status': response.status_code,
+    }
+
+    def record():
+        METRICS.observe('ocr_http_request_duration_seconds', time.perf_counter() - started, **labels)
+        request_log.log_request_summary(logger, labels['method'], labels['endpoint'], labels['status'], started)
+
+    if response.is_streamed:
+        # Streamed responses do their work while the body is sent
+        response.call_on_close(record)
+    else:
+        record()
+    return response
+
+def ocr_busy_response(error):
+    """429 with Retry-After for requests turned away by OCR admission control, 503 if a page's OCR timed out"""
+    response = jsonify({'error': str(error), 'retry_after': error.retry_after})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 503 if isinstance(error, OcrTimeout) else 429
+
 @app.route('/extract-text', methods=['POST'])
 def extract_text():
     """Endpoint to extract text from uploaded file"""
@@ -1523,6 +2169,75 @@ def extract_text():
             'file_type': file_ext
         }), 200
         
+    except OcrBusy as e:
+        return ocr_busy_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def stream_text_records(data, file_ext, filename):
+    """Yield one NDJSON line per page (page, source, text, elapsed_ms), then a final summary line"""
+    started = time.perf_counter()
+    page_count = 0
+    try:
+        if file_ext == '.pdf':
+            with PdfPageSource(io.BytesIO(data)) as source:
+                for index, page_source, text, elapsed in source.iter_page_texts(range(source.page_count)):
+                    page_count += 1
+                    yield json.dumps({
+                        'page': index + 1,
+                        'source': page_source,
+                        'text': text,
+                        'elapsed_ms': round(elapsed * 1000, 1)
+                    }) + "\n"
+        else:
+            text, elapsed = extract_text_from_image(io.BytesIO(data)), time.perf_counter() - started
+            page_count = 1
+            yield json.dumps({
+                'page': 1,
+                'source': 'ocr',
+                'text': text,
+                'elapsed_ms': round(elapsed * 1000, 1)
+            }) + "\n"
+
+        yield json.dumps({
+            'done': True,
+            'page_count': page_count,
+            'filename': filename,
+            'file_type': file_ext,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+        }) + "\n"
+    except OcrBusy as e:
+        yield json.dumps({'error': str(e), 'retry_after': e.retry_after, 'page_count': page_count}) + "\n"
+    except Exception as e:
+        # Headers are already sent, so report the failure as the last record
+        yield json.dumps({'error': str(e), 'page_count': page_count}) + "\n"
+
+@app.route('/extract-text-stream', methods=['POST'])
+def extract_text_stream():
+    """Endpoint to stream extracted text page by page as NDJSON"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file uploaded'}), 400
+
+        file = request.files['file']
+
+        if file.filename == '':
+            return jsonify({'error': 'Empty filename'}), 400
+
+        file_ext = os.path.splitext(file.filename)[1].lower()
+
+        if file_ext not in IMAGE_EXTENSIONS and file_ext != '.pdf':
+            return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
+
+        data = file.read()
+
+        return Response(
+            stream_with_context(stream_text_records(data, file_ext, file.filename)),
+            mimetype='application/x-ndjson'
+        )
+
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1551,6 +2266,8 @@ def extract_tables():
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1579,6 +2296,8 @@ def extract_text_first_page():
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1596,36 +2315,35 @@ def extract_pan():
 
         file_ext = os.path.splitext(file.filename)[1].lower()
 
-        extracted_text = ""
+        pages_read = None
 
         if file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-            extracted_text = extract_text_from_image_aadhar_pan(file)
+            pan_number = extract_pan_number(extract_text_from_image_aadhar_pan(file))
         elif file_ext == '.pdf':
-            extracted_text = extract_text_from_pdf_first_page(file)
+            # Reads only the pages the page planner needs for this field
+            results, pages_read = extract_pdf_fields(file, ['pan_number'])
+            pan_number = results['pan_number']
         else:
             return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
-
-        # Use improved PAN extraction function
-        pan_number = extract_pan_number(extracted_text)
+        logger.debug("Processing file: %s", file.filename)
 
         if pan_number:
-            print(f"✅ PAN FOUND: {pan_number}")
+            logger.debug("✅ PAN FOUND: %s", pan_number)
         else:
-            print("❌ PAN NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ PAN NOT FOUND")
 
         return jsonify({
             'pan_number': pan_number,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_pan: {str(e)}")
+        logger.exception("❌ Error in extract_pan")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/extract-customer-id', methods=['POST'])
@@ -1642,36 +2360,35 @@ def extract_customer_id_endpoint():
 
         file_ext = os.path.splitext(file.filename)[1].lower()
 
-        extracted_text = ""
+        pages_read = None
 
         if file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-            extracted_text = extract_text_from_image(file)
+            customer_id = extract_customer_id(extract_text_from_image(file))
         elif file_ext == '.pdf':
-            extracted_text = extract_text_from_pdf_first_page(file)
+            # Reads only the pages the page planner needs for this field
+            results, pages_read = extract_pdf_fields(file, ['customer_id'])
+            customer_id = results['customer_id']
         else:
             return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
-
-        # Use customer ID extraction function
-        customer_id = extract_customer_id(extracted_text)
+        logger.debug("Processing file: %s", file.filename)
 
         if customer_id:
-            print(f"✅ CUSTOMER ID FOUND: {customer_id}")
+            logger.debug("✅ CUSTOMER ID FOUND: %s", customer_id)
         else:
-            print("❌ CUSTOMER ID NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ CUSTOMER ID NOT FOUND")
 
         return jsonify({
             'customer_id': customer_id,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_customer_id: {str(e)}")
+        logger.exception("❌ Error in extract_customer_id")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/extract-mobile-number', methods=['POST'])
@@ -1688,36 +2405,35 @@ def extract_mobile_number_endpoint():
 
         file_ext = os.path.splitext(file.filename)[1].lower()
 
-        extracted_text = ""
+        pages_read = None
 
         if file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-            extracted_text = extract_text_from_image(file)
+            mobile_number = extract_mobile_number(extract_text_from_image(file))
         elif file_ext == '.pdf':
-            extracted_text = extract_text_from_pdf_first_page(file)
+            # Reads only the pages the page planner needs for this field
+            results, pages_read = extract_pdf_fields(file, ['mobile_number'])
+            mobile_number = results['mobile_number']
         else:
             return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
-
-        # Use mobile number extraction function
-        mobile_number = extract_mobile_number(extracted_text)
+        logger.debug("Processing file: %s", file.filename)
 
         if mobile_number:
-            print(f"✅ MOBILE NUMBER FOUND: {mobile_number}")
+            logger.debug("✅ MOBILE NUMBER FOUND: %s", mobile_number)
         else:
-            print("❌ MOBILE NUMBER NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ MOBILE NUMBER NOT FOUND")
 
         return jsonify({
             'mobile_number': mobile_number,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_mobile_number: {str(e)}")
+        logger.exception("❌ Error in extract_mobile_number")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/extract-account-number', methods=['POST'])
@@ -1734,36 +2450,35 @@ def extract_account_number_endpoint():
 
         file_ext = os.path.splitext(file.filename)[1].lower()
 
-        extracted_text = ""
+        pages_read = None
 
         if file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-            extracted_text = extract_text_from_image(file)
+            account_number = extract_account_number(extract_text_from_image(file))
         elif file_ext == '.pdf':
-            extracted_text = extract_text_from_pdf_first_page(file)
+            # Reads only the pages the page planner needs for this field
+            results, pages_read = extract_pdf_fields(file, ['account_number'])
+            account_number = results['account_number']
         else:
             return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
-
-        # Use account number extraction function
-        account_number = extract_account_number(extracted_text)
+        logger.debug("Processing file: %s", file.filename)
 
         if account_number:
-            print(f"✅ ACCOUNT NUMBER FOUND: {account_number}")
+            logger.debug("✅ ACCOUNT NUMBER FOUND: %s", account_number)
         else:
-            print("❌ ACCOUNT NUMBER NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ ACCOUNT NUMBER NOT FOUND")
 
         return jsonify({
             'account_number': account_number,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_account_number: {str(e)}")
+        logger.exception("❌ Error in extract_account_number")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/extract-ifsc', methods=['POST'])
@@ -1780,36 +2495,35 @@ def extract_ifsc_endpoint():
 
         file_ext = os.path.splitext(file.filename)[1].lower()
 
-        extracted_text = ""
+        pages_read = None
 
         if file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-            extracted_text = extract_text_from_image(file)
+            ifsc_code = extract_ifsc_code(extract_text_from_image(file))
         elif file_ext == '.pdf':
-            extracted_text = extract_text_from_pdf_first_page(file)
+            # Reads only the pages the page planner needs for this field
+            results, pages_read = extract_pdf_fields(file, ['ifsc_code'])
+            ifsc_code = results['ifsc_code']
         else:
             return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
-
-        # Use IFSC extraction function
-        ifsc_code = extract_ifsc_code(extracted_text)
+        logger.debug("Processing file: %s", file.filename)
 
         if ifsc_code:
-            print(f"✅ IFSC CODE FOUND: {ifsc_code}")
+            logger.debug("✅ IFSC CODE FOUND: %s", ifsc_code)
         else:
-            print("❌ IFSC CODE NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ IFSC CODE NOT FOUND")
 
         return jsonify({
             'ifsc_code': ifsc_code,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_ifsc: {str(e)}")
+        logger.exception("❌ Error in extract_ifsc")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/extract-email', methods=['POST'])
@@ -1826,36 +2540,35 @@ def extract_email_endpoint():
 
         file_ext = os.path.splitext(file.filename)[1].lower()
 
-        extracted_text = ""
+        pages_read = None
 
         if file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-            extracted_text = extract_text_from_image(file)
+            email_ids = extract_email_ids(extract_text_from_image(file))
         elif file_ext == '.pdf':
-            extracted_text = extract_text_from_pdf_first_page(file)
+            # Reads only the pages the page planner needs for this field
+            results, pages_read = extract_pdf_fields(file, ['email_ids'])
+            email_ids = results['email_ids']
         else:
             return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
-
-        # Use email extraction function
-        email_ids = extract_email_ids(extracted_text)
+        logger.debug("Processing file: %s", file.filename)
 
         if email_ids:
-            print(f"✅ EMAIL IDs FOUND: {email_ids}")
+            logger.debug("✅ EMAIL IDs FOUND: %s", email_ids)
         else:
-            print("❌ EMAIL IDs NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ EMAIL IDs NOT FOUND")
 
         return jsonify({
             'email_ids': email_ids,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_email: {str(e)}")
+        logger.exception("❌ Error in extract_email")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/extract-ckyc', methods=['POST'])
@@ -1872,36 +2585,35 @@ def extract_ckyc_endpoint():
 
         file_ext = os.path.splitext(file.filename)[1].lower()
 
-        extracted_text = ""
+        pages_read = None
 
         if file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-            extracted_text = extract_text_from_image(file)
+            ckyc = extract_ckyc(extract_text_from_image(file))
         elif file_ext == '.pdf':
-            extracted_text = extract_text_from_pdf_first_page(file)
+            # Reads only the pages the page planner needs for this field
+            results, pages_read = extract_pdf_fields(file, ['ckyc'])
+            ckyc = results['ckyc']
         else:
             return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
-
-        # Use CKYC extraction function
-        ckyc = extract_ckyc(extracted_text)
+        logger.debug("Processing file: %s", file.filename)
 
         if ckyc:
-            print(f"✅ CKYC FOUND: {ckyc}")
+            logger.debug("✅ CKYC FOUND: %s", ckyc)
         else:
-            print("❌ CKYC NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ CKYC NOT FOUND")
 
         return jsonify({
             'ckyc': ckyc,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_ckyc: {str(e)}")
+        logger.exception("❌ Error in extract_ckyc")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/extract-account-type', methods=['POST'])
@@ -1918,36 +2630,35 @@ def extract_account_type_endpoint():
 
         file_ext = os.path.splitext(file.filename)[1].lower()
 
-        extracted_text = ""
+        pages_read = None
 
         if file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-            extracted_text = extract_text_from_image(file)
+            account_type_data = extract_account_type(extract_text_from_image(file))
         elif file_ext == '.pdf':
-            extracted_text = extract_text_from_pdf_first_page(file)
+            # Reads only the pages the page planner needs for this field
+            results, pages_read = extract_pdf_fields(file, ['account_type'])
+            account_type_data = results['account_type']
         else:
             return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
-
-        # Use account type extraction function
-        account_type_data = extract_account_type(extracted_text)
+        logger.debug("Processing file: %s", file.filename)
 
         if account_type_data:
-            print(f"✅ ACCOUNT TYPE FOUND: {account_type_data}")
+            logger.debug("✅ ACCOUNT TYPE FOUND: %s", account_type_data)
         else:
-            print("❌ ACCOUNT TYPE NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ ACCOUNT TYPE NOT FOUND")
 
         return jsonify({
             'account_type': account_type_data,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_account_type: {str(e)}")
+        logger.exception("❌ Error in extract_account_type")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/extract-opening-balance', methods=['POST'])
@@ -1964,36 +2675,35 @@ def extract_opening_balance_endpoint():
 
         file_ext = os.path.splitext(file.filename)[1].lower()
 
-        extracted_text = ""
+        pages_read = None
 
         if file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-            extracted_text = extract_text_from_image(file)
+            opening_balance_data = extract_opening_balance(extract_text_from_image(file))
         elif file_ext == '.pdf':
-            extracted_text = extract_text_first_and_last_page(file)
+            # Reads only the pages the page planner needs for this field
+            results, pages_read = extract_pdf_fields(file, ['opening_balance'])
+            opening_balance_data = results['opening_balance']
         else:
             return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
-
-        # Use opening balance extraction function
-        opening_balance_data = extract_opening_balance(extracted_text)
+        logger.debug("Processing file: %s", file.filename)
 
         if opening_balance_data:
-            print(f"✅ OPENING BALANCE FOUND: {opening_balance_data}")
+            logger.debug("✅ OPENING BALANCE FOUND: %s", opening_balance_data)
         else:
-            print("❌ OPENING BALANCE NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ OPENING BALANCE NOT FOUND")
 
         return jsonify({
             'opening_balance': opening_balance_data,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_opening_balance: {str(e)}")
+        logger.exception("❌ Error in extract_opening_balance")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/extract-closing-balance', methods=['POST'])
@@ -2010,36 +2720,35 @@ def extract_closing_balance_endpoint():
 
         file_ext = os.path.splitext(file.filename)[1].lower()
 
-        extracted_text = ""
+        pages_read = None
 
         if file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-            extracted_text = extract_text_from_image(file)
+            closing_balance_data = extract_closing_balance(extract_text_from_image(file))
         elif file_ext == '.pdf':
-            extracted_text = extract_text_first_and_last_page(file)
+            # Reads only the pages the page planner needs for this field
+            results, pages_read = extract_pdf_fields(file, ['closing_balance'])
+            closing_balance_data = results['closing_balance']
         else:
             return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
-
-        # Use closing balance extraction function
-        closing_balance_data = extract_closing_balance(extracted_text)
+        logger.debug("Processing file: %s", file.filename)
 
         if closing_balance_data:
-            print(f"✅ CLOSING BALANCE FOUND: {closing_balance_data}")
+            logger.debug("✅ CLOSING BALANCE FOUND: %s", closing_balance_data)
         else:
-            print("❌ CLOSING BALANCE NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ CLOSING BALANCE NOT FOUND")
 
         return jsonify({
             'closing_balance': closing_balance_data,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_closing_balance: {str(e)}")
+        logger.exception("❌ Error in extract_closing_balance")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/extract-statement-period', methods=['POST'])
@@ -2059,27 +2768,26 @@ def extract_statement_period_endpoint():
         if file_ext != '.pdf':
             return jsonify({'error': 'Statement period extraction is only supported for PDF files'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
+        logger.debug("Processing file: %s", file.filename)
 
-        # Use statement period extraction function
-        statement_period_data = extract_statement_period(file)
+        statement_period_data, pages_read = extract_pdf_field_or_none(file, 'statement_period')
 
         if statement_period_data:
-            print(f"✅ STATEMENT PERIOD FOUND: {statement_period_data}")
+            logger.debug("✅ STATEMENT PERIOD FOUND: %s", statement_period_data)
         else:
-            print("❌ STATEMENT PERIOD NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ STATEMENT PERIOD NOT FOUND")
 
         return jsonify({
             'statement_period': statement_period_data,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_statement_period: {str(e)}")
+        logger.exception("❌ Error in extract_statement_period")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/extract-dob', methods=['POST'])
@@ -2099,30 +2807,33 @@ def extract_dob_endpoint():
         if file_ext not in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif', '.pdf']:
             return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
+        logger.debug("Processing file: %s", file.filename)
 
         # Determine file type for extract_dob function
         file_type = 'pdf' if file_ext == '.pdf' else 'image'
 
-        # Use extract_dob function
-        dob_data = extract_dob(file, file_type)
+        pages_read = None
+        if file_type == 'pdf':
+            dob_data, pages_read = extract_pdf_field_or_none(file, 'dob')
+        else:
+            dob_data = extract_dob(file, file_type)
 
         if dob_data:
-            print(f"✅ DOB FOUND: {dob_data}")
+            logger.debug("✅ DOB FOUND: %s", dob_data)
         else:
-            print("❌ DOB NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ DOB NOT FOUND")
 
         return jsonify({
             'dob': dob_data,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_dob: {str(e)}")
+        logger.exception("❌ Error in extract_dob")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/extract-formatted-text', methods=['POST'])
@@ -2154,9 +2865,101 @@ def extract_formatted_text():
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/extract-all', methods=['POST'])
+def extract_all():
+    """Endpoint to extract all (or a selected subset of) fields from one uploaded file in a single pass"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file uploaded'}), 400
+
+        file = request.files['file']
+
+        if file.filename == '':
+            return jsonify({'error': 'Empty filename'}), 400
+
+        file_ext = os.path.splitext(file.filename)[1].lower()
+
+        if file_ext not in IMAGE_EXTENSIONS and file_ext != '.pdf':
+            return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
+
+        # Optional comma-separated field selector, e.g. ?fields=pan_number,ifsc_code
+        fields, unknown_fields = parse_requested_fields(request.args.get('fields') or request.form.get('fields'))
+        if unknown_fields:
+            return jsonify({
+                'error': f"Unknown fields: {', '.join(unknown_fields)}",
+                'supported_fields': list(EXTRACT_ALL_FIELDS)
+            }), 400
+
+        logger.debug("Processing file: %s (fields: %s)", file.filename, ', '.join(fields))
+
+        results, pages_read = extract_all_fields(file, file_ext, fields)
+
+        response = dict(results)
+        response['filename'] = file.filename
+        response['file_type'] = file_ext
+        response['pages_read'] = pages_read
+        return jsonify(response), 200
+
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
+        logger.exception("❌ Error in extract_all")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """Endpoint to queue a background extraction job; poll GET /jobs/<job_id> for progress and results"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file uploaded'}), 400
+
+        file = request.files['file']
+
+        if file.filename == '':
+            return jsonify({'error': 'Empty filename'}), 400
+
+        file_ext = os.path.splitext(file.filename)[1].lower()
+
+        if file_ext not in IMAGE_EXTENSIONS and file_ext != '.pdf':
+            return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
+
+        fields, unknown_fields = parse_requested_fields(request.args.get('fields') or request.form.get('fields'))
+        if unknown_fields:
+            return jsonify({
+                'error': f"Unknown fields: {', '.join(unknown_fields)}",
+                'supported_fields': list(EXTRACT_ALL_FIELDS)
+            }), 400
+
+        job = JOB_MANAGER.submit(
+            run_extraction_job, file.read(), file_ext, fields,
+            metadata={'filename': file.filename, 'file_type': file_ext, 'fields': fields}
+        )
+
+        return jsonify({
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': f"/jobs/{job.id}"
+        }), 202
+
+    except OcrBusy as e:
+        return ocr_busy_response(e)
+    except Exception as e:
+        logger.exception("❌ Error in create_job")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Endpoint to poll a background extraction job's status, per-page progress and result"""
+    job = JOB_MANAGER.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    return jsonify(job), 200
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -2165,13 +2968,28 @@ def health_check():
     try:
         health['tesseract_available'] = TESSERACT_AVAILABLE
         health['tesseract_path'] = TESSERACT_PATH if TESSERACT_AVAILABLE else None
+        health['ocr_backend'] = OCR_ENGINE.name if OCR_ENGINE else None
     except NameError:
         # If variables are not set for some reason, report unknown
         health['tesseract_available'] = False
         health['tesseract_path'] = None
 
+    health['ocr_cache'] = OCR_CACHE.stats()
+    health['jobs'] = JOB_MANAGER.stats()
+    health['ocr_admission'] = OCR_ADMISSION.stats()
+    if isinstance(OCR_ENGINE, OcrWorkerPool):
+        pool = OCR_ENGINE.stats()
+        health['ocr_pool'] = pool
+        if pool['started'] and pool['alive'] == 0:
+            health['status'] = 'degraded'
+
     return jsonify(health), 200
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint: request and stage histograms, page source counters, OCR/cache/job gauges"""
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/extract-aadhar', methods=['POST'])
 def extract_aadhar():
     """Endpoint to extract Aadhaar number from uploaded file"""
@@ -2193,26 +3011,30 @@ def extract_aadhar():
         else:
             return jsonify({'error': f'Unsupported file type: {file_ext}'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"Processing file: {file.filename}")
-        print(f"{'='*60}")
+        logger.debug("Processing file: %s", file.filename)
 
-        aadhar_number = extract_aadhar_number(file, file_type)
+        pages_read = None
+        if file_type == 'pdf':
+            aadhar_number, pages_read = extract_pdf_field_or_none(file, 'aadhar_number')
+        else:
+            aadhar_number = extract_aadhar_number(file, file_type)
 
         if aadhar_number:
-            print(f"✅ AADHAAR NUMBER FOUND: {aadhar_number}")
+            logger.debug("✅ AADHAAR NUMBER FOUND: %s", aadhar_number)
         else:
-            print("❌ AADHAAR NUMBER NOT FOUND")
-        print(f"{'='*60}\n")
+            logger.debug("❌ AADHAAR NUMBER NOT FOUND")
 
         return jsonify({
             'aadhar_number': aadhar_number,
+            'pages_read': pages_read,
             'filename': file.filename,
             'file_type': file_ext
         }), 200
 
+    except OcrBusy as e:
+        return ocr_busy_response(e)
     except Exception as e:
-        print(f"❌ Error in extract_aadhar: {str(e)}")
+        logger.exception("❌ Error in extract_aadhar")
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
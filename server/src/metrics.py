@@ -0,0 +1,286 @@
+import bisect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers a regex pass over one page up to an 800 DPI OCR of a large scan
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (name, value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class Metrics:
+    """Counters, histograms and scrape-time gauges rendered in the Prometheus text format.
+
+    Counters and histograms are recorded as requests run (inc, observe, the
+    stage() timing hook); gauges come from callbacks evaluated at scrape time,
+    so in-flight OCR and cache sizes are read from the objects that own them.
+
+    Under gunicorn every worker process has its own Metrics. With `state_dir`
+    set, each process writes a snapshot there every `flush_interval` seconds
+    and render() merges the snapshots of all workers, so a scrape that lands
+    on any worker reports the whole server. Gauges of workers that have exited
+    are dropped; their counters and histograms are kept.
+    """
+
+    def __init__(self, state_dir=None, flush_interval=5.0):
+        self.state_dir = state_dir
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._descriptions = {}
+        self._counters = {}
+        self._histograms = {}
+        self._gauge_callbacks = []
+        # Last value seen per counter series reported by a callback
+        self._callback_totals = {}
+        self._stage_listeners = []
+        self._dirty = False
+        self._flusher_pid = None
+
+        if self.state_dir:
+            try:
+                os.makedirs(self.state_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"⚠️  Per-worker metrics disabled, cannot use {self.state_dir}: {e}")
+                self.state_dir = None
+
+    def describe(self, name, kind, help_text, buckets=DEFAULT_BUCKETS, merge='sum'):
+        """Declare a metric: kind is 'counter', 'histogram' or 'gauge'; merge is how gauges combine across workers ('sum' or 'max')"""
+        self._descriptions[name] = {'kind': kind, 'help': help_text, 'buckets': tuple(buckets), 'merge': merge}
+
+    def gauge_callback(self, fn):
+        """Register fn() -> iterable of (name, labels dict, value), evaluated on every scrape and flush.
+
+        A callback can also report totals another object keeps (cache hits,
+        admissions) for metrics declared as counters. Those go into the counter
+        store as the increase since the last sample, so like every other
+        counter they outlive the worker that counted them.
+        """
+        self._gauge_callbacks.append(fn)
+        return fn
+
+    def add_stage_listener(self, fn):
+        """Also pass every stage() duration to fn(stage, seconds), e.g. for per-request logging"""
+        self._stage_listeners.append(fn)
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+            self._dirty = True
+        self._ensure_flusher()
+
+    def observe(self, name, value, **labels):
+        buckets = self._descriptions[name]['buckets']
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                histogram = self._histograms[key] = [0] * (len(buckets) + 1) + [0.0, 0]
+            histogram[bisect.bisect_left(buckets, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+            self._dirty = True
+        self._ensure_flusher()
+
+    @contextmanager
+    def stage(self, stage):
+        """Time the enclosed block into ocr_stage_duration_seconds{stage=...}, also when it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.observe('ocr_stage_duration_seconds', elapsed, stage=stage)
+            for listener in self._stage_listeners:
+                listener(stage, elapsed)
+
+    def timed_stage(self, stage):
+        """Decorator form of stage() for wrapping an existing helper"""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _sample_callbacks(self):
+        """Evaluate the callbacks: returns the gauge values, and adds counter values to the counter store"""
+        gauges = []
+        for callback in self._gauge_callbacks:
+            try:
+                values = list(callback())
+            except Exception as e:
+                logger.warning(f"⚠️  Metrics gauge callback failed: {e}")
+                continue
+            for name, labels, value in values:
+                if self._descriptions.get(name, {}).get('kind') != 'counter':
+                    gauges.append([name, dict(labels), value])
+                    continue
+                key = (name, _label_key(labels))
+                with self._lock:
+                    last = self._callback_totals.get(key, 0)
+                    # A total that went down was reset by its owner; all of `value` is new
+                    increase = value - last if value >= last else value
+                    self._callback_totals[key] = value
+                    if increase:
+                        self._counters[key] = self._counters.get(key, 0) + increase
+                        self._dirty = True
+        return gauges
+
+    def snapshot(self):
+        """This process's counters, histograms and current gauge values as JSON-able lists"""
+        gauges = self._sample_callbacks()
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'counters': [[name, list(key), value] for (name, key), value in self._counters.items()],
+                'histograms': [[name, list(key), list(values)] for (name, key), values in self._histograms.items()],
+                'gauges': gauges,
+            }
+
+    def flush(self):
+        """Write this process's snapshot to state_dir for the other workers' scrapes, returning it"""
+        with self._lock:
+            self._dirty = False
+        snapshot = self.snapshot()
+        if not self.state_dir:
+            return snapshot
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.state_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, os.path.join(self.state_dir, f"{snapshot['pid']}.json"))
+        except OSError as e:
+            logger.warning(f"⚠️  Could not write metrics snapshot: {e}")
+        return snapshot
+
+    def render(self):
+        """Prometheus text exposition of all metrics, merged across workers when state_dir is set"""
+        snapshots = [self.flush()]
+        if self.state_dir:
+            snapshots += self._other_snapshots(snapshots[0]['pid'])
+
+        counters, histograms, gauges = {}, {}, {}
+        for snapshot in snapshots:
+            live = snapshot is snapshots[0] or _pid_alive(snapshot['pid'])
+            for name, key, value in snapshot['counters']:
+                key = (name, tuple(map(tuple, key)))
+                counters[key] = counters.get(key, 0) + value
+            for name, key, values in snapshot['histograms']:
+                key = (name, tuple(map(tuple, key)))
+                merged = histograms.setdefault(key, [0] * len(values))
+                for i, value in enumerate(values):
+                    merged[i] += value
+            if live:
+                for name, labels, value in snapshot['gauges']:
+                    key = (name, _label_key(labels))
+                    if key in gauges and self._descriptions.get(name, {}).get('merge') == 'max':
+                        gauges[key] = max(gauges[key], value)
+                    else:
+                        gauges[key] = gauges.get(key, 0) + value
+
+        lines = []
+        for name, description in self._descriptions.items():
+            kind = description['kind']
+            source = {'histogram': histograms, 'gauge': gauges}.get(kind, counters)
+            series = sorted((key, value) for (metric, key), value in source.items() if metric == name)
+            lines.append(f"# HELP {name} {description['help']}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, value in series:
+                if kind != 'histogram':
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(description['buckets'] + (float('inf'),), value):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(value[-2])}")
+                lines.append(f"{name}_count{_format_labels(key)} {value[-1]}")
+        return '\n'.join(lines) + '\n'
+
+    def _other_snapshots(self, own_pid):
+        snapshots = []
+        try:
+            names = os.listdir(self.state_dir)
+        except OSError:
+            return snapshots
+        for name in names:
+            if not name.endswith('.json') or name == f"{own_pid}.json":
+                continue
+            try:
+                with open(os.path.join(self.state_dir, name), 'r', encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def _ensure_flusher(self):
+        # One background flusher per process; started lazily because threads do not survive fork
+        if not self.state_dir or self._flusher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            # Totals kept by other objects change without inc(); pick them up too
+            self._sample_callbacks()
+            if self._dirty:
+                self.flush()
+
+
+def clear_state_dir(state_dir):
+    """Remove snapshots left by a previous server run (called once from the gunicorn master)"""
+    if not state_dir or not os.path.isdir(state_dir):
+        return
+    for name in os.listdir(state_dir):
+        if name.endswith(('.json', '.tmp')):
+            try:
+                os.remove(os.path.join(state_dir, name))
+            except OSError:
+                pass
@@ -0,0 +1,196 @@
+"""OCR engines behind one interface, selected in main.py by OCR_BACKEND.
+
+PytesseractBackend is the original path: pytesseract starts a tesseract
+process per call, writes the image to a temp file and loads the language
+model again every time. TesserocrBackend calls libtesseract in-process
+through the tesserocr bindings (pip install tesserocr) and keeps initialized
+engines in a pool, so the model is loaded once per engine and images are
+passed in memory.
+
+Both take tesseract CLI style configs ('--oem 3 --psm 6') and return the same
+shapes as pytesseract: image_to_string -> str, image_to_data -> dict of
+per-word lists like pytesseract.Output.DICT.
+
+Neither compresses page images on the way to Tesseract: pytesseract is made
+to write an uncompressed PNM temp file instead of a PNG, and tesserocr gets
+the raw pixel buffer.
+"""
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Image modes tesserocr gets as raw pixels, with their bytes per pixel (0: packed 1-bit, 1 = white)
+RAW_IMAGE_MODES = {'1': 0, 'L': 1, 'RGB': 3}
+
+DATA_KEYS = ('level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+             'left', 'top', 'width', 'height', 'conf', 'text')
+
+
+def parse_config(config):
+    """(oem, psm, variables) from a tesseract CLI style config; None where not given"""
+    oem = psm = None
+    variables = []
+    tokens = (config or '').split()
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        value = tokens[i + 1] if i + 1 < len(tokens) else None
+        if token in ('--oem', '--psm') and value is not None:
+            if token == '--oem':
+                oem = int(value)
+            else:
+                psm = int(value)
+            i += 2
+            continue
+        if token == '-c' and value is not None and '=' in value:
+            variables.append(tuple(value.split('=', 1)))
+            i += 2
+            continue
+        raise ValueError(f"Unsupported tesseract config option: {token}")
+    return oem, psm, tuple(variables)
+
+
+class PytesseractBackend:
+    """One tesseract process per call through pytesseract"""
+
+    name = 'pytesseract'
+
+    def __init__(self, pytesseract_module):
+        self._pytesseract = pytesseract_module
+
+    def version(self):
+        return str(self._pytesseract.get_tesseract_version())
+
+    def image_to_string(self, image, config=''):
+        return self._pytesseract.image_to_string(_as_pnm(image), config=config)
+
+    def image_to_data(self, image, config=''):
+        return self._pytesseract.image_to_data(
+            _as_pnm(image), config=config, output_type=self._pytesseract.Output.DICT
+        )
+
+
+def _as_pnm(image):
+    """Image for pytesseract to write as an uncompressed PNM temp file instead of PNG (or a JPEG re-encode of an upload)"""
+    if image.mode not in ('1', 'L', 'RGB'):
+        return image
+    # pytesseract picks the temp file format from image.format. Set it on a second Image over the
+    # same pixels (no copy), not on the caller's image, which may be cached or saved again later.
+    image.load()
+    handoff = image._new(image.im)
+    handoff.format = 'PPM'
+    return handoff
+
+
+class TesserocrBackend:
+    """In-process libtesseract through tesserocr, with a pool of initialized engines.
+
+    A tesserocr API object is not thread-safe, so each call takes an idle
+    engine from the pool (creating one if there is none) and returns it
+    afterwards. OCR admission bounds how many pages run at once, which bounds
+    how many engines (each holding its own copy of the model) are created.
+    Engines are keyed by OEM and -c variables since those are fixed at init;
+    the page segmentation mode is set per call.
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, tessdata_path, lang='eng'):
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        self.lang = lang
+        # tesserocr wants the tessdata directory with a trailing separator
+        self.tessdata_path, languages = tesserocr.get_languages(os.path.join(tessdata_path, ''))
+        if lang not in languages:
+            raise RuntimeError(f"Tesseract language '{lang}' not found in {self.tessdata_path}")
+        self._lock = threading.Lock()
+        self._idle = {}
+        self.engines_created = 0
+
+    def version(self):
+        return self._tesserocr.tesseract_version().split('\n', 1)[0].replace('tesseract ', '')
+
+    def image_to_string(self, image, config=''):
+        with self._engine(image, config) as api:
+            return api.GetUTF8Text()
+
+    def image_to_data(self, image, config=''):
+        RIL = self._tesserocr.RIL
+        data = {key: [] for key in DATA_KEYS}
+        with self._engine(image, config) as api:
+            api.Recognize()
+            iterator = api.GetIterator()
+            if iterator is None:
+                return data
+            block = par = line = word = 0
+            for result in self._tesserocr.iterate_level(iterator, RIL.WORD):
+                # Rebuild pytesseract's 1-based block/paragraph/line/word numbering
+                if result.IsAtBeginningOf(RIL.BLOCK):
+                    block, par, line, word = block + 1, 0, 0, 0
+                if result.IsAtBeginningOf(RIL.PARA):
+                    par, line, word = par + 1, 0, 0
+                if result.IsAtBeginningOf(RIL.TEXTLINE):
+                    line, word = line + 1, 0
+                word += 1
+                box = result.BoundingBox(RIL.WORD) or (0, 0, 0, 0)
+                row = {
+                    'level': 5, 'page_num': 1, 'block_num': block, 'par_num': par, 'line_num': line,
+                    'word_num': word, 'left': box[0], 'top': box[1],
+                    'width': box[2] - box[0], 'height': box[3] - box[1],
+                    'conf': result.Confidence(RIL.WORD),
+                    'text': result.GetUTF8Text(RIL.WORD) or '',
+                }
+                for key in DATA_KEYS:
+                    data[key].append(row[key])
+        return data
+
+    @contextmanager
+    def _engine(self, image, config):
+        """Lend a pooled engine set up for one image"""
+        oem, psm, variables = parse_config(config)
+        key, api = self._acquire(oem, variables)
+        try:
+            # tesseract's command line defaults to PSM 3 (fully automatic page segmentation)
+            api.SetPageSegMode(self._tesserocr.PSM.AUTO if psm is None else psm)
+            bytes_per_pixel = RAW_IMAGE_MODES.get(image.mode)
+            if bytes_per_pixel is not None:
+                # Raw pixels; SetImage would encode a BMP for leptonica to decode. Tesseract
+                # does not copy the buffer, so `pixels` must live until recognition is done.
+                pixels = image.tobytes()
+                bytes_per_line = image.width * bytes_per_pixel or (image.width + 7) // 8
+                api.SetImageBytes(pixels, image.width, image.height, bytes_per_pixel, bytes_per_line)
+            else:
+                api.SetImage(image)
+            dpi = image.info.get('dpi')
+            if dpi and dpi[0]:
+                api.SetSourceResolution(int(dpi[0]))
+            yield api
+        finally:
+            self._release(key, api)
+
+    def _acquire(self, oem, variables):
+        key = (oem, variables)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return key, idle.pop()
+        api = self._tesserocr.PyTessBaseAPI(
+            path=self.tessdata_path, lang=self.lang,
+            oem=self._tesserocr.OEM.DEFAULT if oem is None else oem,
+        )
+        for name, value in variables:
+            api.SetVariable(name, value)
+        with self._lock:
+            self.engines_created += 1
+        logger.info(f"Tesseract engine #{self.engines_created} loaded (oem {oem}, lang {self.lang})")
+        return key, api
+
+    def _release(self, key, api):
+        api.Clear()
+        with self._lock:
+            self._idle.setdefault(key, []).append(api)
+
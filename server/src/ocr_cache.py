@@ -0,0 +1,166 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class OcrCache:
+    """Two-tier cache for OCR results: in-memory LRU plus an optional size-bounded on-disk tier.
+
+    Keys are built from the SHA-256 of the uploaded file plus everything that
+    changes the OCR output (page, resolution, Tesseract config, post-processing),
+    so byte-identical resubmissions skip rasterization and Tesseract entirely.
+    """
+
+    def __init__(self, max_entries=256, disk_dir=None, disk_max_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+            except OSError as e:
+                logger.warning(f"⚠️  OCR disk cache disabled, cannot use {self.disk_dir}: {e}")
+                self.disk_dir = None
+
+    @staticmethod
+    def make_key(doc_hash, page_number, resolution, config, uppercase):
+        """Build a cache key from the document hash and every OCR setting that affects the text"""
+        raw = f"{doc_hash}|{page_number}|{resolution}|{config}|{'upper' if uppercase else 'raw'}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return cached text for key, or None on a miss"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+        text = self._disk_get(key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._memory_put(key, text)
+        return text
+
+    def put(self, key, text):
+        """Store text under key in both tiers"""
+        with self._lock:
+            self._memory_put(key, text)
+        self._disk_put(key, text)
+
+    def stats(self):
+        """Hit/miss counters and sizes for the health endpoint"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'memory_max_entries': self.max_entries,
+                'disk_enabled': bool(self.disk_dir),
+                'disk_bytes': self._disk_bytes,
+                'disk_max_bytes': self.disk_max_bytes if self.disk_dir else 0,
+            }
+
+    def _memory_put(self, key, text):
+        # Caller holds self._lock
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.txt")
+
+    def _disk_entries(self):
+        """Yield (path, mtime, size) for every cached file on disk"""
+        for entry in os.scandir(self.disk_dir):
+            if entry.is_file() and entry.name.endswith('.txt'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                yield entry.path, stat.st_mtime, stat.st_size
+
+    def _disk_get(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            # Refresh mtime so eviction removes the least recently used files first
+            os.utime(path)
+            return text
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"⚠️  OCR disk cache read failed: {e}")
+            return None
+
+    def _disk_put(self, key, text):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        data = text.encode('utf-8')
+        if len(data) > self.disk_max_bytes:
+            return
+        try:
+            # Write to a temp file and rename so concurrent workers never read a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            existing = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️  OCR disk cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._disk_bytes += len(data) - existing
+            over_budget = self._disk_bytes > self.disk_max_bytes
+        if over_budget:
+            self._disk_evict()
+
+    def _disk_evict(self):
+        """Delete least recently used files until the disk tier is back under its size budget"""
+        try:
+            entries = sorted(self._disk_entries(), key=lambda e: e[1])
+        except OSError as e:
+            logger.warning(f"⚠️  OCR disk cache eviction failed: {e}")
+            return
+
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                total -= size
+            except OSError:
+                continue
+
+        with self._lock:
+            self._disk_bytes = total
@@ -0,0 +1,286 @@
+"""Long-lived OCR worker processes with a warm Tesseract engine (OCR_BACKEND=pool).
+
+Each worker process initializes a tesserocr engine once at start-up and OCRs
+a blank image so the language model is loaded before the first request. Page
+images reach it over a pipe as raw pixel bytes, with no temp file or PNG
+encoding, and the text or word data comes back the same way.
+
+The pool replaces a worker that stops answering health-check pings, that
+dies, or that times out on a page. It also recycles a worker after about
+`max_pages` pages, to cap memory that libtesseract leaks over time.
+Recycling happens in the background; the pool runs one worker short until
+the new one is warm.
+
+Workers are started with the 'spawn' method: they never inherit the web
+server's threads or sockets, and a crash in libtesseract only takes down that
+worker, not the server. As with any spawned process, a script that uses the
+pool must keep its own top-level work under `if __name__ == '__main__'`.
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import signal
+import threading
+import time
+
+from PIL import Image
+
+from ocr_backend import TesserocrBackend
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_CONFIG = r'--oem 3 --psm 6'
+# Modes that survive tobytes/frombytes and that tesseract reads directly
+PIPE_IMAGE_MODES = ('1', 'L', 'RGB', 'RGBA')
+
+
+def _worker_main(conn, tessdata_path, lang):
+    """Worker process loop: warm up the engine, then answer ping / OCR requests until told to stop"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        engine = TesserocrBackend(tessdata_path, lang)
+        engine.image_to_string(Image.new('L', (200, 50), 255), WARM_UP_CONFIG)
+        conn.send(('ready', engine.version()))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+        return
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        op = message[0]
+        if op == 'stop':
+            return
+        if op == 'ping':
+            conn.send(('pong',))
+            continue
+
+        _, method, mode, size, dpi, config = message
+        try:
+            image = Image.frombytes(mode, size, conn.recv_bytes())
+            if dpi:
+                image.info['dpi'] = dpi
+            conn.send(('ok', getattr(engine, method)(image, config)))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+
+
+class OcrWorker:
+    """Parent-side handle of one OCR worker process"""
+
+    def __init__(self, pool, number):
+        self.pool = pool
+        self.number = number
+        self.process = None
+        self.conn = None
+        self.pages = 0
+        self.page_limit = 0
+        self.version = None
+
+    def start(self):
+        parent_conn, child_conn = self.pool.context.Pipe()
+        self.process = self.pool.context.Process(
+            target=_worker_main,
+            args=(child_conn, self.pool.tessdata_path, self.pool.lang),
+            name=f"ocr-worker-{self.number}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.pages = 0
+        # Jitter so workers started together are not all recycled at the same moment
+        limit = self.pool.max_pages
+        self.page_limit = limit + random.randint(0, limit // 10) if limit else 0
+
+        status, detail = self._receive(self.pool.start_timeout)
+        if status != 'ready':
+            self.stop()
+            raise RuntimeError(f"OCR worker {self.number} failed to start: {detail}")
+        self.version = detail
+
+    def stop(self):
+        if self.conn is not None:
+            try:
+                self.conn.send(('stop',))
+            except (OSError, ValueError):
+                pass
+            self.conn.close()
+            self.conn = None
+        if self.process is not None:
+            self.process.join(2)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(2)
+            self.process = None
+
+    def ping(self, timeout):
+        try:
+            self.conn.send(('ping',))
+            return self._receive(timeout)[0] == 'pong'
+        except (OSError, EOFError, TimeoutError, ValueError):
+            return False
+
+    def call(self, method, image, config):
+        if image.mode not in PIPE_IMAGE_MODES:
+            image = image.convert('RGB')
+        self.conn.send(('ocr', method, image.mode, image.size, image.info.get('dpi'), config))
+        self.conn.send_bytes(image.tobytes())
+        status, result = self._receive(self.pool.page_timeout)
+        self.pages += 1
+        if status != 'ok':
+            raise RuntimeError(f"OCR worker {self.number}: {result}")
+        return result
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def _receive(self, timeout):
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"OCR worker {self.number} did not answer within {timeout}s")
+        return self.conn.recv()
+
+
+class OcrWorkerPool:
+    """Same interface as the ocr_backend engines, served by a pool of warm OCR worker processes"""
+
+    name = 'pool'
+
+    def __init__(self, size, tessdata_path, lang='eng', max_pages=500, page_timeout=120,
+                 start_timeout=60, health_interval=30):
+        # Fails here, in the server process, if tesserocr or the language data is missing
+        TesserocrBackend(tessdata_path, lang)
+        self.size = size
+        self.tessdata_path = tessdata_path
+        self.lang = lang
+        self.max_pages = max_pages
+        self.page_timeout = page_timeout
+        self.start_timeout = start_timeout
+        self.health_interval = health_interval
+        self.context = multiprocessing.get_context('spawn')
+        self._lock = threading.Lock()
+        self._idle = queue.Queue()
+        self._workers = []
+        self._started_pid = None
+        self._version = None
+        self.restarts = 0
+        self.recycled = 0
+        self.failed_health_checks = 0
+
+    def start(self):
+        """Start and warm up every worker, then the health checker; safe to call more than once"""
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            # Pipes to workers started before a fork belong to the parent; this process starts its own
+            self._idle = queue.Queue()
+            self._workers = []
+            self._started_pid = os.getpid()
+        started = time.perf_counter()
+        for number in range(1, self.size + 1):
+            worker = OcrWorker(self, number)
+            self._workers.append(worker)
+            try:
+                worker.start()
+            except Exception as e:
+                logger.error(f"❌ {e}")
+                self._replace(worker, recycled=False)
+                continue
+            self._version = worker.version
+            self._idle.put(worker)
+        threading.Thread(target=self._health_loop, name='ocr-pool-health', daemon=True).start()
+        logger.info(
+            f"✅ {self._idle.qsize()} of {self.size} OCR worker processes warm in {time.perf_counter() - started:.1f}s "
+            f"(Tesseract {self._version})"
+        )
+
+    def stop(self):
+        for worker in self._workers:
+            worker.stop()
+
+    def version(self):
+        self.start()
+        return self._version
+
+    def image_to_string(self, image, config=''):
+        return self._call('image_to_string', image, config)
+
+    def image_to_data(self, image, config=''):
+        return self._call('image_to_data', image, config)
+
+    def stats(self):
+        """Worker liveness, page counts and restart counters for /health and /metrics"""
+        return {
+            'size': self.size,
+            'started': self._started_pid == os.getpid(),
+            'alive': sum(1 for worker in self._workers if worker.alive),
+            'idle': self._idle.qsize(),
+            'pages_per_worker': [worker.pages for worker in self._workers],
+            'restarts': self.restarts,
+            'recycled': self.recycled,
+            'failed_health_checks': self.failed_health_checks,
+        }
+
+    def _call(self, method, image, config):
+        self.start()
+        try:
+            worker = self._idle.get(timeout=self.page_timeout)
+        except queue.Empty:
+            raise RuntimeError(f"No OCR worker became free within {self.page_timeout}s")
+        try:
+            result = worker.call(method, image, config)
+        except (OSError, EOFError, TimeoutError) as e:
+            # Dead, hung or crashed mid-page: replace it and fail this page only
+            logger.warning(f"⚠️  OCR worker {worker.number} failed ({e}); restarting it")
+            self._replace(worker, recycled=False)
+            raise RuntimeError(f"OCR worker {worker.number} failed: {e}")
+        except Exception:
+            self._idle.put(worker)
+            raise
+        if worker.page_limit and worker.pages >= worker.page_limit:
+            self._replace(worker, recycled=True)
+        else:
+            self._idle.put(worker)
+        return result
+
+    def _replace(self, worker, recycled):
+        """Restart a worker in the background and return it to the pool once it is warm"""
+        def restart():
+            worker.stop()
+            while True:
+                try:
+                    worker.start()
+                    break
+                except Exception as e:
+                    logger.error(f"❌ OCR worker {worker.number} restart failed: {e}")
+                    time.sleep(5)
+            with self._lock:
+                if recycled:
+                    self.recycled += 1
+                else:
+                    self.restarts += 1
+            self._idle.put(worker)
+
+        threading.Thread(target=restart, name=f"ocr-worker-{worker.number}-restart", daemon=True).start()
+
+    def _health_loop(self):
+        while True:
+            time.sleep(self.health_interval)
+            # Only idle workers are pinged; busy ones prove themselves by answering their page
+            for _ in range(self._idle.qsize()):
+                try:
+                    worker = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                if worker.alive and worker.ping(timeout=5):
+                    self._idle.put(worker)
+                    continue
+                with self._lock:
+                    self.failed_health_checks += 1
+                logger.warning(f"⚠️  OCR worker {worker.number} failed its health check; restarting it")
+                self._replace(worker, recycled=False)
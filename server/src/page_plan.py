@@ -0,0 +1,73 @@
+"""Which PDF pages to read, and in what order, for a set of requested fields.
+
+Every field has a page order, its likeliest page first:
+
+    first       page 1 (header fields: PAN, IFSC, customer ID, ...)
+    first_last  page 1, then the last page (opening balance)
+    last_first  the last page, then page 1 (closing balance)
+    all         every page from the first (DOB and Aadhaar in KYC bundles)
+
+A PagePlan hands out the pages in steps. Each step gives every unresolved
+field its next page (its next `wave` pages for 'all'), so a field's later
+pages are read only while it is still missing. Fields found early stop
+asking for pages. `extra_pages` lets the first/last orders go on to the
+pages nearest their likeliest page before giving up.
+"""
+
+PAGE_ORDERS = ('first', 'first_last', 'last_first', 'all')
+
+
+def page_order(order, page_count, extra_pages=0):
+    """Page indexes a field with this order searches, likeliest first"""
+    if order not in PAGE_ORDERS:
+        raise ValueError(f"Unknown page order: {order}")
+    if page_count == 0:
+        return []
+    if order == 'all':
+        return list(range(page_count))
+
+    last = page_count - 1
+    pages = {'first': [0], 'first_last': [0, last], 'last_first': [last, 0]}[order]
+    pages = list(dict.fromkeys(pages))
+    if extra_pages:
+        # Then the pages closest to the likeliest one: onwards from page 1, back from the last page
+        rest = sorted((index for index in range(page_count) if index not in pages), key=lambda i: abs(i - pages[0]))
+        pages += rest[:extra_pages]
+    return pages
+
+
+class PagePlan:
+    """Pages each requested field is still to search, handed out a step at a time"""
+
+    def __init__(self, page_count, field_orders, extra_pages=0, wave=1):
+        self.page_count = page_count
+        self.orders = dict(field_orders)
+        self.remaining = {
+            field: page_order(order, page_count, extra_pages) for field, order in field_orders.items()
+        }
+        self.searched = {field: [] for field in field_orders}
+        self.resolved = set()
+        # Pages per step for 'all' fields (None: every page in one step)
+        self.wave = wave
+
+    def next_step(self):
+        """{field: page indexes to search next} for every unresolved field that has pages left"""
+        step = {}
+        for field, pages in self.remaining.items():
+            if field in self.resolved or not pages:
+                continue
+            count = (self.wave or len(pages)) if self.orders[field] == 'all' else 1
+            step[field] = pages[:count]
+        return step
+
+    def searched_pages(self, field, indexes):
+        """Record that field was searched on indexes; returns every page it has been searched on, in order"""
+        self.remaining[field] = [index for index in self.remaining[field] if index not in indexes]
+        self.searched[field].extend(indexes)
+        return self.searched[field]
+
+    def exhausted(self, field):
+        return not self.remaining[field]
+
+    def resolve(self, field):
+        self.resolved.add(field)
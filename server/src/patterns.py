@@ -0,0 +1,481 @@
+"""Compiled regular expressions for the field extractors in main.py.
+
+Every pattern is compiled once at import time instead of on each call, so
+extraction never goes through re's compile cache (which is bounded and shared
+with every other library in the process). Patterns are grouped by the field
+they extract; the extractors in main.py keep the matching logic.
+"""
+import re
+from functools import lru_cache
+
+
+# --- Date of birth ---
+
+# Priority order: most specific to least specific
+DOB_DATE_FORMATS = [
+    # dd-mm-yyyy (with various separators)
+    (r'\b(\d{2})[-/.](\d{2})[-/.](\d{4})\b', 'dd-mm-yyyy'),
+    # dd-mm-yy
+    (r'\b(\d{2})[-/.](\d{2})[-/.](\d{2})\b', 'dd-mm-yy'),
+    # yyyy-mm-dd (ISO format)
+    (r'\b(\d{4})[-/.](\d{2})[-/.](\d{2})\b', 'yyyy-mm-dd'),
+    # dd month yyyy (e.g., 15 August 1990)
+    (r'\b(\d{1,2})\s+(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[,\s]+(\d{4})\b', 'dd-month-yyyy'),
+    # month dd, yyyy (e.g., August 15, 1990)
+    (r'\b(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2})[,\s]+(\d{4})\b', 'month-dd-yyyy'),
+]
+
+# Common DOB keywords to look for context
+DOB_KEYWORDS = [
+    r'date\s+of\s+birth',
+    r'dob',
+    r'birth\s+date',
+    r'date\s+of\s+brith',  # common typo
+    r'born',
+    r'd\.?o\.?b\.?',
+]
+
+# (date regex, format) pairs in priority order
+DOB_DATES = [(re.compile(pattern, re.IGNORECASE), format_type) for pattern, format_type in DOB_DATE_FORMATS]
+
+# Keyword followed by a date within 50 characters: (combined regex, date regex, format),
+# keyword-major so the search order matches the original nested loops
+DOB_WITH_CONTEXT = [
+    (re.compile(rf'(?i){keyword}[:\s]{{0,50}}' + pattern, re.IGNORECASE), date_regex, format_type)
+    for keyword in DOB_KEYWORDS
+    for (pattern, format_type), (date_regex, _) in zip(DOB_DATE_FORMATS, DOB_DATES)
+]
+
+DATE_PART_SEPARATOR = re.compile(r'[-/.]')
+
+# --- Aadhaar number ---
+
+AADHAR_GROUPED = re.compile(r'\b(\d{4})\s+(\d{4})\s+(\d{4})\b')
+
+AADHAR_FLEX_SPACING = re.compile(r'\b(\d{4})\s{1,5}(\d{4})\s{1,5}(\d{4})\b')
+
+AADHAR_NEAR_UID = re.compile(
+    r'(?i)(?:uid|uidai|enrollment|enrolment|aadhaar|aadhar)[\s:]*'
+    r'(\d{4})\s+(\d{4})\s+(\d{4})(?:\s+(\d{4}))?',
+    re.IGNORECASE
+)
+
+AADHAR_12_DIGITS = re.compile(r'\b(\d{12})\b')
+
+
+# --- PAN ---
+
+PAN_LABELED = re.compile(
+    r'(?i)\b(?:pan(?:\s*(?:no\.?|number)?)?)\b[:\-\s]*'
+    r'([A-Z]{3}[ABCFGHLJPTK][A-Z]\s*[0-9]{4}\s*[A-Z])',
+    re.IGNORECASE
+)
+
+PAN_GENERIC = re.compile(
+    r'\b(?<![A-Za-z])'
+    r'[A-Z]{3}'
+    r'[ABCFGHLJPTK]'
+    r'[A-Z]'
+    r'\s*'
+    r'[0-9]{4}'
+    r'\s*'
+    r'[A-Z]'
+    r'(?![A-Za-z0-9])\b',
+    re.IGNORECASE
+)
+
+
+# --- Opening / closing balance ---
+
+OPENING_BALANCE_LABELED = re.compile(
+    r'(?i)(?:'
+    r'(opening\s+balance|openingbalance)(?:\s+amount)?'
+    r'|openingbal\.?'
+    r'|opening\s+ledger\s+balance|openingledgerbalance'
+    r'|opening\s+available\s+balance|openingavailablebalance'
+    r'|balance\s+brought\s+forward|balancebroughtforward'
+    r'|brought\s+forward(?:\s+balance)?|broughtforward(?:balance)?'
+    r'|balance\s+b/f|balanceb/f'
+    r'|b/f\s+balance|b/fbalance'
+    r'|opening\s+book\s+balance|openingbookbalance'
+    r')\s*[:\-]?\s*'
+    r'([0-9,]*\.?[0-9]+)\s*(?:\((?:CR|DR)\))?',
+    re.IGNORECASE
+)
+
+OPENING_BALANCE_HEADER = re.compile(
+    r'(?i)('
+    r'(opening\s+balance|openingbalance)(?:\s+amount)?'
+    r'|opening\s+bal\.?|openingbal\.?'
+    r'|opening\s+ledger\s+balance|openingledgerbalance'
+    r'|opening\s+available\s+balance|openingavailablebalance'
+    r'|balance\s+brought\s+forward|balancebroughtforward'
+    r'|brought\s+forward(?:\s+balance)?|broughtforward(?:balance)?'
+    r'|balance\s+b/f|balanceb/f'
+    r'|b/f\s+balance|b/fbalance'
+    r'|opening\s+book\s+balance|openingbookbalance'
+    r')',
+    re.IGNORECASE
+)
+
+OPENING_BALANCE_INLINE = re.compile(
+    r'(?i)(?:'
+    r'opening\s+balance(?:\s+amount)?|openingbalance(?:amount)?'
+    r'|opening\s+bal\.?|openingbal\.?'
+    r'|opening\s+ledger\s+balance|openingledgerbalance'
+    r'|opening\s+available\s+balance|openingavailablebalance'
+    r'|balance\s+brought\s+forward|balancebroughtforward'
+    r'|brought\s+forward(?:\s+balance)?|broughtforward(?:balance)?'
+    r'|balance\s+b/f|balanceb/f'
+    r'|b/f\s+balance|b/fbalance'
+    r'|opening\s+book\s+balance|openingbookbalance'
+    r')\s*[:\-]?\s*([0-9,]+\.?\d*)',
+    re.IGNORECASE
+)
+
+OPENING_BALANCE_GENERIC = re.compile(
+    r'(?i)(?:'
+    r'opening\s+balance(?:\s+amount)?|openingbalance(?:amount)?'
+    r'|opening\s+bal\.?|openingbal\.?'
+    r'|opening\s+ledger\s+balance|openingledgerbalance'
+    r'|opening\s+available\s+balance|openingavailablebalance'
+    r'|balance\s+brought\s+forward|balancebroughtforward'
+    r'|brought\s+forward(?:\s+balance)?|broughtforward(?:balance)?'
+    r'|balance\s+b/f|balanceb/f'
+    r'|b/f\s+balance|b/fbalance'
+    r'|opening\s+book\s+balance|openingbookbalance'
+    r')'
+    r'[\s\S]{0,50}?'  # Look ahead up to 50 characters
+    r'([0-9,]+\.?\d*)',
+    re.IGNORECASE
+)
+
+CLOSING_BALANCE_LABELED = re.compile(
+    r'(?:'
+    r'(?:closingbalance|closing\s+balance)(?:\s+amount)?'
+    r'|(?:closingbal|closing\s+bal\.?)'
+    r'|(?:closingledgerbalance|closing\s+ledger\s+balance)'
+    r'|(?:closingavailablebalance|closing\s+available\s+balance)'
+    r'|(?:balancecarriedforward|balance\s+carried\s+forward)'
+    r'|(?:carriedforward(?:balance)?|carried\s+forward(?:\s+balance)?)'
+    r'|(?:balancec/f|balance\s+c\/f)'
+    r'|(?:c/fbalance|c\/f\s+balance)'
+    r'|(?:bookclosingbalance|book\s+closing\s+balance)'
+    r')\s*[:\-]?\s*'
+    r'([0-9,]*\.?\d*)\s*(?:\((?:CR|DR)\))?',
+    re.IGNORECASE
+)
+
+CLOSING_BALANCE_HEADER = re.compile(
+    r'(closing\s*balance|closingbalance|closing\s*bal\.?|closingbal|closingledgerbalance|closing\s*ledger\s*balance|'
+    r'closingavailablebalance|closing\s*available\s*balance|balancecarriedforward|balance\s*carried\s*forward|'
+    r'carriedforward|carried\s*forward|balancec/f|balance\s*c/f|c/fbalance|c/f\s*balance|'
+    r'bookclosingbalance|book\s*closing\s*balance)',
+    re.IGNORECASE
+)
+
+CLOSING_BALANCE_INLINE = re.compile(
+    r'(?:'
+    r'(?:closingbalance|closing\s+balance)(?:\s+amount)?'
+    r'|(?:closingbal|closing\s+bal\.?)'
+    r'|(?:closingledgerbalance|closing\s+ledger\s+balance)'
+    r'|(?:closingavailablebalance|closing\s+available\s+balance)'
+    r'|(?:balancecarriedforward|balance\s+carried\s+forward)'
+    r'|(?:carriedforward(?:balance)?|carried\s+forward(?:\s+balance)?)'
+    r'|(?:balancec/f|balance\s+c\/f)'
+    r'|(?:c/fbalance|c\/f\s+balance)'
+    r'|(?:bookclosingbalance|book\s+closing\s+balance)'
+    r')\s+([0-9,]+\.?\d*)',
+    re.IGNORECASE
+)
+
+CLOSING_BALANCE_GENERIC = re.compile(
+    r'(?:'
+    r'(?:closing\s+balance|closingbalance)(?:\s+amount)?'
+    r'|(?:closingbal|closing\s+bal\.?)'
+    r'|(?:closing\s+ledger\s+balance|closingledgerbalance)'
+    r'|(?:closing\s+available\s+balance|closingavailablebalance)'
+    r'|(?:balance\s+carried\s+forward|balancecarriedforward)'
+    r'|(?:carried\s+forward(?:\s+balance)?|carriedforward(?:balance)?)'
+    r'|(?:balance\s+c\/f|balancec\/f|c\/f\s+balance|c\/fbalance)'
+    r'|(?:book\s+closing\s+balance|bookclosingbalance)'
+    r')'
+    r'[\s\S]{0,50}?'
+    r'([0-9,]+\.?\d*)',
+    re.IGNORECASE
+)
+
+# Value lines that start with a date ("AS ON 18-08-25 ...")
+BALANCE_DATE_LINE = re.compile(r'^\s*(?:AS\s+ON|DATE|ON)\s+\d', re.IGNORECASE)
+
+# Everything up to and including a leading time ("... 16:18:49 PM ")
+BALANCE_LEADING_TIMESTAMP = re.compile(r'^.*?(?:\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM)?)\s*', re.IGNORECASE)
+
+AMOUNT = re.compile(r'[0-9,]+\.?\d*')
+
+
+@lru_cache(maxsize=1024)
+def date_context_patterns(number_str):
+    """Patterns matching number_str inside a date or time; built per number, so memoized instead of precompiled"""
+    number = re.escape(number_str)
+    return (
+        re.compile(r'\b' + number + r'[-/:]\d{1,2}[-/:]\d{2,4}'),  # 18-08-25
+        re.compile(r'\d{1,2}[-/:]+' + number + r'[-/:]\d{2,4}'),  # 08-18-25
+        re.compile(r'\d{2,4}[-/:]\d{1,2}[-/:]+' + number + r'\b'),  # 2025-08-18
+        re.compile(r'\b' + number + r':\d{2}:\d{2}'),  # 18:10:49
+        re.compile(r'\d{1,2}:+' + number + r':\d{2}'),  # 16:18:49
+    )
+
+
+# --- Customer ID ---
+
+CUSTOMER_ID_LABELED = re.compile(
+    r'(?i)((?:'
+    r'customer\s*id'            # Customer ID
+    r'|cust\.?\s*id'            # Cust ID / Cust. ID
+    r'|customer\s*no\.?'        # Customer No / Customer No.
+    r'|customer\s*number'       # Customer Number
+    r'|cif\s*no\.?'             # CIF No / CIF No.
+    r'|cif\s*id'                # CIF ID
+    r'|cif\s*number'            # CIF Number
+    r'|user\s*id'               # User ID
+    r'|relationship\s*no\.?'    # Relationship No / Relationship No.
+    r'|cust\.?\s*reln\.?\s*no\.?' # Cust Reln No / Cust. Reln. No.
+    r'|crn'                     # CRN
+    r'|client\s*id'             # Client ID (added)
+    r'|customer\s*code'         # Customer Code (added)
+    r'|customer\s*no\.?\s*/\s*cif\s*id'  # Customer No/CIF ID
+    r'|cif\s*id\s*/\s*customer\s*no\.?'  # CIF ID/Customer No
+    r'|custid'                  # CustID
+    r'|client\s*no\.?'          # Client No
+    r'|user\s*no\.?'            # User No
+    r'|ckyc\s*id'               # CKYC ID
+    r'))\s*[:\-=\s/]*\s*([A-Za-z0-9\-/]+)(?=\s|$)'
+)
+
+CUSTOMER_ID_CUSTID = re.compile(r'(?i)custid\s*[:\-]?\s*([A-Za-z0-9]+)')
+
+
+# --- IFSC ---
+
+IFSC_LABELED = re.compile(
+    r'(?i)(?:ifsc(?:\s*code)?)\s*[:\-]?\s*([A-Z0-9]{4}0[A-Z0-9]{6})',
+    re.IGNORECASE
+)
+
+
+# --- Mobile number ---
+
+MOBILE_LABELED = re.compile(
+    r'(?i)((?:'
+    r'mobile\s*no\.?'                    # Mobile No / Mobile No.
+    r'|mobile\s*number'                  # Mobile Number
+    r'|phone\s*no\.?'                    # Phone No / Phone No.
+    r'|phone\s*number'                   # Phone Number
+    r'|contact\s*no\.?'                  # Contact No / Contact No.
+    r'|contact\s*number'                 # Contact Number
+    r'|registered\s*mobile\s*no\.?'      # Registered Mobile No
+    r'|registered\s*mobile\s*number'     # Registered Mobile Number
+    r'|registered\s*phone\s*no\.?'       # Registered Phone No
+    r'|registered\s*phone\s*number'      # Registered Phone Number
+    r'|registered\s*contact\s*no\.?'     # Registered Contact No
+    r'|registered\s*contact\s*number'    # Registered Contact Number
+    r'|tel\s*no\.?'                      # Tel No
+    r'|tel\s*number'                     # Tel Number
+    r'|cell\s*no\.?'                     # Cell No
+    r'|cell\s*number'                    # Cell Number
+    r'|sms\s*no\.?'                      # SMS No
+    r'|sms\s*number'                     # SMS Number
+    r'))\s*[:\-=\s/]*\s*([0-9xX*]+(?:[/,][0-9xX*]+)*)'    # Followed by digits, x, or *, possibly multiple separated by / or ,
+)
+
+MOBILE_PHONE_NUMBER_FALLBACK = re.compile(r'(?i)phone\s*number\s*[:\-]?\s*([0-9xX*/,\s]+?)(?=\W|$)')
+
+MOBILE_SEPARATORS = re.compile(r'[/,]')
+
+MOBILE_VALID_CHARS = re.compile(r'[0-9X*]')
+
+
+# --- Account number ---
+
+ACCOUNT_NUMBER_LABELED = re.compile(
+    r'(?i)((?:'
+    r'account\s*no\.?'                   # Account No / Account No.
+    r'|account\s*number'                 # Account Number
+    r'|acc\s*no\.?'                      # Acc No / Acc No.
+    r'|acc\s*number'                     # Acc Number
+    r'|account\s*id'                     # Account ID
+    r'|acc\s*id'                         # Acc ID
+    r'|bank\s*account\s*no\.?'           # Bank Account No
+    r'|bank\s*account\s*number'          # Bank Account Number
+    r'|saving\s*account\s*no\.?'         # Saving Account No
+    r'|saving\s*account\s*number'        # Saving Account Number
+    r'|current\s*account\s*no\.?'        # Current Account No
+    r'|current\s*account\s*number'       # Current Account Number
+    r'|a/c\s*no\.?'                      # A/C No
+    r'|a/c\s*number'                     # A/C Number
+    r'))\s*[:\-=\s/]*\s*([0-9\s\-/]+)'
+)
+
+ACCOUNT_NUMBER_FALLBACK = re.compile(r'\b(\d{8,18})\b')
+
+# Spaces, dashes and slashes inside account numbers and CKYC ids
+ID_SEPARATORS = re.compile(r'[\s\-/]')
+
+WHITESPACE = re.compile(r'\s+')
+
+
+# --- Email ---
+
+EMAIL_PLAIN = re.compile(
+    r'\b[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}\b',
+    re.IGNORECASE
+)
+
+EMAIL_LABELED = re.compile(
+    r'(?i)(?:'
+    r'email\s*(?:id|address)?'            # Email / Email ID / Email Address
+    r'|e-?mail\s*(?:id|address)?'         # E-mail / E-mail ID
+    r'|registered\s+e-?mail\s*(?:id|address)?'  # Registered Email
+    r'|contact\s+e-?mail'                 # Contact Email
+    r'|mail\s*(?:id|address)?'            # Mail / Mail ID
+    r')\s*[:\-=\s/]*\s*'
+    r'([a-zA-Z0-9._%+\-*]+@[a-zA-Z0-9.*\-]+(?:\.[a-zA-Z]{1,})?)',  # Allow partial domains
+    re.IGNORECASE
+)
+
+EMAIL_MASKED = re.compile(
+    r'\b[a-zA-Z0-9._%+\-*]+@[a-zA-Z0-9.*\-]+\.[a-zA-Z]{2,}\b',
+    re.IGNORECASE
+)
+
+EMAIL_SPACED = re.compile(
+    r'\b([a-zA-Z0-9._%+\-]+)\s*@\s*([a-zA-Z0-9.\-]+)\s*\.\s*([a-zA-Z]{2,})\b',
+    re.IGNORECASE
+)
+
+
+# --- CKYC ---
+
+CKYC_LABELED = re.compile(
+    r'(?i)\b(?:'
+    r'ckyc\s*(?:id|no\.?|number|identifier)?'  # CKYC, CKYC ID, CKYC No, etc.
+    r')\s*[:,\-=]\s*'  # ← CHANGED: Require at least one separator (colon, comma, dash, equals)
+    r'([A-Z0-9][A-Z0-9*\-/\s]{8,20})',  # Capture alphanumeric with *, -, /, spaces
+    re.IGNORECASE
+)
+
+CKYC_14_DIGITS = re.compile(
+    r'(?i)\bckyc\b[:\s\-]+([0-9*]{14})',  # ← CHANGED: Require at least one separator
+    re.IGNORECASE
+)
+
+CKYC_GENERIC = re.compile(
+    r'(?i)ckyc[:\-=]+([A-Z0-9*\-/]{10,20})',  # ← CHANGED: Require at least one separator
+    re.IGNORECASE
+)
+
+CKYC_STANDALONE = re.compile(r'\b([0-9*]{14})\b')
+
+
+# --- Account type ---
+
+ACCOUNT_TYPE_LABELED = re.compile(
+    r'(?i)((?:'
+    r'account\s*type'                    # Account Type
+    r'|a/c\s*type'                       # A/c Type
+    r'|a\.c\.?\s*type'                   # A.C. Type / A.C Type
+    r'|type\s*of\s*account'              # Type of Account
+    r'|ac\s*type'                        # Ac Type
+    r'|account\s*category'               # Account Category
+    r'|a/c\s*category'                   # A/c Category
+    r'|acct\s*type'                      # Acct Type
+    r'|scheme\s*type'                    # Scheme Type
+    r'|scheme\s*code'                    # Scheme Code
+    r'|scheme'                           # Scheme
+    r'|product\s*type'                   # Product Type
+    r'|product\s*code'                   # Product Code
+    r'|relationship\s*type'              # Relationship Type
+    r'|relation\s*type'                  # Relation Type
+    r'|customer\s*relationship'          # Customer Relationship
+    r'|customer\s*relation\s*type'       # Customer Relation Type
+    r'|mode\s*of\s*operation'            # Mode of Operation
+    r'|operating\s*type'                 # Operating Type
+    r'|operative\s*type'                 # Operative Type
+    r'|a/c\s*operation'                  # A/c Operation
+    r'|account\s*operation\s*mode'       # Account Operation Mode
+    r'|operation\s*mode'                 # Operation Mode
+    r'))\s*[:\-=\s/]*\s*([A-Za-z0-9\s\-/]+)(?=\s|$)'
+)
+
+ACCOUNT_WORD = re.compile(r'(?i)account|a/c|a\.c')
+
+
+# --- Statement period ---
+
+# Dates split across lines: "30/06 /2025" -> "30/06/2025"
+STATEMENT_SPLIT_DATE_DMY = re.compile(r'(\d{1,2}[-/.]\d{1,2})\s+([-/.])\s*(\d{2,4})')
+STATEMENT_SPLIT_DATE_YMD = re.compile(r'(\d{4}[-/.]\d{1,2})\s+([-/.])\s*(\d{1,2})')
+
+# - dd-mm-yyyy, dd-mm-yy, dd/mm/yyyy, dd/mm/yy, dd.mm.yy, dd.mm.yyyy
+# - yyyy-mm-dd, yy-mm-dd, yyyy/mm/dd, yy/mm/dd (ISO format)
+# - dd month yyyy, dd mon yyyy
+# - mon dd, yyyy (e.g., JUL 01, 2025)
+STATEMENT_DATE = r'\b\d{4}[-/.]\d{1,2}[-/.]\d{1,2}\b|\b\d{2}[-/.]\d{1,2}[-/.]\d{1,2}\b|\b\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4}\b|\b\d{1,2}\s+(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{4}\b|\b(?:january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{1,2},?\s+\d{4}\b'
+
+# from: date to: date or date to date (case-insensitive, handles optional asterisks)
+STATEMENT_PERIOD = re.compile(
+    r'(?i)(?:statement\s+)?period[:\s*]+(' + STATEMENT_DATE + r')[:\s*]+to[:\s*]+(' + STATEMENT_DATE + r')'
+    r'|(?:period\s+)?from[:\s*]*(' + STATEMENT_DATE + r')[:\s*]+to[:\s*]+(' + STATEMENT_DATE + r')'
+    r'|(' + STATEMENT_DATE + r')\s+to\s+(' + STATEMENT_DATE + r')',
+    re.IGNORECASE
+)
+
+
+# --- Label anchors ---
+
+# Lowercase keywords every match of a pattern starts with (case-insensitively).
+# field_scan finds these keywords once per text and tries the pattern only at
+# those positions, which gives the same matches as scanning the whole text.
+OPENING_BALANCE_LABELS = ('opening', 'balance', 'brought', 'b/f')
+CLOSING_BALANCE_LABELS = ('closing', 'balance', 'carried', 'c/f', 'book')
+
+PATTERN_ANCHORS = {
+    PAN_LABELED: ('pan',),
+    OPENING_BALANCE_LABELED: OPENING_BALANCE_LABELS,
+    OPENING_BALANCE_HEADER: OPENING_BALANCE_LABELS,
+    OPENING_BALANCE_GENERIC: OPENING_BALANCE_LABELS,
+    CLOSING_BALANCE_LABELED: CLOSING_BALANCE_LABELS,
+    CLOSING_BALANCE_HEADER: CLOSING_BALANCE_LABELS,
+    CLOSING_BALANCE_GENERIC: CLOSING_BALANCE_LABELS,
+    CUSTOMER_ID_LABELED: ('cust', 'cif', 'user', 'relation', 'crn', 'client', 'ckyc'),
+    CUSTOMER_ID_CUSTID: ('custid',),
+    IFSC_LABELED: ('ifsc',),
+    MOBILE_LABELED: ('mobile', 'phone', 'contact', 'registered', 'tel', 'cell', 'sms'),
+    MOBILE_PHONE_NUMBER_FALLBACK: ('phone',),
+    ACCOUNT_NUMBER_LABELED: ('ac', 'bank', 'saving', 'current', 'a/c'),
+    EMAIL_LABELED: ('email', 'e-mail', 'registered', 'contact', 'mail'),
+    CKYC_LABELED: ('ckyc',),
+    CKYC_14_DIGITS: ('ckyc',),
+    CKYC_GENERIC: ('ckyc',),
+    ACCOUNT_TYPE_LABELED: ('ac', 'a/c', 'a.c', 'type', 'scheme', 'product', 'relation', 'cust', 'mode', 'operat'),
+    AADHAR_NEAR_UID: ('uid', 'enrol', 'aadha'),
+}
+
+# One entry per DOB_KEYWORDS entry
+DOB_KEYWORD_LABELS = [('date',), ('dob',), ('birth',), ('date',), ('born',), ('dob', 'do.b', 'd.o')]
+PATTERN_ANCHORS.update({
+    combined_pattern: DOB_KEYWORD_LABELS[index // len(DOB_DATE_FORMATS)]
+    for index, (combined_pattern, _, _) in enumerate(DOB_WITH_CONTEXT)
+})
+
+# Email patterns: every match contains exactly one '@' with the local part right
+# before it. Maps pattern -> (local part character, whitespace allowed before '@')
+EMAIL_LOCAL_CHAR = re.compile(r'[a-zA-Z0-9._%+\-]', re.IGNORECASE)
+EMAIL_MASKED_LOCAL_CHAR = re.compile(r'[a-zA-Z0-9._%+\-*]', re.IGNORECASE)
+
+AT_SIGN_ANCHORS = {
+    EMAIL_PLAIN: (EMAIL_LOCAL_CHAR, False),
+    EMAIL_MASKED: (EMAIL_MASKED_LOCAL_CHAR, False),
+    EMAIL_SPACED: (EMAIL_LOCAL_CHAR, True),
+}
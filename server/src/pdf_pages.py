@@ -0,0 +1,162 @@
+"""Pages of an open pdfplumber PDF, built only when asked for.
+
+pdfplumber's `pdf.pages` walks the whole page tree and builds every page on
+first use, even to count them or to read only the last one; on a 300-page
+statement that is most of the cost of a first/last page request. LazyPdfPages
+takes the count from the page tree root's /Count and finds page i by
+descending the tree, skipping every subtree whose /Count shows page i is
+not in it. A flat /Kids array (as most generators write) is indexed
+directly, so a page costs a few object reads whatever the document length.
+
+Callers plan which pages to read from the count, so it is checked before it
+is handed out: every node whose /Count differs from its number of kids has
+its kids read (not built) and counted. A flat tree costs nothing more, and a
+balanced one costs a read per intermediate node. Trees this cannot follow (no /Pages or /Count, a /Count that does
+not match the kids, a /Kids entry that is not a page node, a cycle) fall
+back to pdfplumber's own page list, which also copes with a missing page
+tree.
+"""
+import logging
+
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import dict_value, list_value, resolve1
+from pdfminer.psparser import LIT
+from pdfplumber.page import Page
+
+logger = logging.getLogger(__name__)
+
+LITERAL_PAGE = LIT('Page')
+LITERAL_PAGES = LIT('Pages')
+
+
+def page_tree_count(node):
+    """/Count of a page tree node, raising if it is missing or not a count"""
+    count = resolve1(node.get('Count'))
+    if not isinstance(count, int) or count < 0:
+        raise ValueError(f"bad page tree /Count: {count!r}")
+    return count
+
+
+class LazyPdfPages:
+    """Sequence of the pages of an open pdfplumber PDF that builds each page on first access.
+
+    Not thread-safe: callers serialize access together with the rest of the
+    PDF parsing. Pages have an initial_doctop of 0, so `doctop` values are
+    relative to their own page (text extraction only compares them within a
+    page).
+    """
+
+    def __init__(self, pdf):
+        self.pdf = pdf
+        self._pages = {}
+        self._count = None
+        # pdfplumber's page list once the page tree could not be followed
+        self._fallback = None
+
+    def __len__(self):
+        if self._count is None:
+            try:
+                self._count = self._checked_count()
+            except Exception as e:
+                self._fall_back(e)
+                self._count = len(self._fallback)
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"page index {index} out of range")
+        if self._fallback is not None:
+            return self._fallback[index]
+        if index not in self._pages:
+            try:
+                objid, attrs = self._find(index)
+            except Exception as e:
+                self._fall_back(e)
+                return self._fallback[index]
+            self._pages[index] = Page(self.pdf, PDFPage(self.pdf.doc, objid, attrs, None), page_number=index + 1)
+        return self._pages[index]
+
+    def close(self):
+        """Close the pages built so far and the PDF"""
+        if self._fallback is not None:
+            self.pdf.close()
+            return
+        # What PDF.close() does, except that it closes pdf.pages, building every page just to close it
+        for page in self._pages.values():
+            page.close()
+        self.pdf.flush_cache()
+        if not self.pdf.stream_is_external:
+            self.pdf.stream.close()
+
+    def _checked_count(self):
+        """Root /Count, after checking it against the page tree nodes below it"""
+        visited = set()
+
+        def count_pages(ref):
+            objid = getattr(ref, 'objid', None)
+            if objid in visited:
+                raise ValueError(f"page tree cycle at object {objid}")
+            visited.add(objid)
+            node = dict_value(ref)
+            if node.get('Type') is not LITERAL_PAGES:
+                raise ValueError(f"object {objid} is not a page tree node")
+            count = page_tree_count(node)
+            kids = list_value(node['Kids'])
+            if count == len(kids):
+                # One page per kid, as _find takes it (and checks for the kid it goes down to)
+                return count
+            found = sum(1 if dict_value(kid).get('Type') is LITERAL_PAGE else count_pages(kid) for kid in kids)
+            if found != count:
+                raise ValueError(f"page tree node {objid} has /Count {count} but {found} pages")
+            return count
+
+        return count_pages(self.pdf.doc.catalog['Pages'])
+
+    def _find(self, index):
+        """(object id, attributes with inherited ones merged in) of the page at index"""
+        ref = self.pdf.doc.catalog['Pages']
+        inherited = {}
+        visited = set()
+        # Whether ref was taken as holding exactly one page
+        single = False
+        while True:
+            objid = getattr(ref, 'objid', None)
+            if objid in visited:
+                raise ValueError(f"page tree cycle at object {objid}")
+            visited.add(objid)
+            node = dict(dict_value(ref))
+            for key, value in inherited.items():
+                node.setdefault(key, value)
+            node_type = node.get('Type')
+            if node_type is LITERAL_PAGE and index == 0:
+                return objid, node
+            if node_type is not LITERAL_PAGES:
+                raise ValueError(f"object {objid} is not a page tree node")
+            count = page_tree_count(node)
+            if single and count != 1:
+                raise ValueError(f"page tree node {objid} is not the single page its parent's /Count implies")
+
+            inherited = {key: node[key] for key in PDFPage.INHERITABLE_ATTRS if key in node}
+            kids = list_value(node['Kids'])
+            single = count == len(kids)
+            if single:
+                # One page per kid: go straight to it
+                ref = kids[index]
+                index = 0
+                continue
+            for kid in kids:
+                kid_node = dict_value(kid)
+                size = 1 if kid_node.get('Type') is LITERAL_PAGE else page_tree_count(kid_node)
+                if index < size:
+                    ref = kid
+                    break
+                index -= size
+            else:
+                raise ValueError(f"page tree node {objid} has fewer pages than its /Count")
+
+    def _fall_back(self, error):
+        logger.debug("Page tree not followed (%s); building every page", error)
+        self._fallback = self.pdf.pages
+        self._count = len(self._fallback)
@@ -0,0 +1,130 @@
+"""Optional image preprocessing before OCR, built on OpenCV (OCR_PREPROCESS).
+
+OCR_PREPROCESS is a comma-separated list of steps, always applied in this
+order whatever order they are listed in:
+
+    grayscale  drop colour: 1 byte per pixel instead of 3
+    denoise    3x3 median blur against scanner speckle
+    deskew     rotate by the dominant text angle, estimated on a downscaled copy
+    threshold  adaptive (local Gaussian) threshold to black and white, handed
+               to Tesseract as packed 1-bit pixels: 24x less data than RGB
+
+denoise, deskew and threshold work on grayscale, so they imply it. Empty or
+'off' disables preprocessing, which is the default. On camera photos and noisy
+scans use threshold together with denoise: thresholding turns untreated noise
+into speckle, and Tesseract then loses whole lines.
+"""
+import logging
+
+from PIL import Image
+
+try:
+    import cv2
+    import numpy as np
+    OPENCV_AVAILABLE = True
+except ImportError:
+    OPENCV_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+STEPS = ('grayscale', 'denoise', 'deskew', 'threshold')
+# Deskew estimates the angle on a copy no wider than this
+DESKEW_SAMPLE_WIDTH = 1600
+# Below this the page is left alone; above it the estimate is more likely wrong than the scan
+DESKEW_MIN_DEGREES = 0.3
+DESKEW_MAX_DEGREES = 10.0
+# Ink must be this much darker than its neighbourhood mean (0-255). Printed text clears it easily;
+# scanner and camera noise on a tinted card background does not, and lower values turn it into
+# speckle that makes Tesseract's page layout analysis drop whole text lines
+THRESHOLD_OFFSET = 30
+
+
+def parse_steps(value):
+    """Ordered preprocessing steps from an OCR_PREPROCESS value; raises ValueError on unknown steps"""
+    names = {step.strip().lower() for step in (value or '').split(',') if step.strip()}
+    names.discard('off')
+    unknown = names - set(STEPS)
+    if unknown:
+        raise ValueError(f"Unknown OCR_PREPROCESS steps: {', '.join(sorted(unknown))}")
+    if names:
+        names.add('grayscale')
+    return tuple(step for step in STEPS if step in names)
+
+
+class Preprocessor:
+    """Applies the configured steps to a PIL image, returning a new PIL image (mode 'L', or '1' after threshold)"""
+
+    def __init__(self, steps=()):
+        if steps and not OPENCV_AVAILABLE:
+            raise RuntimeError("OCR_PREPROCESS needs OpenCV: pip install opencv-python")
+        self.steps = tuple(steps)
+
+    def __bool__(self):
+        return bool(self.steps)
+
+    @property
+    def signature(self):
+        """Identifies the steps in OCR cache keys"""
+        return '+'.join(self.steps)
+
+    def clean(self, image):
+        """Grayscale and denoise alone, for callers that resize in between: speckle is removed at scan resolution"""
+        if not self.steps:
+            return image
+        gray = image if image.mode == 'L' else image.convert('L')
+        if 'denoise' in self.steps:
+            gray = Image.fromarray(cv2.medianBlur(np.asarray(gray), 3))
+        return gray
+
+    def __call__(self, image, cleaned=False):
+        """Run the steps; cleaned=True skips grayscale and denoise, already applied with clean()"""
+        if not self.steps:
+            return image
+        gray = np.asarray(image.convert('L') if cleaned else self.clean(image))
+        if 'deskew' in self.steps:
+            gray = deskew(gray)
+        if 'threshold' in self.steps:
+            binary = adaptive_threshold(gray)
+            return Image.fromarray(binary).convert('1', dither=Image.Dither.NONE)
+        return Image.fromarray(gray)
+
+
+def adaptive_threshold(gray):
+    """Black text on white from local Gaussian-weighted thresholds, robust to uneven lighting and tinted cards"""
+    # Neighbourhood of ~1/40 of the shorter side: larger than a character at any resolution we render
+    block = max(15, min(gray.shape) // 40) | 1
+    return cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block, THRESHOLD_OFFSET,
+    )
+
+
+def skew_angle(gray):
+    """Estimated text rotation in degrees (counter-clockwise positive), from the minimum-area box around dark pixels"""
+    height, width = gray.shape
+    if width > DESKEW_SAMPLE_WIDTH:
+        scale = DESKEW_SAMPLE_WIDTH / width
+        gray = cv2.resize(gray, (DESKEW_SAMPLE_WIDTH, max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    points = cv2.findNonZero(ink)
+    if points is None or len(points) < 50:
+        return 0.0
+    # The box angle range differs between OpenCV versions ([-90, 0) or (0, 90]); the text is
+    # tilted by the box's distance to the nearest axis
+    angle = cv2.minAreaRect(points)[2] % 90
+    if angle > 45:
+        angle -= 90
+    return -angle
+
+
+def deskew(gray):
+    """Rotate a grayscale page upright when its estimated skew is worth correcting"""
+    angle = skew_angle(gray)
+    if not DESKEW_MIN_DEGREES <= abs(angle) <= DESKEW_MAX_DEGREES:
+        return gray
+    height, width = gray.shape
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), -angle, 1.0)
+    logger.debug("Deskewing by %.2f degrees", angle)
+    return cv2.warpAffine(
+        gray, matrix, (width, height), flags=cv2.INTER_LINEAR,
+        borderMode=cv2.BORDER_CONSTANT, borderValue=255,
+    )
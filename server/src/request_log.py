@@ -0,0 +1,144 @@
+"""Structured, level-gated logging for the OCR API.
+
+Every log line carries the id of the request (or background job) it belongs
+to, also across the page OCR pool threads. Requests accumulate per-stage
+durations from the metrics stage() hook, which main.py logs once per request.
+
+Document text is never logged by default. With LOG_LEVEL=debug and
+LOG_TEXT_SAMPLE_RATE > 0, that fraction of requests log the texts the
+extractors search, cut to LOG_TEXT_SAMPLE_CHARS; everything else skips the
+formatting entirely.
+
+    LOG_LEVEL              debug, info, warning, ... (default info)
+    LOG_FORMAT             text or json (one JSON object per line)
+    LOG_TEXT_SAMPLE_RATE   fraction of requests whose texts are logged at debug (default 0)
+    LOG_TEXT_SAMPLE_CHARS  characters of each sampled text, 0 = all (default 500)
+"""
+import contextvars
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+
+_request_id = contextvars.ContextVar('request_id', default=None)
+_stages = contextvars.ContextVar('request_stages', default=None)
+_sample_text = contextvars.ContextVar('sample_text', default=False)
+_stages_lock = threading.Lock()
+
+TEXT_SAMPLE_RATE = float(os.getenv('LOG_TEXT_SAMPLE_RATE', '0'))
+TEXT_SAMPLE_CHARS = int(os.getenv('LOG_TEXT_SAMPLE_CHARS', '500'))
+
+# Incoming X-Request-ID values are reused only when they are short and plain
+_REQUEST_ID_CHARS = frozenset('0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ-_.')
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds record.request_id ('-' outside requests) for the formatters"""
+
+    def filter(self, record):
+        record.request_id = _request_id.get() or '-'
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; structured values passed as extra={'fields': {...}} become top-level keys"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', None),
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure_logging(level=None, fmt=None):
+    """Install the root handler: level from LOG_LEVEL, text or JSON lines from LOG_FORMAT"""
+    level = (level or os.getenv('LOG_LEVEL', 'info')).upper()
+    fmt = (fmt or os.getenv('LOG_FORMAT', 'text')).lower()
+
+    handler = logging.StreamHandler()
+    handler.addFilter(RequestIdFilter())
+    if fmt == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s [%(request_id)s]: %(message)s'))
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+    # Their debug output is per PDF token / image chunk; keep it out of LOG_LEVEL=debug
+    for name in ('pdfminer', 'pypdfium2', 'PIL'):
+        logging.getLogger(name).setLevel(max(logging.WARNING, root.level))
+
+
+def begin_request(request_id=None):
+    """Start a request (or job) scope in this context and return its id; a usable incoming id is kept"""
+    if not request_id or len(request_id) > 64 or not _REQUEST_ID_CHARS.issuperset(request_id):
+        request_id = uuid.uuid4().hex[:16]
+    _request_id.set(request_id)
+    _stages.set({})
+    _sample_text.set(TEXT_SAMPLE_RATE > 0 and random.random() < TEXT_SAMPLE_RATE)
+    return request_id
+
+
+def record_stage(stage, seconds):
+    """Add a stage duration to the current request; a no-op outside one (metrics stage listener)"""
+    stages = _stages.get()
+    if stages is not None:
+        # Page OCR threads share the request's dict through the copied context
+        with _stages_lock:
+            stages[stage] = stages.get(stage, 0.0) + seconds
+
+
+def stage_durations_ms():
+    """Stage -> total milliseconds spent in the current request so far"""
+    stages = _stages.get()
+    if not stages:
+        return {}
+    with _stages_lock:
+        return {stage: round(seconds * 1000, 1) for stage, seconds in stages.items()}
+
+
+def in_request_context(fn):
+    """Wrap fn to run in a copy of the caller's context, for handing work to pool threads"""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+    return run
+
+
+def log_text_sample(logger, label, text):
+    """Log the start of a document text at debug level, only for requests picked for text sampling"""
+    if not _sample_text.get() or not logger.isEnabledFor(logging.DEBUG):
+        return
+    sample = text if TEXT_SAMPLE_CHARS <= 0 else text[:TEXT_SAMPLE_CHARS]
+    logger.debug(
+        "%s (%d of %d chars): %s", label, len(sample), len(text), sample,
+        extra={'fields': {'sample_chars': len(sample), 'text_chars': len(text)}}
+    )
+
+
+def log_request_summary(logger, method, endpoint, status, started):
+    """One info line per finished request with its duration and per-stage breakdown"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    stages = stage_durations_ms()
+    breakdown = ', '.join(f"{stage} {ms} ms" for stage, ms in sorted(stages.items(), key=lambda item: -item[1]))
+    logger.info(
+        f"{method} {endpoint} {status} in {duration_ms} ms" + (f" ({breakdown})" if breakdown else ""),
+        extra={'fields': {
+            'method': method, 'endpoint': endpoint, 'status': status,
+            'duration_ms': duration_ms, 'stages_ms': stages,
+        }}
+    )
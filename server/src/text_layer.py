@@ -0,0 +1,47 @@
+"""PDF text-layer extractors behind one interface, selected in main.py by PDF_TEXT_BACKEND.
+
+PdfplumberTextLayer is the original path: pdfplumber's extract_text(), which
+runs pdfminer's layout analysis in pure Python and is most of the time spent
+on a digital statement. PdfiumTextLayer reads the same text through
+pypdfium2 (already needed to render pages for OCR), whose text extraction
+runs in C.
+
+Both take a pdfplumber page and return its text with '\\n' line breaks, or
+an empty string for image-only pages. Callers hold the lock that guards the
+page's PDF; PdfiumTextLayer also takes the lock shared by every pdfium call,
+since pdfium is not thread-safe across documents either. Tables and formatted
+text stay on pdfplumber, whose character positions they need.
+"""
+
+
+class PdfplumberTextLayer:
+    """Text layer from pdfplumber (pdfminer layout analysis)"""
+
+    name = 'pdfplumber'
+
+    def page_text(self, page):
+        return page.extract_text() or ""
+
+
+class PdfiumTextLayer:
+    """Text layer from pypdfium2, for the document that pdfium_document(pdf) returns, read holding `lock`"""
+
+    name = 'pdfium'
+
+    def __init__(self, pdfium_document, lock):
+        self.pdfium_document = pdfium_document
+        self.lock = lock
+
+    def page_text(self, page):
+        with self.lock:
+            pdfium_page = self.pdfium_document(page.pdf)[page.page_number - 1]
+            try:
+                text_page = pdfium_page.get_textpage()
+                try:
+                    text = text_page.get_text_range()
+                finally:
+                    text_page.close()
+            finally:
+                pdfium_page.close()
+        # pdfium ends lines with '\r\n' and may leave trailing spaces; pdfplumber does neither
+        return '\n'.join(line.rstrip() for line in text.replace('\r\n', '\n').replace('\r', '\n').split('\n'))
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(SERVER_DIR, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+# After src, for the PDF writers in benchmarks/common.py
+BENCHMARKS_DIR = os.path.join(SERVER_DIR, 'benchmarks')
+if BENCHMARKS_DIR not in sys.path:
+    sys.path.append(BENCHMARKS_DIR)
+
+STATEMENT_HEADER = (
+    "STATEMENT OF ACCOUNT\n"
+    "CUSTOMER ID : 290556726          CKYC NO: 12345678901234\n"
+    "PAN : ABCPE1234F                 IFSC CODE: HDFC0001234\n"
+    "ACCOUNT TYPE : SAVINGS ACCOUNT   ACCOUNT NO : 50100123456789\n"
+    "OPENING BALANCE : 42,650.00(CR)\n"
+)
+
+
+@pytest.fixture
+def statement_pdf(tmp_path):
+    """Write a digital statement of `pages` pages (header on page 1, closing balance on the last)"""
+    from common import write_text_pdf
+
+    def write(pages=3, name='statement.pdf', fan_out=None):
+        # Ten lines a page: the five header lines, transactions, and the closing balance as the last line
+        body = [f"TRANSACTION {i}" for i in range(pages * 10 - 6)]
+        text = STATEMENT_HEADER + "\n".join(body) + "\nCLOSING BALANCE : 2,983.38(CR)\n"
+        return write_text_pdf(text, str(tmp_path / name), 10, fan_out)
+
+    return write
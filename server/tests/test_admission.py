@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+import main
+from admission import OcrAdmission, OcrBusy, OcrTimeout
+
+
+def test_full_queue_rejects_with_retry_after():
+    admission = OcrAdmission(max_pages=1, max_queue=2)
+    admission.enqueue()
+    admission.enqueue()
+    with pytest.raises(OcrBusy) as error:
+        admission.enqueue()
+    assert error.value.retry_after >= 1
+    assert admission.stats()['rejected'] == 1
+
+
+def test_blocking_tickets_are_never_rejected():
+    admission = OcrAdmission(max_pages=1, max_queue=1)
+    admission.enqueue()
+    ticket = admission.enqueue(blocking=True)
+    assert ticket.blocking
+    assert admission.stats()['queue_depth'] == 2
+
+
+def test_dequeue_gives_the_place_back_once():
+    admission = OcrAdmission(max_pages=1, max_queue=1)
+    ticket = admission.enqueue()
+    admission.dequeue(ticket)
+    admission.dequeue(ticket)
+    assert admission.stats()['queue_depth'] == 0
+    admission.enqueue()
+
+
+def test_waiting_past_max_wait_raises():
+    admission = OcrAdmission(max_pages=1, max_queue=4, max_wait=0.2)
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with admission.slot(0):
+            held.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    held.wait(5)
+    try:
+        started = time.monotonic()
+        with pytest.raises(OcrBusy):
+            with admission.slot(0, admission.enqueue()):
+                pass
+        assert time.monotonic() - started >= 0.2
+    finally:
+        release.set()
+        holder.join()
+    stats = admission.stats()
+    assert (stats['timed_out'], stats['queue_depth'], stats['pages_in_flight']) == (1, 0, 0)
+
+
+def test_raster_budget_lets_one_large_page_through():
+    admission = OcrAdmission(max_pages=2, max_raster_bytes=100)
+    with admission.slot(500):
+        assert admission.stats()['raster_bytes_in_flight'] == 500
+
+
+def test_busy_response_is_429_with_retry_after():
+    with main.app.test_request_context():
+        response, status = main.ocr_busy_response(OcrBusy("OCR queue is full", 7))
+    assert status == 429
+    assert response.headers['Retry-After'] == '7'
+    assert response.get_json() == {'error': 'OCR queue is full', 'retry_after': 7}
+
+
+def test_page_timeout_response_is_503_with_retry_after():
+    with main.app.test_request_context():
+        response, status = main.ocr_busy_response(OcrTimeout("Page 2: OCR not done after 1s", 3))
+    assert status == 503
+    assert response.headers['Retry-After'] == '3'
+
+
+def test_scanned_upload_turned_away_when_the_queue_is_full(tmp_path, monkeypatch):
+    from common import write_scanned_pdf
+
+    path = write_scanned_pdf("PAN : ABCPE1234F\n", str(tmp_path / 'scan.pdf'), dpi=50)
+    monkeypatch.setattr(main, 'OCR_ADMISSION', OcrAdmission(max_pages=1, max_queue=0))
+    with open(path, 'rb') as f:
+        response = main.app.test_client().post('/extract-text', data={'file': (f, 'scan.pdf')})
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    assert response.get_json()['retry_after'] == int(response.headers['Retry-After'])
@@ -0,0 +1,88 @@
+import json
+import os
+import sys
+
+import batch
+
+REAL_PROCESS_FILE = batch.process_file
+
+
+def crash_on_poison(path, fields):
+    """process_file, except that the worker dies outright on a file named poison*"""
+    if os.path.basename(path).startswith('poison'):
+        os._exit(1)
+    return REAL_PROCESS_FILE(path, fields)
+
+
+def run_batch(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['batch.py', *args])
+    batch.main_cli()
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_resume_from_checkpoint(tmp_path, statement_pdf, monkeypatch, capsys):
+    inputs = tmp_path / 'in'
+    inputs.mkdir()
+    first = statement_pdf(pages=2, name='in/a.pdf')
+    output = str(tmp_path / 'out.jsonl')
+    checkpoint = output + '.checkpoint.jsonl'
+    args = [str(inputs), '--output', output, '--fields', 'pan_number,ifsc_code', '--workers', '1']
+
+    run_batch(monkeypatch, *args)
+    assert [(r['file'], r['pan_number'], r['ifsc_code']) for r in read_jsonl(output)] == [
+        (first, 'ABCPE1234F', 'HDFC0001234'),
+    ]
+
+    # A second file, and a record cut short by a crash mid-write
+    second = statement_pdf(pages=1, name='in/b.pdf')
+    with open(checkpoint, 'a', encoding='utf-8') as f:
+        f.write('{"file": "' + second)
+    capsys.readouterr()
+    run_batch(monkeypatch, *args)
+    assert '2 files found, 1 already done, 1 to process' in capsys.readouterr().err
+    assert [r['file'] for r in read_jsonl(output)] == [first, second]
+
+    # A file changed since the last run is redone
+    stat = os.stat(first)
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    run_batch(monkeypatch, *args)
+    assert '2 files found, 1 already done, 1 to process' in capsys.readouterr().err
+
+
+def test_load_checkpoint_retry_errors(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    records = [{'key': 'a', 'error': None}, {'key': 'b', 'error': 'broken PDF'}]
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records) + '{"key": "c", "err')
+    assert set(batch.load_checkpoint(str(path))) == {'a', 'b'}
+    assert set(batch.load_checkpoint(str(path), retry_errors=True)) == {'a'}
+    assert batch.load_checkpoint(str(tmp_path / 'missing.jsonl')) == {}
+
+
+def test_worker_crash_only_fails_its_own_file(tmp_path, statement_pdf, monkeypatch, capsys):
+    inputs = tmp_path / 'in'
+    inputs.mkdir()
+    for i in range(8):
+        statement_pdf(pages=1, name=f'in/{i}.pdf')
+    poison = statement_pdf(pages=1, name='in/poison.pdf')
+    output = str(tmp_path / 'out.jsonl')
+    # Workers are forked, so they run the patched process_file
+    monkeypatch.setattr(batch, 'process_file', crash_on_poison)
+    args = [str(inputs), '--output', output, '--fields', 'pan_number', '--workers', '2']
+
+    run_batch(monkeypatch, *args)
+    records = read_jsonl(output)
+    assert len(records) == 9
+    errors = {r['file']: r['error'] for r in records if r['error']}
+    assert list(errors) == [poison]
+    assert 'worker process died' in errors[poison]
+    assert {r['pan_number'] for r in records if not r['error']} == {'ABCPE1234F'}
+    assert 'retrying' in capsys.readouterr().err
+    # One checkpoint record per file: the files knocked over with the pool were not checkpointed as errors
+    assert len(read_jsonl(output + '.checkpoint.jsonl')) == 9
+
+    run_batch(monkeypatch, *args)
+    assert '9 files found, 9 already done, 0 to process' in capsys.readouterr().err
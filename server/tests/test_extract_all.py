@@ -0,0 +1,62 @@
+import pytest
+
+import main
+
+RESPONSE_KEYS = {'filename', 'file_type', 'pages_read'}
+
+
+@pytest.fixture
+def post(statement_pdf):
+    path = statement_pdf(pages=3)
+    client = main.app.test_client()
+
+    def post(query='', **form):
+        with open(path, 'rb') as f:
+            return client.post('/extract-all' + query, data={'file': (f, 'statement.pdf'), **form})
+
+    return post
+
+
+def test_selected_fields_only(post):
+    response = post(fields='pan_number, ifsc_code')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert set(body) == {'pan_number', 'ifsc_code'} | RESPONSE_KEYS
+    assert (body['pan_number'], body['ifsc_code']) == ('ABCPE1234F', 'HDFC0001234')
+    assert body['pages_read'] == [1]
+
+
+def test_fields_from_the_query_string(post):
+    body = post('?fields=closing_balance').get_json()
+    assert set(body) == {'closing_balance'} | RESPONSE_KEYS
+    assert body['closing_balance']['amount'] == '2983.38'
+    # Closing balance is looked for on the last page first
+    assert body['pages_read'] == [3]
+
+
+def test_default_fields_leave_out_every_page_fields(post):
+    body = post().get_json()
+    assert set(body) == set(main.DEFAULT_EXTRACT_ALL_FIELDS) | RESPONSE_KEYS
+    assert not {'dob', 'aadhar_number'} & set(body)
+    assert body['pages_read'] == [1, 3]
+
+
+def test_every_page_field_on_request(post):
+    body = post(fields='aadhar_number').get_json()
+    assert set(body) == {'aadhar_number'} | RESPONSE_KEYS
+    assert body['aadhar_number'] is None
+    assert body['pages_read'] == [1, 2, 3]
+
+
+def test_unknown_fields_rejected(post):
+    response = post(fields='pan_number,shoe_size')
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['error'] == 'Unknown fields: shoe_size'
+    assert body['supported_fields'] == list(main.EXTRACT_ALL_FIELDS)
+
+
+def test_parse_requested_fields():
+    assert main.parse_requested_fields(None) == (main.DEFAULT_EXTRACT_ALL_FIELDS, [])
+    assert main.parse_requested_fields(' pan_number,,ckyc ') == (['pan_number', 'ckyc'], [])
+    assert main.parse_requested_fields('pan_number,x') == (['pan_number', 'x'], ['x'])
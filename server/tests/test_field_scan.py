@@ -0,0 +1,287 @@
+"""The single-scan field extractors against the values the per-pattern extractors returned.
+
+EXPECTED holds what the extractors in main.py returned on CORPUS before
+field_scan.py (every pattern run over the whole text), quirks included, so a
+change in what the anchored scan finds shows up here. The pattern tests check
+the property the engine relies on: trying a pattern only at its anchor
+keywords gives the same search/findall result as a full scan.
+"""
+import pytest
+
+import main
+import patterns
+from field_scan import ScannedText, scan_text
+
+CORPUS = {
+    'hdfc_header': (
+        "STATEMENT OF ACCOUNT\n"
+        "CUSTOMER ID : 290556726          CKYC NO: 12345678901234\n"
+        "PAN : ABCPE1234F                 IFSC CODE: HDFC0001234\n"
+        "MOBILE NO : 98XXXXXX12           EMAIL : FOO.BAR@GMAIL.COM\n"
+        "ACCOUNT TYPE : SAVINGS ACCOUNT   ACCOUNT NO : 50100123456789\n"
+        "STATEMENT PERIOD : 01/04/2025 TO 30/06/2025\n"
+        "DATE OF BIRTH: 15/08/1990\n"
+        "OPENING BALANCE : 42,650.00(CR)\n"
+        "DATE NARRATION CHQ/REF NO VALUE DT WITHDRAWAL AMT DEPOSIT AMT CLOSING BALANCE\n"
+        "01/04/25 UPI-1234567890-MERCHANT 4411 123456789012 01/04/25 1,200.00 41,450.00\n"
+        "CLOSING BALANCE : 2,983.38(CR)\n"
+    ),
+    'mixed_case_labels': (
+        "Cust ID: 88123456\n"
+        "Ifsc: SBIN0004567  MICR: 400002012\n"
+        "Pan No. - AAAPL1234C\n"
+        "Registered Mobile: +91 98200 12345\n"
+        "Email Id : jane.doe+stmt@example.co.in\n"
+        "A/c No: 0012 3456 7890\n"
+        "Account Type - Current Account\n"
+        "Statement from 01-Jan-2024 to 31-Mar-2024\n"
+        "D.O.B: 02-11-1985\n"
+        "Aadhaar No: 1234 5678 9012\n"
+    ),
+    'summary_table': (
+        "ACCOUNT SUMMARY\n"
+        "OPENING BALANCE   DR COUNT   CR COUNT   DEBITS   CREDITS   CLOSING BALANCE\n"
+        "1,00,000.00       12         4          5,500.00 20,000.00 1,14,500.00\n"
+        "CKYC NUMBER : 5012 3456 7890 12\n"
+        "UID : 9876 5432 1098\n"
+    ),
+    # Labels that share words or sit on one line with each other
+    'overlapping_labels': (
+        "OPENING BALANCE CLOSING BALANCE\n"
+        "OPENING BALANCE: 500.00 CLOSING BALANCE: 750.25 DR\n"
+        "CUSTOMER ID CIF NO : 7788990011 CKYC ID: 12345678901234\n"
+        "PAN PAN: PANAB1234Z / PAN NO : ABCDE1234F\n"
+        "IFSC IFSC CODE IFSC: ICIC0000123\n"
+        "ACCOUNT NO ACCOUNT NUMBER : 1234567890123\n"
+        "MOBILE MOBILE NO: 9876543210 PHONE NUMBER: 022-1234567\n"
+        "EMAIL: A@B.COM, EMAIL ID: second.one@bank.in\n"
+        "DOB: 01/01/1970 DATE OF BIRTH 12/12/2012\n"
+    ),
+    'spaced_and_masked': (
+        "E-MAIL : ra****sh@gm**l.com\n"
+        "Email: john . smith @ gmail . com\n"
+        "MOBILE NO : 98XXXXXX12/97XXXXXX34\n"
+        "CKYC : **********1234\n"
+        "ACCOUNT NO : XXXXXXXX6789\n"
+    ),
+    # Nothing the extractors should find, or only near misses
+    'no_labels': (
+        "THANK YOU FOR BANKING WITH US\n"
+        "THIS IS A COMPUTER GENERATED STATEMENT AND DOES NOT REQUIRE A SIGNATURE\n"
+    ),
+    'near_misses': (
+        "COMPANY NAME: PANORAMA TRADERS\n"
+        "SPECIFIC CODE: 12\n"
+        "EMAILS ARE NOT MONITORED\n"
+        "BALANCE OF PAYMENTS\n"
+        "CUSTOMERS IDENTIFIED: NONE\n"
+        "PANCAKE: ABC\n"
+        "ACCOUNTING PERIOD\n"
+        "OPEN BALANCE SHEET\n"
+        "@HANDLE\n"
+    ),
+    'empty': "",
+    'unicode_fold': "PAN: ABCPE1234F İSTANBUL ıfsc: HDFC0001234\n",
+}
+
+EXPECTED = {
+    'hdfc_header': {
+        'pan_number': 'ABCPE1234F',
+        'customer_id': '290556726',
+        'mobile_number': '98XXXXXX12',
+        'account_number': '50100123456789',
+        'ifsc_code': 'HDFC0001234',
+        'email_ids': ['foo.bar@gmail.com'],
+        'ckyc': '12345678901234PAN',
+        'account_type': {'label': 'ACCOUNT TYPE', 'account_type': 'SAVINGS  ACCOUNT'},
+        'opening_balance': {'amount': '42650.00', 'type': 'CR', 'raw': 'OPENING BALANCE : 42,650.00(CR)'},
+        'closing_balance': {'amount': '01', 'type': 'UNKNOWN', 'raw': 'CLOSING BALANCE\n01'},
+        'statement_period': {'from_date': '01/04/2025', 'to_date': '30/06/2025'},
+        'dob': {'dob': '15/08/1990', 'format': 'dd-mm-yyyy', 'confidence': 'high'},
+        'aadhar_number': '1234 5678 9012',
+    },
+    'mixed_case_labels': {
+        'pan_number': 'AAAPL1234C',
+        'customer_id': '88123456',
+        'mobile_number': None,
+        'account_number': '001234567890',
+        'ifsc_code': 'SBIN0004567',
+        'email_ids': ['jane.doe+stmt@example.co.in'],
+        'ckyc': None,
+        'account_type': {'label': 'Account Type', 'account_type': 'CURRENT  ACCOUNT'},
+        'opening_balance': None,
+        'closing_balance': None,
+        'statement_period': None,
+        'dob': {'dob': '02-11-1985', 'format': 'dd-mm-yyyy', 'confidence': 'high'},
+        'aadhar_number': '0012 3456 7890',
+    },
+    'summary_table': {
+        'pan_number': None,
+        'customer_id': None,
+        'mobile_number': None,
+        'account_number': None,
+        'ifsc_code': None,
+        'email_ids': [],
+        'ckyc': '50123456789012UID',
+        'account_type': None,
+        'opening_balance': {'amount': '100000.00', 'type': 'UNKNOWN', 'raw': '1,00,000.00'},
+        'closing_balance': {'amount': '100000.00', 'type': 'UNKNOWN', 'raw': 'CLOSING BALANCE\n1,00,000.00       '},
+        'statement_period': None,
+        'dob': None,
+        'aadhar_number': '5012 3456 7890',
+    },
+    'overlapping_labels': {
+        'pan_number': 'PANAB1234Z',
+        'customer_id': 'CIF',
+        'mobile_number': '9876543210',
+        'account_number': '7788990011',
+        'ifsc_code': 'ICIC0000123',
+        'email_ids': ['a@b.com', 'second.one@bank.in'],
+        'ckyc': '12345678901234PANPA',
+        'account_type': None,
+        'opening_balance': {'amount': '500.00', 'type': 'UNKNOWN', 'raw': 'OPENING BALANCE: 500.00 '},
+        'closing_balance': {'amount': '', 'type': 'UNKNOWN', 'raw': 'CLOSING BALANCE\n'},
+        'statement_period': None,
+        'dob': {'dob': '12/12/2012', 'format': 'dd-mm-yyyy', 'confidence': 'high'},
+        'aadhar_number': None,
+    },
+    'spaced_and_masked': {
+        'pan_number': None,
+        'customer_id': None,
+        'mobile_number': '98XXXXXX1297XXXXXX34',
+        'account_number': None,
+        'ifsc_code': None,
+        'email_ids': ['ra****sh@gml.com', 'ra****sh@gm**l.com', 'smith@gmail.com'],
+        'ckyc': '**********1234',
+        'account_type': None,
+        'opening_balance': None,
+        'closing_balance': None,
+        'statement_period': None,
+        'dob': None,
+        'aadhar_number': None,
+    },
+    'no_labels': {
+        'pan_number': None,
+        'customer_id': None,
+        'mobile_number': None,
+        'account_number': None,
+        'ifsc_code': None,
+        'email_ids': [],
+        'ckyc': None,
+        'account_type': None,
+        'opening_balance': None,
+        'closing_balance': None,
+        'statement_period': None,
+        'dob': None,
+        'aadhar_number': None,
+    },
+    'near_misses': {
+        'pan_number': None,
+        'customer_id': None,
+        'mobile_number': None,
+        'account_number': None,
+        'ifsc_code': None,
+        'email_ids': [],
+        'ckyc': None,
+        'account_type': None,
+        'opening_balance': None,
+        'closing_balance': None,
+        'statement_period': None,
+        'dob': None,
+        'aadhar_number': None,
+    },
+    'empty': {
+        'pan_number': None,
+        'customer_id': None,
+        'mobile_number': None,
+        'account_number': None,
+        'ifsc_code': None,
+        'email_ids': [],
+        'ckyc': None,
+        'account_type': None,
+        'opening_balance': None,
+        'closing_balance': None,
+        'statement_period': None,
+        'dob': None,
+        'aadhar_number': None,
+    },
+    'unicode_fold': {
+        'pan_number': 'ABCPE1234F',
+        'customer_id': None,
+        'mobile_number': None,
+        'account_number': None,
+        'ifsc_code': 'HDFC0001234',
+        'email_ids': [],
+        'ckyc': None,
+        'account_type': None,
+        'opening_balance': None,
+        'closing_balance': None,
+        'statement_period': None,
+        'dob': None,
+        'aadhar_number': None,
+    },
+}
+
+
+ANCHORED_PATTERNS = list(patterns.PATTERN_ANCHORS) + list(patterns.AT_SIGN_ANCHORS)
+
+
+def match_key(match):
+    return None if match is None else (match.span(), match.groups())
+
+
+@pytest.mark.parametrize('name', list(CORPUS))
+def test_extractors_match_baseline(name):
+    text = CORPUS[name]
+    for field, (_, _, extractor) in main.EXTRACT_ALL_FIELDS.items():
+        assert extractor(text) == EXPECTED[name][field], field
+
+
+@pytest.mark.parametrize('name', list(CORPUS))
+def test_shared_scan_matches_baseline(name):
+    # /extract-all scans a text once and hands the same ScannedText to every extractor
+    scanned = scan_text(CORPUS[name])
+    results = {field: extractor(scanned) for field, (_, _, extractor) in main.EXTRACT_ALL_FIELDS.items()}
+    assert results == EXPECTED[name]
+
+
+@pytest.mark.parametrize('name', list(CORPUS))
+def test_full_scan_matches_baseline(name):
+    scanned = ScannedText(CORPUS[name], anchors=False)
+    results = {field: extractor(scanned) for field, (_, _, extractor) in main.EXTRACT_ALL_FIELDS.items()}
+    assert results == EXPECTED[name]
+
+
+@pytest.mark.parametrize('case', [str, str.upper, str.lower], ids=['as-is', 'upper', 'lower'])
+@pytest.mark.parametrize('name', list(CORPUS))
+def test_anchored_search_matches_full_scan(name, case):
+    text = case(CORPUS[name])
+    scanned = ScannedText(text)
+    for pattern in ANCHORED_PATTERNS:
+        assert match_key(scanned.search(pattern)) == match_key(pattern.search(text)), pattern.pattern
+        assert scanned.findall(pattern) == pattern.findall(text), pattern.pattern
+
+
+def test_overlapping_keywords_are_each_tried():
+    # 'pan' also starts 'panab...' and sits inside 'company'; every position is a candidate
+    scanned = ScannedText("COMPANY PAN PAN: PANAB1234Z")
+    assert scanned.keyword_positions('pan') == [3, 8, 12, 17]
+    assert scanned.search(patterns.PAN_LABELED).group(1) == 'PANAB1234Z'
+
+
+def test_unanchorable_text_is_scanned_in_full():
+    # 'İ' lowercases to two characters, which would shift the keyword offsets
+    assert not ScannedText("İ PAN: ABCPE1234F").anchored
+    assert ScannedText("PAN: ABCPE1234F").anchored
+
+
+@pytest.mark.parametrize('name', list(CORPUS))
+def test_line_indexes_are_the_anchor_lines(name):
+    # The balance table search only visits these lines
+    scanned = ScannedText(CORPUS[name])
+    keywords = patterns.PATTERN_ANCHORS[patterns.CLOSING_BALANCE_HEADER]
+    expected = [
+        i for i, line in enumerate(scanned.lines)
+        if not scanned.anchored or any(keyword in line.lower() for keyword in keywords)
+    ]
+    assert list(scanned.line_indexes(patterns.CLOSING_BALANCE_HEADER)) == expected
@@ -0,0 +1,107 @@
+import io
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import main
+from admission import OcrBusy
+from jobs import JobManager
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def blocked(job, release):
+    release.wait(5)
+    return 'done'
+
+
+def write_snapshot(state_dir, job_id, status, age):
+    path = os.path.join(state_dir, f"{job_id}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'job_id': job_id, 'status': status, 'finished_at': None, 'result': None, 'error': None}, f)
+    touched_at = time.time() - age
+    os.utime(path, (touched_at, touched_at))
+    return path
+
+
+def test_full_queue_rejects_with_retry_after(release):
+    manager = JobManager(workers=1, max_queue=1)
+    running = manager.submit(blocked, release)
+    wait_for(lambda: manager.get(running.id)['status'] == 'running')
+    manager.submit(blocked, release)
+    with pytest.raises(OcrBusy) as error:
+        manager.submit(blocked, release)
+    assert error.value.retry_after >= 1
+    assert manager.stats()['queued'] == 1
+
+    release.set()
+    wait_for(lambda: manager.stats()['done'] == 2)
+    manager.submit(blocked, release)
+
+
+def test_create_job_answers_429_when_the_queue_is_full(monkeypatch, release, statement_pdf):
+    manager = JobManager(workers=1, max_queue=1)
+    monkeypatch.setattr(main, 'JOB_MANAGER', manager)
+    running = manager.submit(blocked, release)
+    wait_for(lambda: manager.get(running.id)['status'] == 'running')
+    manager.submit(blocked, release)
+
+    with open(statement_pdf(pages=1), 'rb') as f:
+        response = main.app.test_client().post('/jobs', data={'file': (io.BytesIO(f.read()), 'statement.pdf')})
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_orphaned_jobs_are_failed_at_startup(tmp_path):
+    state_dir = str(tmp_path)
+    orphan = write_snapshot(state_dir, 'a' * 32, 'running', age=60)
+    queued_orphan = write_snapshot(state_dir, 'b' * 32, 'queued', age=60)
+    live = write_snapshot(state_dir, 'c' * 32, 'running', age=0)
+
+    manager = JobManager(state_dir=state_dir, heartbeat_interval=1)
+    for path in (orphan, queued_orphan):
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        assert state['status'] == 'failed'
+        assert 'interrupted' in state['error']
+        assert state['finished_at']
+    # Still heartbeating in another process
+    assert manager.get('c' * 32)['status'] == 'running'
+    with open(live, encoding='utf-8') as f:
+        assert json.load(f)['status'] == 'running'
+
+
+def test_status_poll_fails_a_job_whose_process_stopped(tmp_path):
+    state_dir = str(tmp_path)
+    manager = JobManager(state_dir=state_dir, heartbeat_interval=1)
+    write_snapshot(state_dir, 'd' * 32, 'running', age=60)
+    assert manager.get('d' * 32)['status'] == 'failed'
+
+
+def test_heartbeat_keeps_running_jobs_alive(tmp_path, release):
+    state_dir = str(tmp_path)
+    owner = JobManager(workers=1, state_dir=state_dir, heartbeat_interval=0.1)
+    job = owner.submit(blocked, release)
+    wait_for(lambda: owner.get(job.id)['status'] == 'running')
+    time.sleep(0.5)
+
+    # Another process sharing the directory
+    poller = JobManager(state_dir=state_dir, heartbeat_interval=0.1)
+    assert poller.get(job.id)['status'] == 'running'
+    release.set()
+    wait_for(lambda: poller.get(job.id)['status'] == 'done')
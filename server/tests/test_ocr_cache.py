@@ -0,0 +1,78 @@
+import os
+
+from ocr_cache import OcrCache
+
+KEY_ARGS = ('doc', 1, 300, '--oem 3 --psm 6', True)
+
+
+def test_key_covers_every_ocr_setting():
+    key = OcrCache.make_key(*KEY_ARGS)
+    assert key == OcrCache.make_key(*KEY_ARGS)
+    for i, other in enumerate(['other-doc', 2, 500, '--oem 3 --psm 3', False]):
+        args = list(KEY_ARGS)
+        args[i] = other
+        assert OcrCache.make_key(*args) != key
+
+
+def test_key_tells_page_tags_apart():
+    assert OcrCache.make_key('doc', 1, 300, '', True) != OcrCache.make_key('doc', '1:header:0.3', 300, '', True)
+
+
+def test_memory_lru_eviction():
+    cache = OcrCache(max_entries=2)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    assert cache.get('a') == 'A'
+    cache.put('c', 'C')
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == ('A', 'C')
+    stats = cache.stats()
+    assert (stats['memory_hits'], stats['misses'], stats['memory_entries']) == (3, 1, 2)
+
+
+def test_memory_tier_off():
+    cache = OcrCache(max_entries=0)
+    cache.put('a', 'A')
+    assert cache.get('a') is None
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    OcrCache(disk_dir=str(tmp_path)).put('a', 'PAGE TEXT')
+    cache = OcrCache(disk_dir=str(tmp_path))
+    assert cache.stats()['disk_bytes'] == len('PAGE TEXT')
+    assert cache.get('a') == 'PAGE TEXT'
+    assert cache.get('a') == 'PAGE TEXT'
+    stats = cache.stats()
+    assert (stats['disk_hits'], stats['memory_hits']) == (1, 1)
+
+
+def test_disk_eviction_removes_least_recently_used(tmp_path):
+    cache = OcrCache(max_entries=0, disk_dir=str(tmp_path), disk_max_bytes=25)
+    for age, key in ((300, 'a'), (200, 'b')):
+        cache.put(key, key * 10)
+        os.utime(tmp_path / f'{key}.txt', (0, os.path.getmtime(tmp_path / f'{key}.txt') - age))
+    # Reading 'a' makes it the most recently used
+    assert cache.get('a') == 'a' * 10
+    cache.put('c', 'c' * 10)
+    assert sorted(os.listdir(tmp_path)) == ['a.txt', 'c.txt']
+    assert cache.stats()['disk_bytes'] == 20
+
+
+def test_disk_skips_entries_over_the_budget(tmp_path):
+    cache = OcrCache(max_entries=0, disk_dir=str(tmp_path), disk_max_bytes=5)
+    cache.put('a', 'x' * 6)
+    assert os.listdir(tmp_path) == []
+
+
+def test_adaptive_key_covers_the_tier_thresholds(monkeypatch):
+    import main
+
+    key = main.adaptive_cache_resolution(800)
+    assert key.startswith('adaptive:300,400,800:')
+    monkeypatch.setattr(main, 'OCR_ADAPTIVE_MIN_CONFIDENCE', 70.0)
+    lower_confidence = main.adaptive_cache_resolution(800)
+    monkeypatch.setattr(main, 'OCR_ADAPTIVE_MIN_TEXT_HEIGHT', 12)
+    lower_height = main.adaptive_cache_resolution(800)
+    assert len({key, lower_confidence, lower_height}) == 3
+    monkeypatch.setattr(main, 'OCR_ADAPTIVE_DPI_TIERS', [200, 300])
+    assert main.adaptive_cache_resolution(800).startswith('adaptive:200,300,800:')
@@ -0,0 +1,71 @@
+import pytest
+
+from page_plan import PagePlan, page_order
+
+
+@pytest.mark.parametrize('order, expected', [
+    ('first', [0]),
+    ('first_last', [0, 4]),
+    ('last_first', [4, 0]),
+    ('all', [0, 1, 2, 3, 4]),
+])
+def test_page_order(order, expected):
+    assert page_order(order, 5) == expected
+
+
+@pytest.mark.parametrize('order', ['first', 'first_last', 'last_first', 'all'])
+def test_page_order_single_page(order):
+    assert page_order(order, 1) == [0]
+
+
+def test_page_order_empty_document():
+    assert page_order('first_last', 0) == []
+
+
+def test_page_order_extra_pages_nearest_the_likeliest_page():
+    assert page_order('first', 6, extra_pages=2) == [0, 1, 2]
+    assert page_order('first_last', 6, extra_pages=2) == [0, 5, 1, 2]
+    assert page_order('last_first', 6, extra_pages=2) == [5, 0, 4, 3]
+    assert page_order('first', 2, extra_pages=5) == [0, 1]
+
+
+def test_page_order_unknown():
+    with pytest.raises(ValueError):
+        page_order('middle', 3)
+
+
+def test_plan_steps_until_resolved_or_exhausted():
+    plan = PagePlan(4, {'pan_number': 'first', 'opening_balance': 'first_last', 'closing_balance': 'last_first'})
+    assert plan.next_step() == {'pan_number': [0], 'opening_balance': [0], 'closing_balance': [3]}
+
+    assert plan.searched_pages('pan_number', [0]) == [0]
+    assert plan.exhausted('pan_number')
+    plan.searched_pages('opening_balance', [0])
+    plan.searched_pages('closing_balance', [3])
+    plan.resolve('closing_balance')
+    assert plan.next_step() == {'opening_balance': [3]}
+
+    assert plan.searched_pages('opening_balance', [3]) == [0, 3]
+    assert plan.next_step() == {}
+
+
+def test_plan_all_fields_in_waves():
+    plan = PagePlan(5, {'dob': 'all', 'pan_number': 'first'}, wave=2)
+    assert plan.next_step() == {'dob': [0, 1], 'pan_number': [0]}
+    plan.searched_pages('dob', [0, 1])
+    plan.searched_pages('pan_number', [0])
+    assert plan.next_step() == {'dob': [2, 3]}
+    plan.searched_pages('dob', [2, 3])
+    assert plan.next_step() == {'dob': [4]}
+
+
+def test_plan_all_fields_in_one_step_without_wave():
+    plan = PagePlan(3, {'aadhar_number': 'all'}, wave=None)
+    assert plan.next_step() == {'aadhar_number': [0, 1, 2]}
+
+
+def test_plan_keeps_its_own_orders():
+    orders = {'pan_number': 'first'}
+    plan = PagePlan(2, orders)
+    orders['pan_number'] = 'all'
+    assert plan.next_step() == {'pan_number': [0]}
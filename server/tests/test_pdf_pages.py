@@ -0,0 +1,176 @@
+import pdfplumber
+import pytest
+
+import main
+from pdf_pages import LazyPdfPages
+
+PAGE = b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 200 200] /Contents %d 0 R /Resources << /Font << /F1 3 0 R >> >> >>"
+FONT = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+
+
+def content(text):
+    stream = b"BT /F1 12 Tf 20 100 Td (%s) Tj ET" % text
+    return b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+
+
+def write_pdf(path, objects):
+    """Write numbered object bodies as a PDF whose catalog is object 1"""
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, objects[number])
+    xref = len(out)
+    size = max(objects) + 1
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    out += b"".join(b"%010d 00000 n \n" % offsets[number] if number in offsets else b"0000000000 65535 f \n"
+                    for number in range(1, size))
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref)
+    path.write_bytes(bytes(out))
+    return str(path)
+
+
+def texts(pages, indexes):
+    return [pages[index].extract_text() for index in indexes]
+
+
+@pytest.mark.parametrize('fan_out', [None, 3], ids=['flat', 'nested'])
+def test_pages_match_pdfplumber(statement_pdf, fan_out):
+    path = statement_pdf(pages=20, fan_out=fan_out)
+    with pdfplumber.open(path) as pdf:
+        expected = texts(pdf.pages, range(20))
+
+    pdf = pdfplumber.open(path)
+    pages = LazyPdfPages(pdf)
+    assert len(pages) == 20
+    assert texts(pages, [19, 0, 7, 13]) == [expected[19], expected[0], expected[7], expected[13]]
+    assert pages[-1].page_number == 20
+    assert pages[7] is pages[7]
+    # Only the pages asked for were built, never pdfplumber's full page list
+    assert not hasattr(pdf, '_pages')
+    pages.close()
+    assert not hasattr(pdf, '_pages')
+    assert pdf.stream.closed
+
+
+def test_index_out_of_range(statement_pdf):
+    pdf = pdfplumber.open(statement_pdf(pages=2))
+    pages = LazyPdfPages(pdf)
+    with pytest.raises(IndexError):
+        pages[2]
+    with pytest.raises(IndexError):
+        pages[-3]
+    pages.close()
+
+
+def test_inherited_attributes(tmp_path):
+    # MediaBox and Resources only on the intermediate node
+    path = write_pdf(tmp_path / 'inherited.pdf', {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [4 0 R] /Count 2 >>",
+        3: FONT,
+        4: b"<< /Type /Pages /Parent 2 0 R /Kids [5 0 R 6 0 R] /Count 2 /MediaBox [0 0 300 100]"
+           b" /Resources << /Font << /F1 3 0 R >> >> >>",
+        5: b"<< /Type /Page /Parent 4 0 R /Contents 7 0 R >>",
+        6: b"<< /Type /Page /Parent 4 0 R /Contents 8 0 R >>",
+        7: content(b"FIRST"),
+        8: content(b"SECOND"),
+    })
+    pages = LazyPdfPages(pdfplumber.open(path))
+    assert len(pages) == 2
+    assert pages[1].extract_text() == 'SECOND'
+    assert pages[1].width == 300
+    assert pages[0].extract_text() == 'FIRST'
+    pages.close()
+
+
+def test_cyclic_tree_falls_back(tmp_path):
+    # The first kid of the root points back at the root
+    path = write_pdf(tmp_path / 'cyclic.pdf', {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [4 0 R 5 0 R] /Count 2 >>",
+        3: FONT,
+        4: b"<< /Type /Pages /Parent 2 0 R /Kids [2 0 R] /Count 1 >>",
+        5: PAGE % (2, 6),
+        6: content(b"ONLY PAGE"),
+    })
+    pdf = pdfplumber.open(path)
+    pages = LazyPdfPages(pdf)
+    assert pages[0].extract_text() == 'ONLY PAGE'
+    # pdfplumber's own walk skips the cycle and finds the one real page
+    assert hasattr(pdf, '_pages')
+    assert len(pages) == 1
+    pages.close()
+
+
+def test_missing_count_falls_back(tmp_path):
+    path = write_pdf(tmp_path / 'no_count.pdf', {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [4 0 R 5 0 R] >>",
+        3: FONT,
+        4: PAGE % (2, 6),
+        5: PAGE % (2, 7),
+        6: content(b"ONE"),
+        7: content(b"TWO"),
+    })
+    pages = LazyPdfPages(pdfplumber.open(path))
+    # pdfminer reads a missing /Count as 0; the page list is used instead of an empty document
+    assert len(pages) == 2
+    assert texts(pages, [0, 1]) == ['ONE', 'TWO']
+    pages.close()
+
+
+def test_count_larger_than_tree_falls_back(tmp_path):
+    path = write_pdf(tmp_path / 'short_tree.pdf', {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [4 0 R] /Count 3 >>",
+        3: FONT,
+        4: PAGE % (2, 5),
+        5: content(b"ONE"),
+    })
+    pages = LazyPdfPages(pdfplumber.open(path))
+    # Checked before callers plan their pages from it
+    assert len(pages) == 1
+    assert pages[-1].extract_text() == 'ONE'
+    pages.close()
+
+
+def test_nested_count_mismatch_falls_back(statement_pdf):
+    path = statement_pdf(pages=9, fan_out=3)
+    with open(path, 'rb') as f:
+        data = f.read()
+    # An intermediate node claiming a page it does not have; the root total still adds up
+    assert data.count(b"/Count 3 /Parent") == 3
+    data = data.replace(b"/Count 3 /Parent", b"/Count 4 /Parent", 1).replace(b"/Count 3 /Parent", b"/Count 2 /Parent", 1)
+    with open(path, 'wb') as f:
+        f.write(data)
+    pdf = pdfplumber.open(path)
+    pages = LazyPdfPages(pdf)
+    assert len(pages) == 9
+    assert hasattr(pdf, '_pages')
+    assert pages[8].page_number == 9
+    pages.close()
+
+
+@pytest.mark.parametrize('endpoint, field', [
+    ('/extract-text', 'extracted_text'),
+    ('/extract-closing-balance', 'closing_balance'),
+    ('/extract-all', 'closing_balance'),
+])
+def test_endpoints_read_a_document_with_an_inflated_count(statement_pdf, endpoint, field):
+    path = statement_pdf(pages=1)
+    with open(path, 'rb') as f:
+        data = f.read()
+    # Same length, so the xref offsets still hold
+    assert data.count(b"/Count 1 >>") == 1
+    with open(path, 'wb') as f:
+        f.write(data.replace(b"/Count 1 >>", b"/Count 3 >>"))
+
+    with open(path, 'rb') as f:
+        response = main.app.test_client().post(endpoint, data={'file': (f, 'statement.pdf')})
+    assert response.status_code == 200
+    value = response.get_json()[field]
+    if field == 'closing_balance':
+        assert value['amount'] == '2983.38'
+    else:
+        assert 'CLOSING BALANCE' in value
@@ -0,0 +1,9 @@
+import main
+
+
+def test_only_non_blank_characters_count(monkeypatch):
+    monkeypatch.setattr(main, 'MIN_TEXT_LAYER_CHARS', 10)
+    # Scattered fragments: 14 characters after strip(), only 4 of them non-blank
+    assert not main.has_usable_text_layer("  A \n\n B \t C\n  D  ")
+    assert main.has_usable_text_layer("ACCOUNT\nSTATEMENT")
+    assert not main.has_usable_text_layer("")
@@ -0,0 +1,35 @@
+import io
+
+import pytest
+
+import main
+
+CORRUPT_PDF = b"%PDF-1.4 not really a PDF"
+
+
+def post(endpoint):
+    data = {'file': (io.BytesIO(CORRUPT_PDF), 'corrupt.pdf')}
+    return main.app.test_client().post(endpoint, data=data)
+
+
+@pytest.mark.parametrize('endpoint, field', [
+    ('/extract-statement-period', 'statement_period'),
+    ('/extract-dob', 'dob'),
+    ('/extract-aadhar', 'aadhar_number'),
+])
+def test_null_field_for_an_unreadable_pdf(endpoint, field):
+    response = post(endpoint)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body[field] is None
+    assert body['pages_read'] is None
+
+
+@pytest.mark.parametrize('endpoint', ['/extract-pan', '/extract-closing-balance', '/extract-all'])
+def test_error_for_an_unreadable_pdf(endpoint):
+    # These have always reported an unreadable PDF as an error
+    assert post(endpoint).status_code == 500
+
+
+def test_statement_period_helper_returns_none():
+    assert main.extract_statement_period(io.BytesIO(CORRUPT_PDF)) is None